@@ -0,0 +1,64 @@
+"""
+Measure the account cache under a skewed (Zipfian) access pattern at
+several budgets: hit rate, evictions, write-backs and requests per second.
+
+Run with: python -m benchmarks.bench_account_cache
+"""
+
+import random
+import tempfile
+import time
+from decimal import Decimal
+from itertools import accumulate
+from pathlib import Path
+
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.service.account_cache import AccountCache, AccountStore
+
+ACCOUNTS = 20_000
+REQUESTS = 100_000
+# Zipf exponent: the k-th most popular account is used in proportion to 1 / k^s
+SKEW = 1.1
+
+
+def main() -> None:
+    generator = random.Random(42)
+    weights = list(accumulate(1 / rank**SKEW for rank in range(1, ACCOUNTS + 1)))
+    requests = generator.choices(range(ACCOUNTS), cum_weights=weights, k=REQUESTS)
+    amount = Decimal("1.00")
+    print(f"accounts: {ACCOUNTS:,}, requests: {REQUESTS:,}, zipf s={SKEW}")
+
+    for max_accounts, max_bytes in (
+        (200, None),
+        (2_000, None),
+        (ACCOUNTS, None),
+        (ACCOUNTS, 8 * 2**20),
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            store = AccountStore(str(Path(directory) / "accounts"))
+            cache = AccountCache(
+                store, max_accounts=max_accounts, max_bytes=max_bytes, clock=StepClock()
+            )
+
+            start = time.perf_counter()
+            for account_id in requests:
+                with cache.checkout(str(account_id)) as account:
+                    account.create_transaction(amount, TransactionType.CREDIT)
+            elapsed = time.perf_counter() - start
+            store.close()
+
+        stats = cache.stats()
+        budget = f"{max_accounts:,} accounts" + (
+            f", {max_bytes / 2**20:g} MiB" if max_bytes else ""
+        )
+        print(
+            f"{budget:<22}: hit rate {stats.hit_rate:6.1%},"
+            f" {stats.evictions:>6,} evictions, {stats.write_backs:>6,} write-backs,"
+            f" {REQUESTS / elapsed:>8,.0f} requests/s,"
+            f" {stats.resident_bytes / 2**20:6.1f} MiB resident"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measure the per-request overhead of admission control, the memory per
+tracked key at one million clients, and the cost added to dispatch.
+
+Run with: python -m benchmarks.bench_admission
+"""
+
+import io
+import random
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.service.admission import AdmissionControl
+from src.service.controller import BankApp
+from src.service.view import BankView
+
+KEYS = 1_000_000
+REQUESTS = 1_000_000
+DISPATCHES = 50_000
+
+
+def unlimited() -> AdmissionControl:
+    # Limits high enough that every request is admitted and its key stored
+    return AdmissionControl(
+        client_rate=1e9, client_burst=10**9, account_rate=1e9, account_burst=10**9
+    )
+
+
+def main() -> None:
+    tracemalloc.start()
+    admission = unlimited()
+    account = BankAccount(clock=StepClock())
+    now = time.monotonic()
+    for client in range(KEYS):
+        admission.admit(client, account, now)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"keys: {KEYS:,}, memory: {size / KEYS:.1f} bytes/key")
+
+    generator = random.Random(42)
+    clients = [generator.randrange(KEYS) for _ in range(REQUESTS)]
+    start = time.perf_counter()
+    for client in clients:
+        admission.admit(client, account)
+    elapsed = time.perf_counter() - start
+    assert admission.rejected == 0
+    print(f"admit: {elapsed / REQUESTS * 1e9:,.0f} ns/request")
+
+    for name, limits in (
+        ("no admission", None),
+        ("admission", unlimited()),
+    ):
+        app = BankApp(
+            BankAccount(clock=StepClock()), BankView(), admission=limits, client="c"
+        )
+        best = float("inf")
+        # Best of three, as dispatch timings are noisy
+        for _ in range(3):
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for _ in range(DISPATCHES):
+                    app.dispatch("d 1")
+                best = min(best, time.perf_counter() - start)
+        print(f"dispatch, {name:<12}: {best / DISPATCHES * 1e6:.2f} us/command")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Report the archive compression ratio and the decode speed of statements
+over archived ranges.
+
+Run with: python -m benchmarks.bench_archive
+"""
+
+import csv
+import io
+import pickle
+import random
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models.archive import ArchiveSegment
+from src.models.bank_account import BankAccount
+from src.models.transaction_type import TransactionType
+
+ROWS = 200_000
+BLOCK_SIZE = 1024
+
+
+class RandomClock:
+    """
+    Clock with random gaps of up to ten minutes between transactions.
+    """
+
+    def __init__(self, generator: random.Random):
+        self.generator = generator
+        self.current = datetime(2024, 1, 1)
+
+    def now(self) -> datetime:
+        self.current += timedelta(microseconds=self.generator.randint(1, 600_000_000))
+        return self.current
+
+
+def build_account() -> BankAccount:
+    """
+    Build an account with random gaps and a mix of round and odd amounts.
+    """
+    generator = random.Random(7)
+    account = BankAccount(clock=RandomClock(generator))
+    round_amounts = [Decimal(a) for a in ("20.00", "50.00", "100.00", "500.00")]
+    for _ in range(ROWS // 2):
+        if generator.random() < 0.5:
+            amount = generator.choice(round_amounts)
+        else:
+            amount = Decimal(generator.randint(1, 99_999)).scaleb(-2)
+        account.create_transaction(amount * 2, TransactionType.CREDIT)
+        account.create_transaction(amount, TransactionType.DEBIT)
+    return account
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    account = build_account()
+    transactions = account.transactions
+
+    text = io.StringIO()
+    csv.writer(text).writerows(
+        (t.date.isoformat(), t.amount, t.balance) for t in transactions
+    )
+    csv_size = len(text.getvalue().encode())
+    pickle_size = len(pickle.dumps(transactions))
+
+    start = time.perf_counter()
+    segment = ArchiveSegment.from_transactions(transactions, block_size=BLOCK_SIZE)
+    encode = time.perf_counter() - start
+    archive_size = len(segment.to_bytes())
+
+    live = timed(account.print_statement)
+    archived = timed(segment.print_statement)
+    block = timed(lambda: segment.block(segment.block_count // 2))
+
+    print(f"rows:               {ROWS} ({segment.block_count} blocks of {BLOCK_SIZE})")
+    print(f"csv size:           {csv_size / 1024:,.0f} KiB")
+    print(f"pickle size:        {pickle_size / 1024:,.0f} KiB")
+    print(
+        f"archive size:       {archive_size / 1024:,.0f} KiB"
+        f" ({archive_size / ROWS:.2f} bytes/row,"
+        f" {csv_size / archive_size:.1f}x smaller than csv)"
+    )
+    print(f"encode:             {ROWS / encode:,.0f} rows/s")
+    print(f"statement (live):   {ROWS / live:,.0f} rows/s")
+    print(f"statement (archive):{ROWS / archived:,.0f} rows/s")
+    print(f"single block:       {block * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark hot-account contention with direct calls and the batching queue.
+
+Run with: python -m benchmarks.bench_batching
+"""
+
+import threading
+import time
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.service.batching import BatchingQueue
+
+PRODUCERS = 8
+REQUESTS_PER_PRODUCER = 20_000
+AMOUNT = Decimal("1.00")
+
+
+def run_producers(work) -> float:
+    """
+    Run the producer threads against one hot account and time them.
+
+    :param work: The function each producer runs.
+
+    :return float: The elapsed seconds.
+    """
+    threads = [threading.Thread(target=work) for _ in range(PRODUCERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def direct() -> float:
+    account = BankAccount(clock=StepClock())
+
+    def work():
+        for i in range(REQUESTS_PER_PRODUCER):
+            transaction_type = (
+                TransactionType.DEBIT if i % 3 == 2 else TransactionType.CREDIT
+            )
+            account.create_transaction(AMOUNT, transaction_type)
+
+    return run_producers(work)
+
+
+def batched(max_batch_size: int, max_wait: float) -> tuple:
+    account = BankAccount(clock=StepClock())
+    batching = BatchingQueue(max_batch_size=max_batch_size, max_wait=max_wait)
+
+    def work():
+        futures = []
+        for i in range(REQUESTS_PER_PRODUCER):
+            transaction_type = (
+                TransactionType.DEBIT if i % 3 == 2 else TransactionType.CREDIT
+            )
+            futures.append(batching.submit(account, AMOUNT, transaction_type))
+        for future in futures:
+            future.result()
+
+    elapsed = run_producers(work)
+    batching.close()
+    return elapsed, batching.batches
+
+
+def main() -> None:
+    total = PRODUCERS * REQUESTS_PER_PRODUCER
+    print(f"producers: {PRODUCERS}, requests: {total}, one hot account")
+
+    elapsed = direct()
+    print(
+        f"direct create_transaction:       {total / elapsed:>10,.0f} req/s"
+        f" ({total} lock acquisitions)"
+    )
+
+    for max_batch_size, max_wait in [(16, 0.0001), (256, 0.0005), (1024, 0.001)]:
+        elapsed, batches = batched(max_batch_size, max_wait)
+        print(
+            f"batched size={max_batch_size:<5} wait={max_wait * 1000:.1f}ms: {total / elapsed:>10,.0f} req/s"
+            f" ({batches} lock acquisitions, {total / batches:.0f} requests/batch)"
+        )
+
+
+if __name__ == "__main__":
+    main()
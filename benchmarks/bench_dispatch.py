@@ -0,0 +1,58 @@
+"""
+Measure commands per second for a scripted session, one command per
+prompt against pipelined lines.
+
+Run with: python -m benchmarks.bench_dispatch
+"""
+
+import builtins
+import io
+import time
+from contextlib import redirect_stdout
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.service.controller import BankApp
+from src.service.view import BankView
+
+ROUNDS = 20_000
+
+
+def run_session(inputs: list) -> float:
+    """
+    Run the app over scripted input with stdout discarded.
+
+    :param inputs: The lines returned by input(), ending with 'q'.
+
+    :return float: The elapsed seconds.
+    """
+    lines = iter(inputs)
+    original_input = builtins.input
+    builtins.input = lambda *args: next(lines)
+    try:
+        app = BankApp(BankAccount(clock=StepClock()), BankView())
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            app.run()
+        return time.perf_counter() - start
+    finally:
+        builtins.input = original_input
+
+
+def main() -> None:
+    # Each round is one deposit and one withdrawal
+    commands = ROUNDS * 2
+
+    # Prompted amounts are followed by a blank memo
+    interactive = run_session(["d", "100", "", "w", "20", ""] * ROUNDS + ["q"])
+    pipelined = run_session(["d 100; w 20"] * ROUNDS + ["q"])
+    batched = run_session(["; ".join(["d 100; w 20"] * 100)] * (ROUNDS // 100) + ["q"])
+
+    print(f"commands:                     {commands}")
+    print(f"interactive (prompt per step): {commands / interactive:>10,.0f} commands/s")
+    print(f"pipelined (2 per line):        {commands / pipelined:>10,.0f} commands/s")
+    print(f"pipelined (200 per line):      {commands / batched:>10,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    main()
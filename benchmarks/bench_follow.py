@@ -0,0 +1,73 @@
+"""
+Measure append-to-delivery latency for statement followers, with a fast
+and a deliberately slow consumer.
+
+Run with: python -m benchmarks.bench_follow
+"""
+
+import threading
+import time
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+
+ROWS = 50_000
+
+
+def run(
+    rows: int, consumer_delay: float, maxsize: int, writer_delay: float = 0
+) -> None:
+    """
+    Append rows from one thread while another consumes a subscription.
+
+    :param rows: The number of rows to append.
+    :param consumer_delay: Seconds the consumer sleeps per row.
+    :param maxsize: The subscription buffer size.
+    :param writer_delay: Seconds the writer sleeps between rows.
+    """
+    account = BankAccount(clock=StepClock())
+    subscription = account.subscribe(maxsize=maxsize)
+    done = threading.Event()
+
+    def consume():
+        while True:
+            transaction = subscription.get(timeout=0.01)
+            if transaction is None:
+                if done.is_set():
+                    return
+            elif consumer_delay:
+                time.sleep(consumer_delay)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    start = time.perf_counter()
+    for _ in range(rows):
+        account.create_transaction(Decimal("1.00"), TransactionType.CREDIT)
+        if writer_delay:
+            time.sleep(writer_delay)
+    writer = time.perf_counter() - start
+
+    done.set()
+    consumer.join()
+
+    print(
+        f"writer delay {writer_delay * 1e6:>5.0f}us,"
+        f" consumer delay {consumer_delay * 1e6:>5.0f}us, buffer {maxsize:>5}:"
+        f" writer {rows / writer:>9,.0f} rows/s,"
+        f" mean latency {subscription.mean_latency * 1e6:>8.1f}us,"
+        f" max latency {subscription.max_latency * 1e3:>7.2f}ms,"
+        f" dropped {subscription.dropped}"
+    )
+
+
+def main() -> None:
+    run(ROWS // 10, consumer_delay=0, maxsize=1024, writer_delay=0.0001)
+    run(ROWS, consumer_delay=0, maxsize=1024)
+    run(ROWS, consumer_delay=0.0001, maxsize=1024)
+
+
+if __name__ == "__main__":
+    main()
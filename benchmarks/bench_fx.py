@@ -0,0 +1,89 @@
+"""
+Compare converting a statement row by row with converting its amount and
+balance columns at once, and reading a cached converted total.
+
+Run with: python -m benchmarks.bench_fx
+"""
+
+import random
+import time
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.fx_table import FxTable
+from src.models.transaction import Transaction
+from src.models.transaction_type import TransactionType
+
+ROWS = 200_000
+TOTAL_READS = 100_000
+
+
+def build_account() -> BankAccount:
+    generator = random.Random(42)
+    account = BankAccount(clock=StepClock())
+    amounts = [Decimal(amount) for amount in (20, 50, 100, 200, 500)]
+    for _ in range(ROWS):
+        currency = generator.choice(("USD", "EUR", "GBP"))
+        account.create_transaction(
+            generator.choice(amounts), TransactionType.CREDIT, currency
+        )
+    return account
+
+
+def row_by_row(transactions: list, fx: FxTable) -> list:
+    return [
+        Transaction(
+            t.date,
+            fx.convert(t.amount, t.currency, "SGD"),
+            fx.convert(t.balance, t.currency, "SGD"),
+            "SGD",
+        )
+        for t in transactions
+    ]
+
+
+def main() -> None:
+    account = build_account()
+    fx = FxTable(
+        {
+            ("USD", "SGD"): Decimal("1.3012"),
+            ("EUR", "SGD"): Decimal("1.4127"),
+            ("GBP", "SGD"): Decimal("1.6533"),
+        }
+    )
+    transactions = account.transactions
+    print(f"rows: {ROWS}, currencies: {len(account.balances)}")
+
+    start = time.perf_counter()
+    rows = row_by_row(transactions, fx)
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = fx.convert_transactions(transactions, "SGD")
+    column_seconds = time.perf_counter() - start
+    assert [(t.amount, t.balance) for t in rows] == [
+        (t.amount, t.balance) for t in columns
+    ]
+
+    print(f"row by row: {ROWS / row_seconds:>12,.0f} rows/s")
+    print(f"columns:    {ROWS / column_seconds:>12,.0f} rows/s")
+
+    start = time.perf_counter()
+    for _ in range(TOTAL_READS):
+        account.total_in("SGD", fx)
+    cached_seconds = time.perf_counter() - start
+    print(f"cached total: {cached_seconds / TOTAL_READS * 1e6:.2f} us/read")
+
+    start = time.perf_counter()
+    for index in range(TOTAL_READS // 100):
+        fx.set_rate("USD", "SGD", Decimal("1.3") + Decimal(index % 10) / 1000)
+        account.total_in("SGD", fx)
+    fresh_seconds = time.perf_counter() - start
+    print(
+        f"after rate change: {fresh_seconds / (TOTAL_READS // 100) * 1e6:.2f} us/read"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure hold throughput: authorize and capture, authorize and release,
+and expiry sweeps over many open holds.
+
+Run with: python -m benchmarks.bench_holds
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+
+OPERATIONS = 100_000
+THREADS = 4
+
+
+def funded_account(step: timedelta = timedelta(microseconds=1)) -> BankAccount:
+    account = BankAccount(clock=StepClock(step=step))
+    account.create_transaction(Decimal("1000000000.00"), TransactionType.CREDIT)
+    return account
+
+
+def authorize_capture() -> float:
+    account = funded_account()
+    amount = Decimal("1.00")
+    start = time.perf_counter()
+    for _ in range(OPERATIONS):
+        account.capture(account.authorize(amount).hold_id)
+    return OPERATIONS / (time.perf_counter() - start)
+
+
+def authorize_release_threads() -> float:
+    account = funded_account()
+    amount = Decimal("1.00")
+
+    def work():
+        for _ in range(OPERATIONS // THREADS):
+            account.release(account.authorize(amount).hold_id)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return OPERATIONS / (time.perf_counter() - start)
+
+
+def sweep() -> tuple:
+    account = funded_account()
+    amount = Decimal("1.00")
+    for _ in range(OPERATIONS):
+        account.authorize(amount, ttl=timedelta(days=1))
+
+    start = time.perf_counter()
+    expired = account.sweep_expired_holds(now=datetime(2100, 1, 1))
+    return expired, expired / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"authorize + capture:            {authorize_capture():>10,.0f} ops/s")
+    print(
+        f"authorize + release, {THREADS} threads: {authorize_release_threads():>10,.0f} ops/s"
+    )
+    expired, rate = sweep()
+    print(f"expiry sweep ({expired} holds):   {rate:>10,.0f} holds/s")
+
+
+if __name__ == "__main__":
+    main()
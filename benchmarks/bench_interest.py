@@ -0,0 +1,65 @@
+"""
+Compare the bulk interest and fee engine with a per-account Decimal loop.
+
+Run with: python -m benchmarks.bench_interest
+"""
+
+import time
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.service.interest_engine import InterestEngine
+
+ACCOUNTS = 200_000
+RATE = Decimal("0.0125")
+FEE = Decimal("2.00")
+
+
+def build_accounts() -> list:
+    clock = StepClock()
+    accounts = []
+    for i in range(ACCOUNTS):
+        account = BankAccount(clock=clock)
+        account.create_transaction(Decimal(i % 5000) / 4, TransactionType.CREDIT)
+        accounts.append(account)
+    return accounts
+
+
+def loop(accounts: list) -> float:
+    """
+    Apply interest and fees one create_transaction call at a time.
+
+    :return float: The elapsed seconds.
+    """
+    start = time.perf_counter()
+    for account in accounts:
+        interest = (account.balance * RATE).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_EVEN
+        )
+        if interest > 0:
+            account.create_transaction(interest, TransactionType.CREDIT)
+        account.create_transaction(FEE, TransactionType.DEBIT)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    looped = loop(build_accounts())
+    report = InterestEngine(RATE, FEE).run(build_accounts())
+
+    print(f"accounts:          {ACCOUNTS}")
+    print(f"per-account loop:  {looped:.2f}s ({ACCOUNTS / looped:,.0f} accounts/s)")
+    print(
+        f"bulk engine:       {report.seconds:.2f}s ({ACCOUNTS / report.seconds:,.0f} accounts/s)"
+    )
+    print(f"speedup:           {looped / report.seconds:.2f}x")
+    print(f"interest credited: {report.credited} (${report.interest})")
+    print(
+        f"fees charged:      {report.charged} (${report.fees}), skipped {report.skipped},"
+        f" blocked {report.blocked}"
+    )
+
+
+if __name__ == "__main__":
+    main()
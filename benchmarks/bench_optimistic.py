@@ -0,0 +1,95 @@
+"""
+Compare optimistic version checks with holding the account lock across
+a read-decide-write cycle, at several contention levels.
+
+Run with: python -m benchmarks.bench_optimistic
+"""
+
+import random
+import threading
+import time
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.conditional_result import ConditionalResult
+from src.models.transaction_type import TransactionType
+
+THREADS = 8
+CYCLES_PER_THREAD = 5_000
+# Fraction of cycles that write; the rest only read
+WRITE_RATIO = 0.1
+
+
+def decide(balance: Decimal) -> Decimal:
+    """
+    Simulate client-side work between the read and the write.
+    """
+    time.sleep(0)
+    return Decimal("1.00") if balance < 1_000_000 else Decimal("0.01")
+
+
+def pessimistic(accounts: list) -> tuple:
+    def work(seed: int):
+        generator = random.Random(seed)
+        for _ in range(CYCLES_PER_THREAD):
+            account = generator.choice(accounts)
+            with account.lock:
+                amount = decide(account.balance)
+                if generator.random() < WRITE_RATIO:
+                    account.create_transaction(amount, TransactionType.CREDIT)
+
+    return run(work), 0
+
+
+def optimistic(accounts: list) -> tuple:
+    conflicts = [0] * THREADS
+
+    def work(seed: int):
+        generator = random.Random(seed)
+        for _ in range(CYCLES_PER_THREAD):
+            account = generator.choice(accounts)
+            is_write = generator.random() < WRITE_RATIO
+            while True:
+                version, balance = account.versioned_balance
+                amount = decide(balance)
+                if not is_write:
+                    break
+                result = account.create_transaction_if_version(
+                    amount, TransactionType.CREDIT, version
+                )
+                if result is not ConditionalResult.CONFLICT:
+                    break
+                conflicts[seed] += 1
+
+    return run(work), sum(conflicts)
+
+
+def run(work) -> float:
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    cycles = THREADS * CYCLES_PER_THREAD
+    print(f"threads: {THREADS}, cycles: {cycles}, writes: {WRITE_RATIO:.0%}")
+    for account_count in (1, 4, 64):
+        for name, strategy in (
+            ("pessimistic", pessimistic),
+            ("optimistic", optimistic),
+        ):
+            accounts = [BankAccount(clock=StepClock()) for _ in range(account_count)]
+            elapsed, conflicts = strategy(accounts)
+            print(
+                f"{account_count:>3} accounts, {name:<11}: {cycles / elapsed:>9,.0f} cycles/s"
+                f" ({conflicts} conflicts)"
+            )
+
+
+if __name__ == "__main__":
+    main()
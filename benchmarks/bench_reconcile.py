@@ -0,0 +1,73 @@
+"""
+Measure reconciliation throughput and peak memory for the sorted merge,
+the in-memory hash join and the spilling hash join.
+
+Run with: python -m benchmarks.bench_reconcile
+"""
+
+import os
+import tempfile
+import tracemalloc
+from decimal import Decimal
+
+from src.service.reconciler import Reconciler, csv_rows, write_csv
+
+ROWS = 500_000
+
+
+def generate_rows(rows: int, mismatch_every: int = 0):
+    """
+    Yield sorted ledger-style rows, optionally altering every n-th amount.
+    """
+    balance = Decimal("0.00")
+    for i in range(rows):
+        amount = Decimal(i % 997 + 1)
+        balance += amount
+        if mismatch_every and i % mismatch_every == 0:
+            amount += 1
+        yield (
+            f"{i // 1000:06d}",
+            f"2024-01-01T00:00:{i % 1000:06d}",
+            amount,
+            balance,
+        )
+
+
+def run(name: str, reconcile, ledger_path: str, bank_path: str) -> None:
+    tracemalloc.start()
+    report = reconcile(csv_rows(ledger_path), csv_rows(bank_path))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{name:<22} {report.rows_per_second:>9,.0f} rows/s,"
+        f" peak {peak / 1024 / 1024:>7.1f} MiB,"
+        f" mismatches {report.mismatches}, spilled {report.spilled}"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        ledger_path = os.path.join(directory, "ledger.csv")
+        bank_path = os.path.join(directory, "bank.csv")
+        write_csv(generate_rows(ROWS), ledger_path)
+        write_csv(generate_rows(ROWS, mismatch_every=1000), bank_path)
+        report_path = os.path.join(directory, "report.csv")
+
+        print(f"rows per side: {ROWS}")
+        run("sorted merge", Reconciler(report_path).merge, ledger_path, bank_path)
+        run(
+            "hash join (memory)",
+            Reconciler(report_path, max_rows=ROWS).hash_join,
+            ledger_path,
+            bank_path,
+        )
+        run(
+            "hash join (spill)",
+            Reconciler(report_path, max_rows=ROWS // 50).hash_join,
+            ledger_path,
+            bank_path,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure scheduling a million standing orders, and catching up after
+twelve weeks of downtime in bulk against one occurrence at a time.
+
+Run with: python -m benchmarks.bench_scheduler
+"""
+
+import heapq
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.service.scheduler import Scheduler
+
+SCHEDULED = 1_000_000
+ORDERS = 100_000
+ACCOUNTS = 10_000
+WEEKS = 12
+START = datetime(2024, 1, 1)
+WEEK = timedelta(weeks=1)
+
+
+def schedule(scheduler: Scheduler, accounts: list, orders: int) -> None:
+    amount = Decimal("10.00")
+    for index in range(orders):
+        scheduler.schedule(
+            accounts[index % len(accounts)],
+            amount,
+            TransactionType.CREDIT,
+            START + timedelta(minutes=index % 10_080),
+            every=WEEK,
+        )
+
+
+def one_at_a_time(accounts: list, now: datetime) -> int:
+    # Every occurrence is popped, applied under its own lock, and pushed again
+    amount = Decimal("10.00")
+    heap = [
+        (START + timedelta(minutes=index % 10_080), index) for index in range(ORDERS)
+    ]
+    heapq.heapify(heap)
+    applied = 0
+    while heap[0][0] <= now:
+        run_at, index = heapq.heappop(heap)
+        accounts[index % ACCOUNTS].create_transaction(amount, TransactionType.CREDIT)
+        applied += 1
+        heapq.heappush(heap, (run_at + WEEK, index))
+    return applied
+
+
+def main() -> None:
+    accounts = [BankAccount(clock=StepClock()) for _ in range(ACCOUNTS)]
+
+    scheduler = Scheduler()
+    start = time.perf_counter()
+    schedule(scheduler, accounts, SCHEDULED)
+    elapsed = time.perf_counter() - start
+    del scheduler
+
+    # Traced separately, as tracing slows scheduling down
+    tracemalloc.start()
+    scheduler = Scheduler()
+    schedule(scheduler, accounts, ORDERS)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del scheduler
+    print(
+        f"scheduled {SCHEDULED:,} orders in {elapsed:.2f}s,"
+        f" {size / ORDERS:.0f} bytes/order"
+    )
+
+    now = START + WEEKS * WEEK - timedelta(minutes=1)
+    print(f"catch-up: {ORDERS:,} weekly orders, {WEEKS} weeks of downtime")
+
+    accounts = [BankAccount(clock=StepClock()) for _ in range(ACCOUNTS)]
+    start = time.perf_counter()
+    applied = one_at_a_time(accounts, now)
+    elapsed = time.perf_counter() - start
+    print(f"one at a time: {applied / elapsed:>10,.0f} occurrences/s ({applied:,})")
+
+    accounts = [BankAccount(clock=StepClock()) for _ in range(ACCOUNTS)]
+    scheduler = Scheduler()
+    schedule(scheduler, accounts, ORDERS)
+    report = scheduler.run_due(now)
+    print(
+        f"bulk:          {report.applied / report.seconds:>10,.0f} occurrences/s"
+        f" ({report.applied:,}, {report.caught_up:,} caught up, {report.batches:,} accounts)"
+    )
+
+
+if __name__ == "__main__":
+    main()
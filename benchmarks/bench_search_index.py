@@ -0,0 +1,80 @@
+"""
+Measure search index memory overhead and query time against a full scan.
+
+Run with: python -m benchmarks.bench_search_index
+"""
+
+import random
+import time
+import tracemalloc
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+
+ROWS = 200_000
+TOP_N = 100
+
+
+def build_account(rows: int) -> BankAccount:
+    """
+    Build an account with random deposits and withdrawals.
+
+    :param rows: The number of transactions to attempt.
+
+    :return BankAccount: The populated account.
+    """
+    generator = random.Random(42)
+    account = BankAccount(clock=StepClock())
+    for _ in range(rows):
+        amount = Decimal(generator.randint(1, 100_000)) / 100
+        transaction_type = generator.choice(list(TransactionType))
+        if not account.create_transaction(amount, transaction_type):
+            account.create_transaction(amount, TransactionType.CREDIT)
+    return account
+
+
+def best_of(function, repeat: int = 5) -> float:
+    """
+    Return the fastest of several timed calls in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    account = build_account(ROWS)
+    low, high = Decimal("500.00"), Decimal("505.00")
+
+    scan_range = best_of(lambda: account.transactions_between(low, high))
+    scan_top = best_of(lambda: account.largest_withdrawals(10))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    account.enable_indexes(top_n=TOP_N)
+    build = time.perf_counter() - start
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    index_range = best_of(lambda: account.transactions_between(low, high))
+    index_top = best_of(lambda: account.largest_withdrawals(10))
+    matches = len(account.transactions_between(low, high))
+
+    print(f"rows:                {ROWS}")
+    print(f"index build:         {build * 1000:.1f} ms")
+    print(
+        f"index memory:        {index_bytes / 1024 / 1024:.2f} MiB ({index_bytes / ROWS:.1f} bytes/transaction)"
+    )
+    print(f"range query scan:    {scan_range * 1000:.3f} ms ({matches} matches)")
+    print(f"range query indexed: {index_range * 1000:.3f} ms")
+    print(f"top 10 scan:         {scan_top * 1000:.3f} ms")
+    print(f"top 10 heap:         {index_top * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measure the writer cost of mirroring an account into shared memory, and
+the snapshot rate of a reader in another process.
+
+Run with: python -m benchmarks.bench_shared_ledger
+"""
+
+import multiprocessing
+import time
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.service.shared_ledger import SharedLedger, SharedLedgerReader
+
+ROWS = 200_000
+
+
+def write(account: BankAccount) -> float:
+    amount = Decimal("1.00")
+    start = time.perf_counter()
+    for _ in range(ROWS):
+        account.create_transaction(amount, TransactionType.CREDIT)
+    return (time.perf_counter() - start) / ROWS
+
+
+def read(name: str, seconds: float, results) -> None:
+    reads = 0
+    with SharedLedgerReader(name) as reader:
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            reader.balance(0)
+            reader.recent(0, 8)
+            reads += 1
+        results.put((reads / seconds, reader.retries))
+
+
+def main() -> None:
+    plain = write(BankAccount(clock=StepClock()))
+
+    account = BankAccount(clock=StepClock())
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    with SharedLedger(capacity=1, ring_size=64) as ledger:
+        ledger.track(0, account)
+        idle = write(account)
+        reader = context.Process(target=read, args=(ledger.name, 2.0, results))
+        reader.start()
+        time.sleep(0.5)
+        mirrored = write(account)
+        reads_per_second, retries = results.get()
+        reader.join()
+
+    print(f"rows:                       {ROWS}")
+    print(f"create_transaction:         {plain * 1e6:.2f} us")
+    print(f"mirrored, no reader:        {idle * 1e6:.2f} us")
+    print(f"mirrored, reader running:   {mirrored * 1e6:.2f} us")
+    print(f"reader snapshots:           {reads_per_second:,.0f}/s ({retries} retries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare a total-deposits report that locks every account with one read
+through a snapshot, measuring writer throughput and the longest single
+write while reports run back to back.
+
+Run with: python -m benchmarks.bench_snapshot
+"""
+
+import threading
+import time
+from contextlib import ExitStack
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.snapshot import SnapshotRegistry
+from src.models.transaction_type import TransactionType
+
+ACCOUNTS = 1_000
+WRITERS = 4
+DURATION = 2.0
+
+
+def locked_report(accounts: list, registry: SnapshotRegistry) -> Decimal:
+    # Consistent only while every account is locked at once
+    with ExitStack() as stack:
+        for account in accounts:
+            stack.enter_context(account.lock)
+        return sum(account.balance for account in accounts)
+
+
+def snapshot_report(accounts: list, registry: SnapshotRegistry) -> Decimal:
+    with registry.snapshot() as snapshot:
+        return sum(snapshot.balance(account) for account in accounts)
+
+
+def run(report) -> tuple:
+    registry = SnapshotRegistry()
+    accounts = [
+        BankAccount(clock=StepClock(), registry=registry) for _ in range(ACCOUNTS)
+    ]
+    done = threading.Event()
+    writes = [0] * WRITERS
+    stalls = [0.0] * WRITERS
+
+    def write(index: int):
+        position = index
+        while not done.is_set():
+            start = time.perf_counter()
+            accounts[position % ACCOUNTS].create_transaction(
+                Decimal("1.00"), TransactionType.CREDIT
+            )
+            stalls[index] = max(stalls[index], time.perf_counter() - start)
+            writes[index] += 1
+            position += WRITERS
+
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(WRITERS)]
+    for writer in writers:
+        writer.start()
+    reports = 0
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        report(accounts, registry)
+        reports += 1
+    done.set()
+    for writer in writers:
+        writer.join()
+    retained = max(account.retained_versions for account in accounts)
+    return sum(writes) / DURATION, max(stalls), reports / DURATION, retained
+
+
+def main() -> None:
+    print(f"accounts: {ACCOUNTS}, writers: {WRITERS}, duration: {DURATION}s")
+    for name, report in (("locked", locked_report), ("snapshot", snapshot_report)):
+        write_rate, stall, report_rate, retained = run(report)
+        print(
+            f"{name:<8}: {write_rate:>9,.0f} writes/s, longest write {stall * 1000:.1f} ms,"
+            f" {report_rate:>6,.1f} reports/s"
+            f" (max versions retained after: {retained})"
+        )
+
+
+if __name__ == "__main__":
+    main()
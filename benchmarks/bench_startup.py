@@ -0,0 +1,156 @@
+"""
+Measure the time from launching python -m src.main to the first menu,
+broken down into interpreter start, imports and application setup.
+
+Each phase is measured with a warm bytecode cache, and with src compiled
+from source on every launch (as in a container that mounts the source
+with PYTHONDONTWRITEBYTECODE=1). The second case assumes src has no
+__pycache__ directories.
+
+Run with: python -m benchmarks.bench_startup
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 20
+# Imports taking less than this are not listed
+MIN_IMPORT_US = 1_000
+
+
+def python_env(cache: str) -> dict:
+    """
+    Return the environment for a child interpreter.
+
+    :param cache: The bytecode cache directory, or None to compile src
+        on every launch.
+
+    :return dict: The environment variables.
+    """
+    env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("PYTHONPYCACHEPREFIX", None)
+    if cache is None:
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+    else:
+        env["PYTHONPYCACHEPREFIX"] = cache
+    return env
+
+
+def launch_seconds(args: list, env: dict) -> float:
+    """
+    Return the time from launch until the first line of output, answering
+    'q' so the process then exits.
+
+    :param args: The interpreter arguments.
+    :param env: The environment variables.
+
+    :return float: The seconds to the first line.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.communicate(b"q\n")
+    return elapsed
+
+
+def median(values: list) -> float:
+    """
+    Return the middle of a list of numbers.
+    """
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def import_times(env: dict) -> list:
+    """
+    Return the cumulative import time of each module src.main imports
+    directly, from one run with -X importtime (which adds its own overhead).
+
+    :param env: The environment variables.
+
+    :return list: (module, microseconds) pairs, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.main"],
+        input=b"q\n",
+        capture_output=True,
+        env=env,
+    )
+    times = []
+    after_site = False
+    for line in result.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Only the imports made at the top level, after interpreter start
+        if name.startswith("  "):
+            continue
+        if after_site:
+            times.append((name.strip(), int(cumulative)))
+        after_site = after_site or name.strip() == "site"
+    return sorted(times, key=lambda pair: -pair[1])
+
+
+def setup_seconds() -> float:
+    """
+    Return the time to build the account, view and app once imported.
+    """
+    from src.models.bank_account import BankAccount
+    from src.service.controller import BankApp
+    from src.service.view import BankView
+
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        BankApp(BankAccount(), BankView())
+        timings.append(time.perf_counter() - start)
+    return median(timings)
+
+
+def report(name: str, cache: str) -> None:
+    """
+    Print the startup phases with or without a bytecode cache.
+
+    :param name: The name of the case.
+    :param cache: The bytecode cache directory, or None for no cache.
+    """
+    interpreter = median(
+        [launch_seconds(["-c", "print()"], python_env(cache)) for _ in range(RUNS)]
+    )
+    first_menu = median(
+        [launch_seconds(["-m", "src.main"], python_env(cache)) for _ in range(RUNS)]
+    )
+    setup = setup_seconds()
+
+    print(f"{name} ({RUNS} runs, medians)")
+    print(f"  interpreter start:    {interpreter * 1000:.1f} ms")
+    print(f"  imports:              {(first_menu - interpreter - setup) * 1000:.1f} ms")
+    print(f"  app setup:            {setup * 1000:.2f} ms")
+    print(f"  launch to first menu: {first_menu * 1000:.1f} ms")
+    print("  slowest imports (-X importtime, cumulative):")
+    for module, microseconds in import_times(python_env(cache)):
+        if microseconds >= MIN_IMPORT_US:
+            print(f"    {module}: {microseconds / 1000:.1f} ms")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as cache:
+        # Fill the cache
+        launch_seconds(["-m", "src.main"], python_env(cache))
+        report("bytecode cached", cache)
+    report("src compiled on launch", None)
+
+
+if __name__ == "__main__":
+    main()
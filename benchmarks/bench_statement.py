@@ -0,0 +1,75 @@
+"""
+Benchmark statement rendering on a high-frequency account.
+
+Run with: python -m benchmarks.bench_statement
+"""
+
+import io
+import time
+from contextlib import redirect_stdout
+from datetime import timedelta
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction import DATE_FORMAT, Transaction
+from src.models.transaction_type import TransactionType
+
+ROWS = 100_000
+
+
+def build_account(rows: int) -> BankAccount:
+    """
+    Build an account with one transaction per millisecond.
+
+    :param rows: The number of transactions to create.
+
+    :return BankAccount: The populated account.
+    """
+    account = BankAccount(clock=StepClock(step=timedelta(milliseconds=1)))
+    for _ in range(rows):
+        account.create_transaction(Decimal("10.00"), TransactionType.CREDIT)
+    return account
+
+
+def uncached_format(self, max_amount_width, max_balance_width) -> str:
+    """
+    Format a transaction with a strftime call on every row.
+    """
+    date_str = self.date.strftime(DATE_FORMAT)
+    amount_str = f"{self.amount:.2f}".ljust(max_amount_width)
+    balance_str = f"{self.balance:.2f}".ljust(max_balance_width)
+    return f"{date_str} | {amount_str} | {balance_str}"
+
+
+def time_statement(account: BankAccount) -> float:
+    """
+    Time a single statement rendering with stdout discarded.
+
+    :return float: The elapsed seconds.
+    """
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        account.print_statement()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    account = build_account(ROWS)
+
+    cached_format = Transaction.format_transaction
+    Transaction.format_transaction = uncached_format
+    try:
+        uncached = min(time_statement(account) for _ in range(3))
+    finally:
+        Transaction.format_transaction = cached_format
+    cached = min(time_statement(account) for _ in range(3))
+
+    print(f"rows:              {ROWS}")
+    print(f"strftime per row:  {uncached * 1000:.1f} ms")
+    print(f"cached per second: {cached * 1000:.1f} ms")
+    print(f"speedup:           {uncached / cached:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure bulk statement throughput for a process pool against a single
+process.
+
+Run with: python -m benchmarks.bench_statement_job
+"""
+
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.service.statement_job import StatementJob
+
+ACCOUNTS = 200
+ROWS_PER_ACCOUNT = 2_000
+
+
+def build_accounts() -> dict:
+    """
+    Build accounts with alternating deposits and withdrawals.
+
+    :return dict: The accounts keyed by account id.
+    """
+    accounts = {}
+    for account_id in range(ACCOUNTS):
+        account = BankAccount(clock=StepClock(step=timedelta(milliseconds=250)))
+        for i in range(ROWS_PER_ACCOUNT // 2):
+            account.create_transaction(Decimal("100.00"), TransactionType.CREDIT)
+            account.create_transaction(Decimal("42.50"), TransactionType.DEBIT)
+        accounts[account_id] = account
+    return accounts
+
+
+def main() -> None:
+    accounts = build_accounts()
+    print(
+        f"accounts: {ACCOUNTS}, rows per account: {ROWS_PER_ACCOUNT}, CPUs: {os.cpu_count()}"
+    )
+
+    for workers in sorted({1, os.cpu_count() or 1, 4}):
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = StatementJob(output_dir, workers=workers, chunk_size=5_000).run(
+                accounts
+            )
+        print(
+            f"workers {workers}: {report.statements_per_second:>8,.1f} statements/s,"
+            f" {report.rows_per_second:>10,.0f} rows/s ({report.seconds:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
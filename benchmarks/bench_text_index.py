@@ -0,0 +1,113 @@
+"""
+Measure memo and category lookups through the inverted index against a
+full scan, and the memory the index and notes add per transaction.
+
+Run with: python -m benchmarks.bench_text_index
+"""
+
+import random
+import time
+import tracemalloc
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.search_index import normalize_category, tokenize
+from src.models.transaction_type import TransactionType
+
+ROWS = 200_000
+PAYEES = [f"payee{i}" for i in range(2_000)]
+WORDS = ["march", "april", "rent", "coffee", "salary", "refund", "invoice", "gift"]
+CATEGORIES = ["rent", "food", "travel", "pay", "utilities", "fun"]
+
+
+def build_account(rows: int, notes: bool) -> BankAccount:
+    """
+    Build an account of deposits, with or without memos and categories.
+
+    :param rows: The number of transactions.
+    :param notes: Flag if each transaction gets a memo and category.
+
+    :return BankAccount: The populated account.
+    """
+    generator = random.Random(42)
+    account = BankAccount(clock=StepClock())
+    for _ in range(rows):
+        amount = Decimal(generator.randint(1, 100_000)) / 100
+        if notes:
+            memo = f"{generator.choice(WORDS)} {generator.choice(PAYEES)}"
+            category = generator.choice(CATEGORIES)
+            account.create_transaction(
+                amount, TransactionType.CREDIT, memo=memo, category=category
+            )
+        else:
+            account.create_transaction(amount, TransactionType.CREDIT)
+    return account
+
+
+def scan(account: BankAccount, text: str, category: str) -> list:
+    """
+    Find matching transactions by reading every memo and category.
+    """
+    words = tokenize(text or "")
+    category = normalize_category(category) if category is not None else None
+    return [
+        t
+        for t in account.transactions
+        if (category is None or t.category == category)
+        and words <= tokenize(t.memo or "")
+    ]
+
+
+def best_of(function, repeat: int = 5) -> float:
+    """
+    Return the fastest of several timed calls in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def traced_bytes(notes: bool) -> int:
+    """
+    Return the traced bytes of an account built with or without notes.
+    """
+    tracemalloc.start()
+    account = build_account(ROWS, notes)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del account
+    return size
+
+
+def main() -> None:
+    plain = traced_bytes(False)
+    noted = traced_bytes(True)
+
+    account = build_account(ROWS, True)
+    queries = [
+        ("rare word", "payee7", None),
+        ("word + category", "payee7", "food"),
+        ("common + rare word", "march payee7", None),
+        ("category", None, "travel"),
+    ]
+
+    print(f"rows:                {ROWS}")
+    print(
+        f"memos + index:       {(noted - plain) / ROWS:.1f} bytes/transaction ({(noted - plain) / 1024 / 1024:.1f} MiB)"
+    )
+    for name, text, category in queries:
+        indexed = best_of(lambda: account.search_transactions(text, category))
+        scanned = best_of(lambda: scan(account, text, category), repeat=1)
+        matches = len(account.search_transactions(text, category))
+        assert len(scan(account, text, category)) == matches
+        print(
+            f"{name + ':':20} {matches:6} matches, index {indexed * 1000:.3f} ms, scan {scanned * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
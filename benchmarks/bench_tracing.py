@@ -0,0 +1,87 @@
+"""
+Measure the per-call cost of tracing on create_transaction with sampling
+off, at 1% and at 100%.
+
+Run with: python -m benchmarks.bench_tracing
+"""
+
+import functools
+import os
+import tempfile
+import time
+import timeit
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.tracing import traced, tracer
+
+CALLS = 200_000
+
+
+def time_calls(traced: bool) -> float:
+    """
+    Time create_transaction calls on fresh accounts, best of three runs.
+
+    :param traced: Flag to call through the tracing decorator.
+
+    :return float: The mean nanoseconds per call.
+    """
+    amount = Decimal("1.00")
+    timings = []
+    for _ in range(3):
+        account = BankAccount(clock=StepClock())
+        create = (
+            account.create_transaction
+            if traced
+            else functools.partial(BankAccount.create_transaction.__wrapped__, account)
+        )
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            create(amount, TransactionType.CREDIT)
+        timings.append((time.perf_counter() - start) / CALLS * 1e9)
+    return min(timings)
+
+
+def wrapper_cost() -> float:
+    """
+    Measure the decorator cost alone on an empty function with sampling off.
+
+    :return float: The added nanoseconds per call.
+    """
+
+    def plain(a, b):
+        return a
+
+    decorated = traced("empty")(plain)
+    plain_cost = min(timeit.repeat(lambda: plain(1, 2), number=CALLS, repeat=5))
+    decorated_cost = min(timeit.repeat(lambda: decorated(1, 2), number=CALLS, repeat=5))
+    return (decorated_cost - plain_cost) / CALLS * 1e9
+
+
+def main() -> None:
+    baseline = time_calls(traced=False)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "spans.jsonl")
+        for sample_rate in (0.0, 0.01, 1.0):
+            tracer.configure(path if sample_rate else None, sample_rate)
+            results.append((sample_rate, time_calls(traced=True)))
+            tracer.flush()
+        tracer.configure(None, 0.0)
+
+    print(f"calls:              {CALLS}")
+    print(
+        f"decorator, off:     {wrapper_cost():>8.0f} ns/call added to an empty function"
+    )
+    print(f"undecorated:        {baseline:>8.0f} ns/call")
+    for sample_rate, cost in results:
+        print(
+            f"sample rate {sample_rate:<6g}: {cost:>8.0f} ns/call ({cost - baseline:+.0f} ns)"
+        )
+
+
+if __name__ == "__main__":
+    main()
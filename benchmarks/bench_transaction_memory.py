@@ -0,0 +1,74 @@
+"""
+Report bytes per transaction with tracemalloc, before and after the
+compact Transaction layout.
+
+Run with: python -m benchmarks.bench_transaction_memory
+"""
+
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models.transaction import Transaction
+
+ROWS = 1_000_000
+ROUND_AMOUNTS = ["10", "20", "50", "100", "200", "500"]
+
+
+class DictTransaction:
+    """
+    The previous Transaction layout: a per-instance __dict__ with three
+    name-mangled private attributes and no amount interning.
+    """
+
+    def __init__(self, date: datetime, amount: Decimal, balance: Decimal):
+        self.__date = date
+        self.__amount = amount
+        self.__balance = balance
+
+
+def bytes_per_transaction(transaction_class: type, rows: int) -> float:
+    """
+    Measure traced bytes per transaction for one transaction class.
+
+    Amounts are parsed from text on every row, as user input would be,
+    and balances are unique per row.
+
+    :return float: The traced bytes per transaction.
+    """
+    start = datetime(2024, 1, 1)
+    step = timedelta(milliseconds=1)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    rows_list = []
+    balance = Decimal("0")
+    date = start
+    for i in range(rows):
+        amount = Decimal(ROUND_AMOUNTS[i % len(ROUND_AMOUNTS)])
+        balance += amount
+        rows_list.append(transaction_class(date, amount, balance))
+        date += step
+
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del rows_list
+    return used / rows
+
+
+def main() -> None:
+    before = bytes_per_transaction(DictTransaction, ROWS)
+    after = bytes_per_transaction(Transaction, ROWS)
+
+    print(f"rows:          {ROWS}")
+    print(f"before (dict): {before:.1f} bytes/transaction")
+    print(f"after (slots): {after:.1f} bytes/transaction")
+    print(
+        f"saved:         {before - after:.1f} bytes/transaction ({(1 - after / before) * 100:.0f}%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
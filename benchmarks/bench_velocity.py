@@ -0,0 +1,85 @@
+"""
+Measure the latency velocity rules add to each withdrawal, against
+recomputing the rolling window from the transaction history.
+
+Run with: python -m benchmarks.bench_velocity
+"""
+
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from src.models.bank_account import BankAccount
+from src.models.clock import StepClock
+from src.models.transaction_type import TransactionType
+from src.models.velocity import VelocityRule
+
+DEBITS = 100_000
+HISTORY = [1_000, 10_000, 100_000]
+RULES = [
+    VelocityRule(timedelta(hours=1), max_count=1_000_000, max_amount=Decimal(10**9)),
+    VelocityRule(timedelta(days=1), max_amount=Decimal(10**9)),
+]
+
+
+def funded_account(rules: list) -> BankAccount:
+    """
+    Build an account with enough funds for every withdrawal.
+
+    :param rules: The velocity rules to add.
+
+    :return BankAccount: The account.
+    """
+    account = BankAccount(clock=StepClock(step=timedelta(seconds=1)))
+    account.create_transaction(Decimal(10**9), TransactionType.CREDIT)
+    for rule in rules:
+        account.add_velocity_rule(rule)
+    return account
+
+
+def debit_seconds(rules: list) -> float:
+    """
+    Return the best time per withdrawal over several runs.
+    """
+    timings = []
+    for _ in range(3):
+        account = funded_account(rules)
+        amount = Decimal("1.25")
+        start = time.perf_counter()
+        for _ in range(DEBITS):
+            account.create_transaction(amount, TransactionType.DEBIT)
+        timings.append((time.perf_counter() - start) / DEBITS)
+    return min(timings)
+
+
+def scan_seconds(rows: int) -> float:
+    """
+    Return the time to recompute one hourly window from a history of rows.
+    """
+    account = funded_account([])
+    for _ in range(rows):
+        account.create_transaction(Decimal("1.25"), TransactionType.DEBIT)
+
+    transactions = account.transactions
+    since = transactions[-1].date - timedelta(hours=1)
+    start = time.perf_counter()
+    for _ in range(10):
+        recent = [t.amount for t in transactions if t.amount < 0 and t.date > since]
+        len(recent), sum(recent)
+    return (time.perf_counter() - start) / 10
+
+
+def main() -> None:
+    plain = debit_seconds([])
+    ruled = debit_seconds(RULES)
+
+    print(f"withdrawals:           {DEBITS} one second apart")
+    print(f"no rules:              {plain * 1e6:.2f} us/withdrawal")
+    print(f"{len(RULES)} rules (60 buckets): {ruled * 1e6:.2f} us/withdrawal")
+    print(f"added:                 {(ruled - plain) * 1e6:.2f} us/withdrawal")
+    for rows in HISTORY:
+        print(f"scan of {rows:>7} rows:   {scan_seconds(rows) * 1e6:.0f} us/withdrawal")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,28 @@
+import os
+import sys
+
+from src.tracing import tracer
 from src.service.view import BankView
 from src.service.controller import BankApp
 from src.models.bank_account import BankAccount
+from src.models.velocity import parse_velocity_rules
 
 if __name__ == "__main__":
+    # Optional tracing, eg: GIC_TRACE_FILE=spans.jsonl GIC_TRACE_SAMPLE_RATE=0.1
+    if os.environ.get("GIC_TRACE_FILE"):
+        tracer.configure(
+            os.environ["GIC_TRACE_FILE"],
+            float(os.environ.get("GIC_TRACE_SAMPLE_RATE", "1.0")),
+        )
+
     account = BankAccount()
+    # Optional withdrawal limits, eg: GIC_VELOCITY_RULES=3600:5:1000;86400::5000
+    try:
+        rules = parse_velocity_rules(os.environ.get("GIC_VELOCITY_RULES", ""))
+    except ValueError as error:
+        sys.exit(f"GIC_VELOCITY_RULES: {error}")
+    for rule in rules:
+        account.add_velocity_rule(rule)
+
     view = BankView()
     BankApp(account, view).run()
@@ -0,0 +1,327 @@
+import struct
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from .currency import BASE_CURRENCY
+from .statement import print_transactions
+from .transaction import Transaction
+
+MAGIC = b"GICA"
+VERSION = 3
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Segment header: magic, version, block count, row count, currency
+HEADER = struct.Struct("<4sHIQ3s")
+# Version 1 segments have no currency and hold BASE_CURRENCY rows
+HEADER_V1 = struct.Struct("<4sHIQ")
+# Block index entry: offset, compressed length, row count, first timestamp
+INDEX_ENTRY = struct.Struct("<QIIq")
+# Length of the varints of a block, before the memo and category text
+VARINTS_LENGTH = struct.Struct("<I")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """
+    Append a signed integer as a zigzag-encoded varint.
+    """
+    if not -(1 << 63) <= value < 1 << 63:
+        raise ValueError("Value out of range for the archive format.")
+    value = (value << 1) ^ (value >> 63)
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varints(data: bytes) -> list:
+    """
+    Decode every zigzag-encoded varint in a buffer.
+    """
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append((value >> 1) ^ -(value & 1))
+        value = shift = 0
+    return values
+
+
+def _write_text(out: bytearray, text: bytearray, value: str) -> None:
+    """
+    Append an optional string as a varint length (0 for None, else the
+    byte length plus one) and its UTF-8 bytes to the text section.
+    """
+    if value is None:
+        _write_varint(out, 0)
+        return
+    encoded = value.encode("utf-8")
+    _write_varint(out, len(encoded) + 1)
+    text += encoded
+
+
+def _read_text(text: bytes, position: int, length: int) -> tuple:
+    """
+    Read an optional string written by _write_text.
+
+    :return tuple: The string or None, and the position after it.
+    """
+    if length == 0:
+        return None, position
+    end = position + length - 1
+    return text[position:end].decode("utf-8"), end
+
+
+def _cents(amount: Decimal) -> int:
+    cents = amount.scaleb(2)
+    if cents != cents.to_integral_value():
+        raise ValueError("Archived amounts must be rounded to the cent.")
+    return int(cents)
+
+
+class ArchiveSegment:
+    """
+    Class to store transaction history compactly for cold storage.
+
+    Transactions are grouped in blocks. Each block keeps its opening
+    balance as a checkpoint, then for each row the timestamp delta in
+    microseconds, the amount in cents and the number of its note as
+    varints; balances are rebuilt from the checkpoint. Each distinct memo
+    and category pair of a block is stored once, after the varints, and
+    rows without either have note 0. Blocks are compressed with zlib and
+    listed in an index, so any block can be decoded on its own.
+
+    A segment holds rows of one currency, as balances are rebuilt from a
+    single running total.
+    """
+
+    def __init__(self, data: bytes):
+        """
+        Open a segment from its encoded bytes.
+
+        :param data: The bytes from to_bytes() or a segment file.
+        """
+        magic, version, block_count, rows = HEADER_V1.unpack_from(data, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("Not an archive segment.")
+
+        if version == 1:
+            header_size, currency = HEADER_V1.size, BASE_CURRENCY
+        else:
+            header_size = HEADER.size
+            currency = HEADER.unpack_from(data, 0)[4].decode("ascii")
+
+        self.__data: bytes = data
+        self.__version: int = version
+        self.__rows: int = rows
+        self.__currency: str = currency
+        self.__index: list = [
+            INDEX_ENTRY.unpack_from(data, header_size + i * INDEX_ENTRY.size)
+            for i in range(block_count)
+        ]
+
+    @classmethod
+    def from_transactions(
+        cls,
+        transactions: list,
+        block_size: int = 1024,
+        level: int = 6,
+        currency: str = None,
+    ) -> "ArchiveSegment":
+        """
+        Encode transactions, oldest first, into a segment.
+
+        Only rows in one currency are archived, so the sub-balance rows of
+        other currencies in an account's history are left out.
+
+        :param transactions: The transactions to archive.
+        :param block_size: The number of transactions per block.
+        :param level: The zlib compression level.
+        :param currency: The currency of the rows to archive (defaults to
+            the currency of the first row).
+
+        :return ArchiveSegment: The encoded segment.
+        """
+        if currency is None:
+            currency = transactions[0].currency if transactions else BASE_CURRENCY
+        if any(t.currency != currency for t in transactions):
+            transactions = [t for t in transactions if t.currency == currency]
+
+        blocks = []
+        for start in range(0, len(transactions), block_size):
+            rows = transactions[start : start + block_size]
+            first = rows[0]
+            first_timestamp = (first.date - EPOCH) // MICROSECOND
+
+            out = bytearray()
+            # Checkpoint: balance before the first row of the block
+            _write_varint(out, _cents(first.balance) - _cents(first.amount))
+            previous = first_timestamp
+            # Number of each distinct (memo, category), from 1
+            notes = {}
+            for transaction in rows:
+                timestamp = (transaction.date - EPOCH) // MICROSECOND
+                _write_varint(out, timestamp - previous)
+                _write_varint(out, _cents(transaction.amount))
+                note = (transaction.memo, transaction.category)
+                if note == (None, None):
+                    _write_varint(out, 0)
+                else:
+                    _write_varint(out, notes.setdefault(note, len(notes) + 1))
+                previous = timestamp
+
+            text = bytearray()
+            for memo, category in notes:
+                _write_text(out, text, memo)
+                _write_text(out, text, category)
+
+            payload = VARINTS_LENGTH.pack(len(out)) + out + text
+            blocks.append(
+                (zlib.compress(bytes(payload), level), len(rows), first_timestamp)
+            )
+
+        data = bytearray(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(blocks),
+                len(transactions),
+                currency.encode("ascii"),
+            )
+        )
+        offset = HEADER.size + len(blocks) * INDEX_ENTRY.size
+        for payload, rows, first_timestamp in blocks:
+            data += INDEX_ENTRY.pack(offset, len(payload), rows, first_timestamp)
+            offset += len(payload)
+        for payload, _, _ in blocks:
+            data += payload
+
+        return cls(bytes(data))
+
+    @classmethod
+    def load(cls, path: str) -> "ArchiveSegment":
+        """
+        Read a segment file.
+
+        :param path: The file to read.
+
+        :return ArchiveSegment: The segment.
+        """
+        with open(path, "rb") as file:
+            return cls(file.read())
+
+    def save(self, path: str) -> None:
+        """
+        Write the segment to a file.
+
+        :param path: The file to create.
+        """
+        with open(path, "wb") as file:
+            file.write(self.__data)
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the encoded segment.
+
+        :return bytes: The segment bytes.
+        """
+        return self.__data
+
+    def __len__(self) -> int:
+        return self.__rows
+
+    @property
+    def currency(self) -> str:
+        """
+        Read-only property to get the currency of the archived rows.
+
+        :return str: The currency code.
+        """
+        return self.__currency
+
+    @property
+    def block_count(self) -> int:
+        """
+        Read-only property to get the number of blocks.
+
+        :return int: The number of blocks.
+        """
+        return len(self.__index)
+
+    def block(self, index: int) -> list:
+        """
+        Decode a single block.
+
+        :param index: The block index.
+
+        :return list: The block's transactions, oldest first.
+        """
+        offset, length, rows, timestamp = self.__index[index]
+        payload = zlib.decompress(self.__data[offset : offset + length])
+
+        # Version 1 and 2 blocks have no notes
+        if self.__version < 3:
+            values = _read_varints(payload)
+            width = 2
+            notes = [(None, None)]
+        else:
+            (size,) = VARINTS_LENGTH.unpack_from(payload, 0)
+            start = VARINTS_LENGTH.size
+            values = _read_varints(payload[start : start + size])
+            text = payload[start + size :]
+            width = 3
+
+            notes = [(None, None)]
+            position = 0
+            for i in range(1 + 3 * rows, len(values), 2):
+                memo, position = _read_text(text, position, values[i])
+                category, position = _read_text(text, position, values[i + 1])
+                notes.append((memo, category))
+
+        balance = values[0]
+        transactions = []
+        for i in range(1, width * rows, width):
+            timestamp += values[i]
+            amount = values[i + 1]
+            balance += amount
+            memo, category = notes[values[i + 2]] if width == 3 else notes[0]
+            transactions.append(
+                Transaction(
+                    EPOCH + timestamp * MICROSECOND,
+                    Decimal(amount).scaleb(-2),
+                    Decimal(balance).scaleb(-2),
+                    self.__currency,
+                    memo,
+                    category,
+                )
+            )
+        return transactions
+
+    def transactions(self, first_block: int = 0, last_block: int = None) -> list:
+        """
+        Decode a range of blocks.
+
+        :param first_block: The first block index.
+        :param last_block: The last block index, inclusive (defaults to the last block).
+
+        :return list: The transactions, oldest first.
+        """
+        if last_block is None:
+            last_block = len(self.__index) - 1
+        transactions = []
+        for index in range(first_block, last_block + 1):
+            transactions.extend(self.block(index))
+        return transactions
+
+    def print_statement(self, first_block: int = 0, last_block: int = None) -> None:
+        """
+        Print the statement for a range of archived blocks.
+
+        :param first_block: The first block index.
+        :param last_block: The last block index, inclusive (defaults to the last block).
+        """
+        print_transactions(self.transactions(first_block, last_block))
@@ -1,8 +1,24 @@
-from datetime import datetime
+import threading
+import weakref
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
+from ..tracing import traced
+from .clock import Clock, SystemClock
+from .conditional_result import ConditionalResult
+from .currency import BASE_CURRENCY, normalize_currency
+from .fx_table import FxTable
+from .hold import Hold, HoldBook
+from .rollup import Rollup, RollupTable
+from .statement import print_transactions
+from .snapshot import SnapshotRegistry, snapshots
+from .subscription import Subscription
 from .transaction_type import TransactionType
 from .transaction import Transaction
+from .velocity import SlidingWindow, VelocityRule
+
+_ZERO = Decimal("0.00")
 
 
 class BankAccount:
@@ -10,84 +26,767 @@ class BankAccount:
     Class to represent a Bank Account.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        clock: Clock = None,
+        registry: SnapshotRegistry = None,
+        currency: str = BASE_CURRENCY,
+    ):
         """
         Initialise bank account with balance of 0.0 and no transactions.
+
+        :param clock: The source of transaction timestamps (defaults to the system clock).
+        :param registry: The source of commit sequence numbers and snapshots
+            (defaults to the registry shared by all accounts).
+        :param currency: The account currency, which holds, rollups, search
+            indexes and snapshot balances are kept in.
         """
         # Private attributes only modifiable within the class
         self.__balance: Decimal = Decimal("0.0")
+        self.__currency: str = normalize_currency(currency)
+        # Sub-balances of every other currency held
+        self.__foreign: dict = {}
+        # (target currency, FX table id) to (weak reference to the FX table,
+        # account version, FX version, total). The reference tells a reused
+        # id apart without keeping the table alive.
+        self.__converted_totals: dict = {}
         self.__transactions: list = []
+        self.__clock: Clock = clock if clock is not None else SystemClock()
+        self.__rollups: RollupTable = RollupTable()
+        self.__lock: threading.RLock = threading.RLock()
+        # Incremented on every change to the balance or the holds
+        self.__version: int = 0
+        self.__holds: HoldBook = HoldBook()
+        # Listeners with a publish(transaction) method, called on every append
+        self.__listeners: tuple = ()
+        # Errors raised by listeners, which never fail a committed change
+        self.__listener_errors: int = 0
+        self.__listener_error: Exception = None
+        # Optional search indexes, built by enable_indexes(). The
+        # search_index module (and re) is imported when first needed.
+        self.__amount_index: "AmountIndex" = None
+        self.__top_withdrawals: "TopN" = None
+        # Memo word and category index, built on the first memo or category
+        self.__text_index: "TextIndex" = None
+        # Sliding windows of the velocity rules on withdrawals
+        self.__velocity: tuple = ()
+        # The rule that rejected the last withdrawal, if any
+        self.__velocity_violation: VelocityRule = None
+        self.__registry: SnapshotRegistry = (
+            registry if registry is not None else snapshots
+        )
+        # (sequence, balance, transaction count) after each commit still
+        # visible to an open snapshot, oldest first
+        self.__versions: list = []
+
+    @classmethod
+    def restore(
+        cls,
+        balance: Decimal,
+        transactions: list,
+        balances: dict = None,
+        clock: Clock = None,
+        currency: str = BASE_CURRENCY,
+    ) -> "BankAccount":
+        """
+        Rebuild an account from stored state, eg: when loading it from storage.
+
+        The transactions may be only the most recent part of the history,
+        in which case the rollups cover only those transactions.
+
+        :param balance: The balance in the account currency.
+        :param transactions: The stored transactions, oldest first.
+        :param balances: The sub-balances by currency (defaults to none
+            besides the account currency).
+        :param clock: The source of transaction timestamps (defaults to the system clock).
+        :param currency: The account currency.
+
+        :return BankAccount: The restored account.
+        """
+        account = cls(clock=clock, currency=currency)
+        account.__balance = balance
+        account.__transactions = list(transactions)
+        for code, sub_balance in (balances or {}).items():
+            if code != account.__currency:
+                account.__foreign[normalize_currency(code)] = sub_balance
+        for position, transaction in enumerate(account.__transactions):
+            if transaction.memo is not None or transaction.category is not None:
+                account.__index_text(transaction, position)
+            if transaction.currency == account.__currency:
+                account.__rollups.add(
+                    transaction.date.date(), transaction.amount, transaction.balance
+                )
+        account.__commit()
+        return account
 
+    @traced("BankAccount.create_transaction")
     def create_transaction(
-        self, amount: Decimal, transaction_type: TransactionType
+        self,
+        amount: Decimal,
+        transaction_type: TransactionType,
+        currency: str = None,
+        memo: str = None,
+        category: str = None,
     ) -> bool:
         """
         Private method to create the transaction and update the balance.
 
         :param amount: The amount to deposit or withdraw.
         :param transaction_type: The type of transaction (CREDIT, DEBIT).
+        :param currency: The currency of the amount (defaults to the account currency).
+        :param memo: Free text describing the transaction.
+        :param category: The category of the transaction (eg: 'rent').
+
+        :return bool: Flag if creation of transaction is successful.
+        """
+        if memo is not None:
+            memo = memo.strip() or None
+        if category is not None:
+            from .search_index import normalize_category
+
+            category = normalize_category(category)
+        if currency is not None:
+            currency = normalize_currency(currency)
+
+        with self.__lock:
+            # Every withdrawal clears the rule that rejected the previous one
+            if transaction_type is TransactionType.DEBIT:
+                self.__velocity_violation = None
+
+            if currency is not None and currency != self.__currency:
+                return self.__create_foreign_transaction(
+                    amount, transaction_type, currency, memo, category
+                )
+
+            match transaction_type:
+                # Deposit
+                case TransactionType.CREDIT:
+                    self.__balance += amount
+                    self.__append(amount, memo, category)
+                    return True
+
+                # Withdrawal
+                case TransactionType.DEBIT:
+                    if len(self.__holds):
+                        self.sweep_expired_holds()
+
+                    # Funds reserved by holds are not available
+                    if amount <= self.__balance - self.__holds.total:
+                        now = None
+                        if self.__velocity:
+                            now = self.__clock.now()
+                            if not self.__velocity_allows(now, amount):
+                                return False
+                            for window in self.__velocity:
+                                window.add(now, amount)
+
+                        self.__balance -= amount
+                        self.__append(-amount, memo, category, now)
+                        return True
+
+                    else:
+                        return False
+
+                case _:
+                    print("Invalid transaction type detected.")
+                    return False
+
+    def __create_foreign_transaction(
+        self,
+        amount: Decimal,
+        transaction_type: TransactionType,
+        currency: str,
+        memo: str,
+        category: str,
+    ) -> bool:
+        """
+        Private method to create a transaction against the sub-balance of
+        another currency.
+
+        :param amount: The amount to deposit or withdraw.
+        :param transaction_type: The type of transaction (CREDIT, DEBIT).
+        :param currency: The normalized currency of the amount.
+        :param memo: The memo, or None.
+        :param category: The normalized category, or None.
 
         :return bool: Flag if creation of transaction is successful.
         """
+        balance = self.__foreign.get(currency, Decimal("0.0"))
+
         match transaction_type:
             # Deposit
             case TransactionType.CREDIT:
-                self.__balance += amount
-                self.__transactions.append(
-                    Transaction(datetime.now(), amount, self.__balance)
-                )
-                return True
+                balance += amount
 
             # Withdrawal
             case TransactionType.DEBIT:
-                if amount <= self.__balance:
-                    self.__balance -= amount
-                    self.__transactions.append(
-                        Transaction(datetime.now(), -amount, self.__balance)
-                    )
-                    return True
-
-                elif amount > self.__balance:
+                if amount > balance:
                     return False
+                balance -= amount
+                amount = -amount
 
             case _:
                 print("Invalid transaction type detected.")
                 return False
 
-    def print_statement(self) -> None:
+        self.__foreign[currency] = balance
+        self.__version += 1
+        transaction = Transaction(
+            self.__clock.now(), amount, balance, currency, memo, category
+        )
+        self.__transactions.append(transaction)
+        if memo is not None or category is not None:
+            self.__index_text(transaction, len(self.__transactions) - 1)
+        self.__commit()
+        self.__publish((transaction,))
+        return True
+
+    def create_transactions(self, entries: list, expected_version: int = None) -> list:
         """
-        Print the account statement to show all transactions.
+        Create several transactions in the account currency in one pass.
+
+        The transactions share one timestamp, one commit and one update of
+        the rollups, and follow the rules of create_transaction: a withdrawal
+        over the available balance or a velocity rule is rejected.
+
+        :param entries: The (amount, transaction type) pairs, applied in order.
+        :param expected_version: Only create the transactions if the account
+            has not changed since the caller read this version (defaults to
+            always creating them).
+
+        :return list: The flag of each transaction, as from create_transaction,
+            or None if the account version did not match.
         """
-        # Transaction history exists
-        if len(self.__transactions) > 0:
-            # Formatting maximum width of | Amount |
-            max_amount_width = max(len(f"{t.amount:.2f}") for t in self.__transactions)
-            max_amount_width = max(max_amount_width, len("Amount"))
+        with self.__lock:
+            if expected_version is not None and self.__version != expected_version:
+                return None
 
-            # Formatting maximum width of | Balance |
-            max_balance_width = max(
-                len(f"{t.balance:.2f}") for t in self.__transactions
-            )
-            max_balance_width = max(max_balance_width, len("Balance"))
+            now = self.__clock.now()
+            if len(self.__holds):
+                self.sweep_expired_holds(now)
+            balance = self.__balance
+            available = balance - self.__holds.total
+            currency = self.__currency
+
+            # The rows and their rollup totals, built in the same pass
+            results = []
+            appended = []
+            credits = debits = _ZERO
+            low = high = None
+            for amount, transaction_type in entries:
+                match transaction_type:
+                    # Deposit
+                    case TransactionType.CREDIT:
+                        balance += amount
+                        available += amount
+                        credits += amount
+
+                    # Withdrawal
+                    case TransactionType.DEBIT:
+                        self.__velocity_violation = None
+                        if amount > available or (
+                            self.__velocity and not self.__velocity_allows(now, amount)
+                        ):
+                            results.append(False)
+                            continue
+                        for window in self.__velocity:
+                            window.add(now, amount)
+                        balance -= amount
+                        available -= amount
+                        debits += amount
+                        amount = -amount
 
-            # Formatting width of Date |
-            date_width = len("dd MMM yyyy HH:mm:ssAM")
+                    case _:
+                        print("Invalid transaction type detected.")
+                        results.append(False)
+                        continue
 
-            # Print headers (Date, Amount, Balance) in formatted widths
-            print(
-                f"{'Date'.ljust(date_width)} | {'Amount'.ljust(max_amount_width)} | {'Balance'.ljust(max_balance_width)}"
+                appended.append(Transaction(now, amount, balance, currency))
+                results.append(True)
+                if low is None or balance < low:
+                    low = balance
+                if high is None or balance > high:
+                    high = balance
+
+            if appended:
+                self.__balance = balance
+                self.__version += 1
+                self.__transactions.extend(appended)
+                self.__rollups.add_totals(
+                    now.date(), credits, debits, len(appended), low, high
+                )
+                if self.__amount_index is not None:
+                    for transaction in appended:
+                        self.__index(transaction)
+
+                self.__commit()
+                self.__publish(appended)
+            return results
+
+    def create_transaction_if_version(
+        self,
+        amount: Decimal,
+        transaction_type: TransactionType,
+        expected_version: int,
+    ) -> ConditionalResult:
+        """
+        Create the transaction only if the account has not changed since
+        the caller read expected_version.
+
+        :param amount: The amount to deposit or withdraw.
+        :param transaction_type: The type of transaction (CREDIT, DEBIT).
+        :param expected_version: The version the caller's decision was based on.
+
+        :return ConditionalResult: APPLIED, CONFLICT (read again and retry),
+            or REJECTED (eg: insufficient funds).
+        """
+        with self.__lock:
+            if self.__version != expected_version:
+                return ConditionalResult.CONFLICT
+            if self.create_transaction(amount, transaction_type):
+                return ConditionalResult.APPLIED
+            return ConditionalResult.REJECTED
+
+    def authorize(self, amount: Decimal, ttl: timedelta = timedelta(days=7)) -> Hold:
+        """
+        Reserve funds until they are captured, released or expire.
+
+        :param amount: The amount to reserve.
+        :param ttl: How long the hold lasts.
+
+        :return Hold: The new hold, or None if the available balance is too low.
+        """
+        with self.__lock:
+            now = self.__clock.now()
+            if len(self.__holds):
+                self.__holds.sweep(now)
+
+            if amount > self.__balance - self.__holds.total:
+                return None
+            self.__version += 1
+            return self.__holds.add(amount, now + ttl)
+
+    def capture(self, hold_id: int, amount: Decimal = None) -> bool:
+        """
+        Settle a hold as a withdrawal, releasing any amount not captured.
+
+        :param hold_id: The hold to settle.
+        :param amount: The amount to withdraw (defaults to the full hold).
+
+        :return bool: Flag if the hold was open and the withdrawal created.
+        """
+        with self.__lock:
+            self.__velocity_violation = None
+            self.sweep_expired_holds()
+            hold = self.__holds.get(hold_id)
+            if hold is None or (amount is not None and amount > hold.amount):
+                return False
+
+            amount = hold.amount if amount is None else amount
+            # A capture over a velocity limit leaves the hold open
+            if self.__velocity and not self.__velocity_allows(
+                self.__clock.now(), amount
+            ):
+                return False
+
+            self.__holds.remove(hold_id)
+            return self.create_transaction(amount, TransactionType.DEBIT)
+
+    def release(self, hold_id: int) -> bool:
+        """
+        Cancel a hold, making its funds available again.
+
+        :param hold_id: The hold to cancel.
+
+        :return bool: Flag if the hold was open.
+        """
+        with self.__lock:
+            if self.__holds.remove(hold_id) is None:
+                return False
+            self.__version += 1
+            return True
+
+    def sweep_expired_holds(self, now: datetime = None) -> int:
+        """
+        Release every hold that has expired.
+
+        :param now: The current time (defaults to the account clock).
+
+        :return int: The number of holds released.
+        """
+        with self.__lock:
+            next_expiry = self.__holds.next_expiry()
+            if next_expiry is None:
+                return 0
+            if now is None:
+                now = self.__clock.now()
+            expired = len(self.__holds.sweep(now))
+            if expired:
+                self.__version += 1
+            return expired
+
+    def __append(
+        self,
+        amount: Decimal,
+        memo: str = None,
+        category: str = None,
+        now: datetime = None,
+    ) -> None:
+        """
+        Private method to record a transaction at the current balance.
+
+        :param amount: The signed amount of the transaction.
+        :param memo: The memo, or None.
+        :param category: The normalized category, or None.
+        :param now: The timestamp, if already read from the clock.
+        """
+        self.__version += 1
+        if now is None:
+            now = self.__clock.now()
+        transaction = Transaction(
+            now, amount, self.__balance, self.__currency, memo, category
+        )
+        self.__transactions.append(transaction)
+        self.__rollups.add(now.date(), amount, self.__balance)
+
+        if self.__amount_index is not None:
+            self.__index(transaction)
+        if memo is not None or category is not None:
+            self.__index_text(transaction, len(self.__transactions) - 1)
+
+        self.__commit()
+        self.__publish((transaction,))
+
+    def __publish(self, transactions) -> None:
+        """
+        Private method to notify the listeners of committed transactions.
+
+        The change is already applied, so a failing listener is recorded in
+        listener_errors instead of failing the caller, and the others still run.
+
+        :param transactions: The transactions appended, oldest first.
+        """
+        for listener in self.__listeners:
+            for transaction in transactions:
+                try:
+                    listener.publish(transaction)
+                except Exception as error:
+                    self.__listener_errors += 1
+                    self.__listener_error = error
+
+    def __commit(self) -> None:
+        """
+        Private method to record the committed state under a new global
+        sequence number and discard versions no open snapshot can see.
+        """
+        versions = self.__versions
+        sequence = self.__registry.next_sequence()
+        versions.append((sequence, self.__balance, len(self.__transactions)))
+
+        horizon = self.__registry.horizon
+        if horizon is None:
+            # No open snapshots, only the latest version is needed
+            del versions[:-1]
+        elif len(versions) > 2 and versions[1][0] <= horizon:
+            # Keep the newest version at or before the horizon
+            del versions[: bisect_right(versions, horizon, key=_sequence) - 1]
+
+    def __version_as_of(self, sequence: int) -> tuple:
+        """
+        Private method to find the committed state as of a sequence point.
+
+        Takes the lock so a commit in progress finishes first.
+
+        :param sequence: The sequence point.
+
+        :return tuple: The (sequence, balance, transaction count), or None
+            if nothing was committed before it.
+        """
+        with self.__lock:
+            index = bisect_right(self.__versions, sequence, key=_sequence)
+            return self.__versions[index - 1] if index else None
+
+    def balance_as_of(self, sequence: int) -> Decimal:
+        """
+        Get the balance as of a sequence point, usually through a Snapshot.
+
+        :param sequence: The sequence point, which must be pinned by an open snapshot.
+
+        :return Decimal: The balance.
+        """
+        version = self.__version_as_of(sequence)
+        return version[1] if version is not None else Decimal("0.0")
+
+    def transactions_as_of(self, sequence: int) -> list:
+        """
+        Get the transactions as of a sequence point, usually through a Snapshot.
+
+        :param sequence: The sequence point, which must be pinned by an open snapshot.
+
+        :return list: The transactions.
+        """
+        version = self.__version_as_of(sequence)
+        return self.__transactions[: version[2]] if version is not None else []
+
+    def add_listener(self, listener) -> None:
+        """
+        Call listener.publish(transaction) for every transaction appended from now on.
+
+        Listeners run while the account lock is held, so they must not block.
+
+        :param listener: The object to notify.
+        """
+        with self.__lock:
+            self.__listeners = self.__listeners + (listener,)
+
+    def remove_listener(self, listener) -> None:
+        """
+        Stop notifying a listener.
+
+        :param listener: The object to remove.
+        """
+        with self.__lock:
+            self.__listeners = tuple(
+                other for other in self.__listeners if other is not listener
             )
 
-            # Print all transactions
+    def subscribe(self, maxsize: int = 1024) -> Subscription:
+        """
+        Subscribe to transactions appended from now on.
+
+        :param maxsize: The most undelivered transactions kept for the listener.
+
+        :return Subscription: The subscription to read new transactions from.
+        """
+        subscription = Subscription(maxsize)
+        self.add_listener(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop delivering transactions to a subscription.
+
+        :param subscription: The subscription to remove.
+        """
+        self.remove_listener(subscription)
+
+    def __index(self, transaction: Transaction) -> None:
+        """
+        Private method to add a transaction to the search indexes.
+
+        :param transaction: The transaction to index.
+        """
+        self.__amount_index.add(transaction)
+        if transaction.amount < 0:
+            self.__top_withdrawals.add(transaction)
+
+    def add_velocity_rule(self, rule: VelocityRule) -> None:
+        """
+        Limit the withdrawals in the account currency over a rolling window.
+
+        Withdrawals over a limit are rejected, and velocity_violation gives
+        the rule. Only withdrawals made after the rule is added count
+        towards it.
+
+        :param rule: The rule to enforce.
+        """
+        with self.__lock:
+            self.__velocity = (*self.__velocity, SlidingWindow(rule))
+
+    def __velocity_allows(self, now: datetime, amount: Decimal) -> bool:
+        """
+        Private method to check a withdrawal against every velocity rule,
+        recording the first rule it would break.
+
+        :param now: The time of the withdrawal.
+        :param amount: The amount of the withdrawal.
+
+        :return bool: Flag if the withdrawal is within every rule.
+        """
+        for window in self.__velocity:
+            if not window.allows(now, amount):
+                self.__velocity_violation = window.rule
+                return False
+        return True
+
+    def __index_text(self, transaction: Transaction, position: int) -> None:
+        """
+        Private method to add a transaction's memo and category to the text index.
+
+        :param transaction: The transaction to index.
+        :param position: The position of the transaction in the ledger.
+        """
+        if self.__text_index is None:
+            from .search_index import TextIndex
+
+            self.__text_index = TextIndex()
+        self.__text_index.add(transaction, position)
+
+    def search_transactions(self, text: str = None, category: str = None) -> list:
+        """
+        Find transactions whose memo contains every word of the text, and
+        whose category matches if given, without scanning the ledger.
+
+        :param text: The words to find, in any case and order.
+        :param category: The category to match (eg: 'rent' or '#rent').
+
+        :return list: The matching transactions, oldest first.
+        """
+        if self.__text_index is None:
+            return []
+        return [
+            self.__transactions[position]
+            for position in self.__text_index.search(text, category)
+        ]
+
+    def enable_indexes(self, top_n: int = 100) -> None:
+        """
+        Build the amount and top withdrawal indexes and maintain them on
+        every later transaction. Like the scans without indexes, they only
+        cover transactions in the account currency.
+
+        :param top_n: The number of largest withdrawals to keep in the heap.
+        """
+        from .search_index import AmountIndex, TopN
+
+        with self.__lock:
+            self.__amount_index = AmountIndex()
+            self.__top_withdrawals = TopN(top_n)
             for transaction in self.__transactions:
-                print(
-                    transaction.format_transaction(max_amount_width, max_balance_width)
+                if transaction.currency == self.__currency:
+                    self.__index(transaction)
+
+    def transactions_between(
+        self, low: Decimal, high: Decimal, transaction_type: TransactionType = None
+    ) -> list:
+        """
+        Find transactions in the account currency whose amount is between
+        two values, inclusive.
+
+        :param low: The lowest amount, as a positive number.
+        :param high: The highest amount, as a positive number.
+        :param transaction_type: Only return CREDIT or DEBIT transactions (defaults to both).
+
+        :return list: The matching transactions, ordered by signed amount.
+        """
+        # Withdrawals are stored as negative amounts
+        ranges = []
+        if transaction_type in (None, TransactionType.DEBIT):
+            ranges.append((-high, -low))
+        if transaction_type in (None, TransactionType.CREDIT):
+            ranges.append((low, high))
+
+        result = []
+        for range_low, range_high in ranges:
+            if self.__amount_index is not None:
+                result.extend(self.__amount_index.between(range_low, range_high))
+            else:
+                result.extend(
+                    sorted(
+                        (
+                            t
+                            for t in self.__transactions
+                            if range_low <= t.amount <= range_high
+                            and t.currency == self.__currency
+                        ),
+                        key=lambda t: t.amount,
+                    )
                 )
+        return result
+
+    def largest_withdrawals(self, n: int) -> list:
+        """
+        Find the largest withdrawals in the account currency, largest first.
 
-        # No transaction history
+        :param n: The number of withdrawals.
+
+        :return list: The withdrawal transactions.
+        """
+        if self.__top_withdrawals is not None:
+            if n <= self.__top_withdrawals.size:
+                return self.__top_withdrawals.largest(n)
+            # Most negative amounts come first in the amount index
+            return [t for t in self.__amount_index.smallest(n) if t.amount < 0]
+
+        withdrawals = [
+            t
+            for t in self.__transactions
+            if t.amount < 0 and t.currency == self.__currency
+        ]
+        return sorted(withdrawals, key=lambda t: t.amount)[:n]
+
+    def summarize(self, start: date = None, end: date = None) -> Rollup:
+        """
+        Summarize the transactions between two days, inclusive.
+
+        :param start: The first day (defaults to the first transaction).
+        :param end: The last day (defaults to the last transaction).
+
+        :return Rollup: The credits, debits, count and balance range.
+        """
+        return self.__rollups.summarize(start, end)
+
+    def total_in(self, currency: str, fx: FxTable) -> Decimal:
+        """
+        Get the sum of every sub-balance converted to one currency.
+
+        Each sub-balance is converted and rounded separately. The total is
+        cached until the account or the rates change.
+
+        :param currency: The currency to convert to.
+        :param fx: The exchange rates.
+
+        :return Decimal: The converted total.
+        """
+        currency = normalize_currency(currency)
+        key = (currency, id(fx))
+        fx_version = fx.version
+        with self.__lock:
+            version = self.__version
+            cached = self.__converted_totals.get(key)
+            if (
+                cached is not None
+                and cached[0]() is fx
+                and cached[1:3] == (version, fx_version)
+            ):
+                return cached[3]
+            balances = self.balances
+
+        total = sum(
+            fx.convert(balance, source, currency)
+            for source, balance in balances.items()
+        )
+        # Only cache a total computed from a single version of the rates
+        if fx.version == fx_version:
+            with self.__lock:
+                totals = self.__converted_totals
+                # Drop the totals of FX tables that no longer exist
+                for stale in [k for k, v in totals.items() if v[0]() is None]:
+                    del totals[stale]
+                totals[key] = (weakref.ref(fx), version, fx_version, total)
+        return total
+
+    @traced("BankAccount.print_statement")
+    def print_statement(self, currency: str = None, fx: FxTable = None) -> None:
+        """
+        Print the account statement to show all transactions.
+
+        :param currency: The currency to convert every row to (defaults to
+            no conversion).
+        :param fx: The exchange rates, required with a currency.
+        """
+        if currency is not None and fx is None:
+            raise ValueError("Converting a statement needs an FxTable.")
+
+        if currency is not None:
+            print_transactions(
+                fx.convert_transactions(
+                    self.__transactions, normalize_currency(currency)
+                ),
+                show_currency=True,
+            )
         else:
-            print(f"{'Date'.ljust(20)} | {'Amount'.ljust(10)} | {'Balance'.ljust(10)}")
-            print("No transactions found.")
+            print_transactions(self.__transactions, show_currency=bool(self.__foreign))
 
     @property
     def balance(self) -> Decimal:
@@ -98,6 +797,152 @@ class BankAccount:
         """
         return self.__balance
 
+    @property
+    def currency(self) -> str:
+        """
+        Read-only property to get the account currency.
+
+        :return str: The currency code of the balance.
+        """
+        return self.__currency
+
+    @property
+    def balances(self) -> dict:
+        """
+        Read-only property to get the sub-balance of every currency held.
+
+        :return dict: The balances by currency code, account currency first.
+        """
+        with self.__lock:
+            return {self.__currency: self.__balance, **self.__foreign}
+
+    @property
+    def version(self) -> int:
+        """
+        Read-only property to get the version, incremented on every change.
+
+        :return int: The account version.
+        """
+        return self.__version
+
+    @property
+    def versioned_balance(self) -> tuple:
+        """
+        Read-only property to get the version and available balance without
+        taking the lock.
+
+        The version is read first, so a change between the two reads makes
+        a later create_transaction_if_version conflict rather than apply
+        on a stale balance.
+
+        :return tuple: The version and the available balance.
+        """
+        version = self.__version
+        return version, self.__balance - self.__holds.total
+
+    @property
+    def velocity_violation(self) -> VelocityRule:
+        """
+        Read-only property to get the velocity rule that rejected the last
+        withdrawal, so callers can tell it from insufficient funds.
+
+        :return VelocityRule: The rule, or None if the last withdrawal was not
+            rejected by a rule.
+        """
+        return self.__velocity_violation
+
+    @property
+    def listener_errors(self) -> int:
+        """
+        Read-only property to get the number of errors raised by listeners.
+
+        :return int: The number of errors.
+        """
+        return self.__listener_errors
+
+    @property
+    def listener_error(self) -> Exception:
+        """
+        Read-only property to get the last error raised by a listener.
+
+        :return Exception: The error, or None if no listener failed.
+        """
+        return self.__listener_error
+
+    @property
+    def available_balance(self) -> Decimal:
+        """
+        Read-only property to get the balance not reserved by holds.
+
+        :return Decimal: The available balance.
+        """
+        return self.__balance - self.__holds.total
+
+    @property
+    def held(self) -> Decimal:
+        """
+        Read-only property to get the total reserved by open holds.
+
+        :return Decimal: The held amount.
+        """
+        return self.__holds.total
+
+    @property
+    def has_unstored_state(self) -> bool:
+        """
+        Read-only property to check for state that lives only in memory:
+        open holds, listeners, velocity rules or amount indexes.
+
+        Restoring an account from its balances and history loses this
+        state, so an account with it should stay resident.
+
+        :return bool: Flag if the account has such state.
+        """
+        return bool(
+            len(self.__holds)
+            or self.__listeners
+            or self.__velocity
+            or self.__amount_index is not None
+        )
+
+    @property
+    def retained_versions(self) -> int:
+        """
+        Read-only property to get the number of versions kept for snapshots.
+
+        :return int: The retained version count.
+        """
+        return len(self.__versions)
+
+    @property
+    def lock(self) -> threading.RLock:
+        """
+        Read-only property to get the re-entrant lock guarding mutations.
+
+        Holding it lets a caller apply several transactions in one acquisition.
+
+        :return threading.RLock: The account lock.
+        """
+        return self.__lock
+
+    @property
+    def rollups(self) -> RollupTable:
+        """
+        Read-only property to get the daily and monthly rollups.
+
+        :return RollupTable: The account rollups.
+        """
+        return self.__rollups
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Read-only property to get the source of transaction timestamps.
+
+        :return Clock: The account clock.
+        """
+        return self.__clock
+
     @property
     def transactions(self) -> list:
         """
@@ -106,3 +951,10 @@ class BankAccount:
         :return list: The account transactions.
         """
         return self.__transactions
+
+
+def _sequence(version: tuple) -> int:
+    """
+    Key of a retained version, its commit sequence.
+    """
+    return version[0]
@@ -0,0 +1,94 @@
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+
+class Clock(ABC):
+    """
+    Abstract class to represent a source of transaction timestamps.
+    """
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """
+        Return the current timestamp.
+
+        :return datetime: The current timestamp.
+        """
+
+
+class SystemClock(Clock):
+    """
+    Class to read timestamps from the system clock on every call.
+    """
+
+    def now(self) -> datetime:
+        """
+        Return the current system timestamp.
+
+        :return datetime: The current timestamp.
+        """
+        return datetime.now()
+
+
+class CoarseClock(Clock):
+    """
+    Class to read the system clock at most once per tick.
+
+    Calls within the same tick return the cached timestamp, which avoids
+    a system call for every transaction on busy accounts.
+    """
+
+    def __init__(self, tick: float = 0.001):
+        """
+        Initialise the clock with the tick length.
+
+        :param tick: The number of seconds a cached timestamp stays valid.
+        """
+        self.__tick: float = tick
+        self.__expires: float = 0.0
+        self.__cached: datetime = None
+
+    def now(self) -> datetime:
+        """
+        Return the cached timestamp, refreshing it once the tick has passed.
+
+        :return datetime: The current timestamp.
+        """
+        monotonic = time.monotonic()
+        if monotonic >= self.__expires:
+            self.__cached = datetime.now()
+            self.__expires = monotonic + self.__tick
+        return self.__cached
+
+
+class StepClock(Clock):
+    """
+    Class to produce deterministic timestamps for tests and benchmarks.
+
+    Each call returns the start timestamp advanced by one more step.
+    """
+
+    def __init__(
+        self,
+        start: datetime = datetime(2024, 1, 1),
+        step: timedelta = timedelta(seconds=1),
+    ):
+        """
+        Initialise the clock with the first timestamp and the step size.
+
+        :param start: The timestamp returned by the first call.
+        :param step: The amount of time added on each call.
+        """
+        self.__next: datetime = start
+        self.__step: timedelta = step
+
+    def now(self) -> datetime:
+        """
+        Return the next timestamp in the sequence.
+
+        :return datetime: The current timestamp.
+        """
+        current = self.__next
+        self.__next = current + self.__step
+        return current
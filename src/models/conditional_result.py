@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ConditionalResult(Enum):
+    APPLIED = "applied"
+    CONFLICT = "conflict"
+    REJECTED = "rejected"
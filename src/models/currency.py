@@ -0,0 +1,68 @@
+import sys
+from decimal import Decimal
+from functools import lru_cache
+
+# Currency of an account unless another is given
+BASE_CURRENCY = "USD"
+
+CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "SGD": "S$",
+    "JPY": "¥",
+}
+
+# Decimal places of the smallest unit, where not 2 (eg: the yen has no cents)
+_MINOR_UNITS = {"JPY": 0}
+
+
+def normalize_currency(code: str) -> str:
+    """
+    Return the shared instance of a currency code, in upper case.
+
+    Transactions keep a reference to the code, so one instance per
+    currency keeps rows compact.
+
+    :param code: The currency code (eg: 'eur').
+
+    :return str: The normalized code (eg: 'EUR').
+    """
+    return sys.intern(code.strip().upper())
+
+
+def minor_units(currency: str) -> int:
+    """
+    Return the decimal places of the smallest unit of a currency.
+
+    :param currency: The currency code.
+
+    :return int: The number of decimal places.
+    """
+    return _MINOR_UNITS.get(currency, 2)
+
+
+@lru_cache(maxsize=64)
+def quantum(currency: str) -> Decimal:
+    """
+    Return the smallest unit of a currency, for exact rounding.
+
+    :param currency: The currency code.
+
+    :return Decimal: The smallest unit (eg: Decimal('0.01')).
+    """
+    return Decimal(1).scaleb(-minor_units(currency))
+
+
+def format_money(amount: Decimal, currency: str = BASE_CURRENCY) -> str:
+    """
+    Format an amount with its currency symbol, or its code if it has none.
+
+    :param amount: The amount to format.
+    :param currency: The currency code.
+
+    :return str: The formatted amount (eg: '$10.00', '10.00 CHF').
+    """
+    text = f"{amount:.{minor_units(currency)}f}"
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    return f"{symbol}{text}" if symbol is not None else f"{text} {currency}"
@@ -0,0 +1,192 @@
+import threading
+from decimal import ROUND_HALF_EVEN, Decimal
+from types import MappingProxyType
+
+from .currency import quantum
+from .transaction import Transaction
+
+
+class FxTable:
+    """
+    Class to hold foreign exchange rates, versioned so converted totals
+    can be cached until the rates change.
+
+    Every update replaces the whole rate mapping, so a conversion reads
+    one consistent set of rates without taking the lock. Results are
+    rounded half-even to the smallest unit of the target currency.
+    """
+
+    def __init__(self, rates: dict = None):
+        """
+        Initialise the table.
+
+        :param rates: The initial rates, as {(source, target): rate}.
+        """
+        self.__lock: threading.Lock = threading.Lock()
+        self.__rates: dict = {}
+        self.__version: int = 0
+        if rates:
+            self.set_rates(rates)
+
+    def set_rate(self, source: str, target: str, rate: Decimal) -> None:
+        """
+        Set the rate from one currency to another.
+
+        :param source: The currency converted from.
+        :param target: The currency converted to.
+        :param rate: The units of target per unit of source.
+        """
+        self.set_rates({(source, target): rate})
+
+    def set_rates(self, rates: dict) -> None:
+        """
+        Set several rates as one new version.
+
+        :param rates: The rates, as {(source, target): rate}.
+        """
+        for rate in rates.values():
+            if not rate > 0:
+                raise ValueError(f"Exchange rates must be positive, not {rate}.")
+
+        with self.__lock:
+            self.__rates = {**self.__rates, **rates}
+            self.__version += 1
+
+    def rate(self, source: str, target: str) -> Decimal:
+        """
+        Get the rate from one currency to another.
+
+        If only the opposite rate is set, its inverse is used, to the 28
+        significant digits of the decimal context.
+
+        :param source: The currency converted from.
+        :param target: The currency converted to.
+
+        :return Decimal: The units of target per unit of source.
+        """
+        return _rate(self.__rates, source, target)
+
+    def convert(self, amount: Decimal, source: str, target: str) -> Decimal:
+        """
+        Convert a single amount.
+
+        :param amount: The amount in the source currency.
+        :param source: The currency converted from.
+        :param target: The currency converted to.
+
+        :return Decimal: The amount in the target currency.
+        """
+        return (amount * self.rate(source, target)).quantize(
+            quantum(target), ROUND_HALF_EVEN
+        )
+
+    def convert_column(self, amounts: list, source: str, target: str) -> list:
+        """
+        Convert a column of amounts with one rate lookup.
+
+        Each distinct amount is converted once, so repeated amounts
+        (eg: round deposits) cost a dictionary lookup.
+
+        :param amounts: The amounts in the source currency.
+        :param source: The currency converted from.
+        :param target: The currency converted to.
+
+        :return list: The amounts in the target currency, in the same order.
+        """
+        return _convert_column(self.__rates, amounts, source, target)
+
+    def convert_transactions(self, transactions: list, target: str) -> list:
+        """
+        Convert the amount and balance columns of transactions in any
+        currencies to one currency, with every rate from the same version.
+
+        Rates are looked up once per source currency and each distinct
+        amount is converted once.
+
+        :param transactions: The transactions to convert.
+        :param target: The currency converted to.
+
+        :return list: New transactions in the target currency, in the same order.
+        """
+        rates = self.__rates
+        unit = quantum(target)
+
+        # Rate and converted amounts of each source currency, looked up once
+        columns: dict = {}
+        converted = []
+        for transaction in transactions:
+            column = columns.get(transaction.currency)
+            if column is None:
+                column = columns[transaction.currency] = (
+                    _rate(rates, transaction.currency, target),
+                    {},
+                )
+            rate, amounts = column
+
+            # Amounts repeat (eg: round deposits), running balances rarely do
+            amount = amounts.get(transaction.amount)
+            if amount is None:
+                amount = amounts[transaction.amount] = (
+                    transaction.amount * rate
+                ).quantize(unit, ROUND_HALF_EVEN)
+            balance = (transaction.balance * rate).quantize(unit, ROUND_HALF_EVEN)
+            converted.append(
+                Transaction(
+                    transaction.date,
+                    amount,
+                    balance,
+                    target,
+                    transaction.memo,
+                    transaction.category,
+                )
+            )
+        return converted
+
+    @property
+    def version(self) -> int:
+        """
+        Read-only property to get the version, incremented on every update.
+
+        :return int: The rate table version.
+        """
+        return self.__version
+
+    @property
+    def rates(self) -> MappingProxyType:
+        """
+        Read-only property to get the current rates.
+
+        :return MappingProxyType: The rates, as {(source, target): rate}.
+        """
+        return MappingProxyType(self.__rates)
+
+
+def _rate(rates: dict, source: str, target: str) -> Decimal:
+    """
+    Look up a rate, directly or as the inverse of the opposite rate.
+    """
+    if source == target:
+        return Decimal(1)
+
+    rate = rates.get((source, target))
+    if rate is not None:
+        return rate
+
+    inverse = rates.get((target, source))
+    if inverse is not None:
+        return 1 / inverse
+
+    raise KeyError(f"No exchange rate from {source} to {target}.")
+
+
+def _convert_column(rates: dict, amounts: list, source: str, target: str) -> list:
+    """
+    Convert a column of amounts, converting each distinct amount once.
+    """
+    rate = _rate(rates, source, target)
+    unit = quantum(target)
+    converted = {
+        amount: (amount * rate).quantize(unit, ROUND_HALF_EVEN)
+        for amount in set(amounts)
+    }
+    return [converted[amount] for amount in amounts]
@@ -0,0 +1,150 @@
+import heapq
+from datetime import datetime
+from decimal import Decimal
+from itertools import count
+
+
+class Hold:
+    """
+    Class to represent funds reserved on an account until captured,
+    released or expired.
+    """
+
+    __slots__ = ("__hold_id", "__amount", "__expires_at")
+
+    def __init__(self, hold_id: int, amount: Decimal, expires_at: datetime):
+        """
+        Initialise the hold.
+
+        :param hold_id: The identifier of the hold.
+        :param amount: The amount reserved.
+        :param expires_at: The time after which the hold lapses.
+        """
+        self.__hold_id: int = hold_id
+        self.__amount: Decimal = amount
+        self.__expires_at: datetime = expires_at
+
+    @property
+    def hold_id(self) -> int:
+        """
+        Read-only property to get the hold identifier.
+
+        :return int: The hold identifier.
+        """
+        return self.__hold_id
+
+    @property
+    def amount(self) -> Decimal:
+        """
+        Read-only property to get the reserved amount.
+
+        :return Decimal: The reserved amount.
+        """
+        return self.__amount
+
+    @property
+    def expires_at(self) -> datetime:
+        """
+        Read-only property to get the expiry time.
+
+        :return datetime: The time after which the hold lapses.
+        """
+        return self.__expires_at
+
+
+class HoldBook:
+    """
+    Class to track the open holds of an account and their total.
+
+    The total is updated in O(1) on every change. Expiries sit in a
+    min-heap, so sweeping touches only holds that have expired. Holds
+    settled before expiry are removed from the heap lazily.
+    """
+
+    def __init__(self):
+        """
+        Initialise with no holds.
+        """
+        self.__holds: dict = {}
+        self.__expiries: list = []
+        self.__total: Decimal = Decimal("0.00")
+        self.__ids = count(1)
+
+    def __len__(self) -> int:
+        return len(self.__holds)
+
+    @property
+    def total(self) -> Decimal:
+        """
+        Read-only property to get the total reserved by open holds.
+
+        :return Decimal: The held amount.
+        """
+        return self.__total
+
+    def add(self, amount: Decimal, expires_at: datetime) -> Hold:
+        """
+        Open a new hold.
+
+        :param amount: The amount to reserve.
+        :param expires_at: The time after which the hold lapses.
+
+        :return Hold: The new hold.
+        """
+        hold = Hold(next(self.__ids), amount, expires_at)
+        self.__holds[hold.hold_id] = hold
+        heapq.heappush(self.__expiries, (expires_at, hold.hold_id))
+        self.__total += amount
+        return hold
+
+    def get(self, hold_id: int) -> Hold:
+        """
+        Return an open hold.
+
+        :return Hold: The hold, or None if it is not open.
+        """
+        return self.__holds.get(hold_id)
+
+    def remove(self, hold_id: int) -> Hold:
+        """
+        Close a hold, leaving its heap entry to be skipped later.
+
+        :return Hold: The closed hold, or None if it was not open.
+        """
+        hold = self.__holds.pop(hold_id, None)
+        if hold is not None:
+            self.__total -= hold.amount
+
+            # Rebuild once stale entries outnumber open holds, keeping memory bounded
+            if len(self.__expiries) > 64 and len(self.__expiries) > 2 * len(
+                self.__holds
+            ):
+                self.__expiries = [
+                    (h.expires_at, h.hold_id) for h in self.__holds.values()
+                ]
+                heapq.heapify(self.__expiries)
+        return hold
+
+    def sweep(self, now: datetime) -> list:
+        """
+        Close every hold that has expired by now.
+
+        :param now: The current time.
+
+        :return list: The expired holds.
+        """
+        expired = []
+        while self.__expiries and self.__expiries[0][0] <= now:
+            _, hold_id = heapq.heappop(self.__expiries)
+            hold = self.remove(hold_id)
+            if hold is not None:
+                expired.append(hold)
+        return expired
+
+    def next_expiry(self) -> datetime:
+        """
+        Return the earliest expiry still in the heap.
+
+        :return datetime: The expiry, or None if there are no entries.
+        """
+        return self.__expiries[0][0] if self.__expiries else None
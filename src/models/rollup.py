@@ -0,0 +1,252 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+
+class Rollup:
+    """
+    Class to represent pre-aggregated totals for a period of transactions.
+    """
+
+    __slots__ = ("__credits", "__debits", "__count", "__min_balance", "__max_balance")
+
+    def __init__(self):
+        """
+        Initialise an empty rollup with no transactions.
+        """
+        self.__credits: Decimal = Decimal("0.00")
+        self.__debits: Decimal = Decimal("0.00")
+        self.__count: int = 0
+        self.__min_balance: Decimal = None
+        self.__max_balance: Decimal = None
+
+    def add(self, amount: Decimal, balance: Decimal) -> None:
+        """
+        Add a single transaction to the rollup.
+
+        :param amount: The signed amount of the transaction.
+        :param balance: The balance after the transaction.
+        """
+        if amount >= 0:
+            self.__credits += amount
+        else:
+            self.__debits -= amount
+        self.__count += 1
+        if self.__min_balance is None or balance < self.__min_balance:
+            self.__min_balance = balance
+        if self.__max_balance is None or balance > self.__max_balance:
+            self.__max_balance = balance
+
+    def add_totals(
+        self, credits: Decimal, debits: Decimal, count: int, low: Decimal, high: Decimal
+    ) -> None:
+        """
+        Add the totals of several transactions at once.
+
+        :param credits: The sum of the credit amounts.
+        :param debits: The sum of the debit amounts, as a positive number.
+        :param count: The number of transactions.
+        :param low: The lowest balance after any of the transactions.
+        :param high: The highest balance after any of the transactions.
+        """
+        self.__credits += credits
+        self.__debits += debits
+        self.__count += count
+        if self.__min_balance is None or low < self.__min_balance:
+            self.__min_balance = low
+        if self.__max_balance is None or high > self.__max_balance:
+            self.__max_balance = high
+
+    def merge(self, other: "Rollup") -> None:
+        """
+        Combine another rollup into this one.
+
+        :param other: The rollup to combine.
+        """
+        if other is None or other.count == 0:
+            return
+        self.__credits += other.credits
+        self.__debits += other.debits
+        self.__count += other.count
+        if self.__min_balance is None or other.min_balance < self.__min_balance:
+            self.__min_balance = other.min_balance
+        if self.__max_balance is None or other.max_balance > self.__max_balance:
+            self.__max_balance = other.max_balance
+
+    @property
+    def credits(self) -> Decimal:
+        """
+        Read-only property to get the total deposited.
+
+        :return Decimal: The sum of credit amounts.
+        """
+        return self.__credits
+
+    @property
+    def debits(self) -> Decimal:
+        """
+        Read-only property to get the total withdrawn.
+
+        :return Decimal: The sum of debit amounts, as a positive number.
+        """
+        return self.__debits
+
+    @property
+    def count(self) -> int:
+        """
+        Read-only property to get the number of transactions.
+
+        :return int: The number of transactions.
+        """
+        return self.__count
+
+    @property
+    def min_balance(self) -> Decimal:
+        """
+        Read-only property to get the lowest balance after any transaction.
+
+        :return Decimal: The minimum balance, or None if there are no transactions.
+        """
+        return self.__min_balance
+
+    @property
+    def max_balance(self) -> Decimal:
+        """
+        Read-only property to get the highest balance after any transaction.
+
+        :return Decimal: The maximum balance, or None if there are no transactions.
+        """
+        return self.__max_balance
+
+
+def _month_end(day: date) -> date:
+    """
+    Return the last day of the month containing the given day.
+    """
+    first_of_next = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first_of_next - timedelta(days=1)
+
+
+class RollupTable:
+    """
+    Class to maintain daily and monthly rollups updated on every transaction.
+
+    Range queries combine whole months where possible and single days at
+    the edges, so their cost depends on the number of buckets rather than
+    the number of transactions.
+    """
+
+    def __init__(self):
+        """
+        Initialise empty daily and monthly tables.
+        """
+        self.__daily: dict = {}
+        self.__monthly: dict = {}
+        self.__first_day: date = None
+        self.__last_day: date = None
+
+    def add(self, day: date, amount: Decimal, balance: Decimal) -> None:
+        """
+        Add a transaction to its day and month buckets.
+
+        :param day: The day of the transaction.
+        :param amount: The signed amount of the transaction.
+        :param balance: The balance after the transaction.
+        """
+        daily = self.__daily.get(day)
+        if daily is None:
+            daily = self.__daily[day] = Rollup()
+        daily.add(amount, balance)
+
+        month = (day.year, day.month)
+        monthly = self.__monthly.get(month)
+        if monthly is None:
+            monthly = self.__monthly[month] = Rollup()
+        monthly.add(amount, balance)
+
+        if self.__first_day is None or day < self.__first_day:
+            self.__first_day = day
+        if self.__last_day is None or day > self.__last_day:
+            self.__last_day = day
+
+    def add_totals(
+        self,
+        day: date,
+        credits: Decimal,
+        debits: Decimal,
+        count: int,
+        low: Decimal,
+        high: Decimal,
+    ) -> None:
+        """
+        Add the totals of several transactions of the same day, looking up
+        its buckets once.
+
+        :param day: The day of the transactions.
+        :param credits: The sum of the credit amounts.
+        :param debits: The sum of the debit amounts, as a positive number.
+        :param count: The number of transactions.
+        :param low: The lowest balance after any of the transactions.
+        :param high: The highest balance after any of the transactions.
+        """
+        daily = self.__daily.get(day)
+        if daily is None:
+            daily = self.__daily[day] = Rollup()
+        daily.add_totals(credits, debits, count, low, high)
+
+        month = (day.year, day.month)
+        monthly = self.__monthly.get(month)
+        if monthly is None:
+            monthly = self.__monthly[month] = Rollup()
+        monthly.add_totals(credits, debits, count, low, high)
+
+        if self.__first_day is None or day < self.__first_day:
+            self.__first_day = day
+        if self.__last_day is None or day > self.__last_day:
+            self.__last_day = day
+
+    def day(self, day: date) -> Rollup:
+        """
+        Return the rollup for a single day.
+
+        :return Rollup: The day's rollup, empty if there were no transactions.
+        """
+        return self.__daily.get(day) or Rollup()
+
+    def month(self, year: int, month: int) -> Rollup:
+        """
+        Return the rollup for a single month.
+
+        :return Rollup: The month's rollup, empty if there were no transactions.
+        """
+        return self.__monthly.get((year, month)) or Rollup()
+
+    def summarize(self, start: date = None, end: date = None) -> Rollup:
+        """
+        Summarize all transactions between two days, inclusive.
+
+        :param start: The first day (defaults to the first transaction day).
+        :param end: The last day (defaults to the last transaction day).
+
+        :return Rollup: The combined rollup for the range.
+        """
+        total = Rollup()
+        if self.__first_day is None:
+            return total
+
+        # Only walk days that can hold buckets
+        start = max(start or self.__first_day, self.__first_day)
+        end = min(end or self.__last_day, self.__last_day)
+
+        day = start
+        while day <= end:
+            month_end = _month_end(day)
+            # Whole month inside the range
+            if day.day == 1 and month_end <= end:
+                total.merge(self.__monthly.get((day.year, day.month)))
+                day = month_end + timedelta(days=1)
+            # Partial month at the edges of the range
+            else:
+                total.merge(self.__daily.get(day))
+                day += timedelta(days=1)
+
+        return total
@@ -0,0 +1,259 @@
+import heapq
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+
+from .transaction import Transaction
+
+# Maximum entries per sublist before it is split in two
+SUBLIST_LOAD = 512
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> set:
+    """
+    Split text into its distinct lower-case words.
+
+    :param text: The text to split (eg: a memo).
+
+    :return set: The words.
+    """
+    return set(_WORD.findall(text.lower()))
+
+
+def normalize_category(category: str) -> str:
+    """
+    Return the shared lower-case instance of a category, without a
+    leading '#'.
+
+    :param category: The category (eg: '#Rent').
+
+    :return str: The normalized category (eg: 'rent'), or None if blank.
+    """
+    category = category.strip().lstrip("#").strip().lower()
+    return sys.intern(category) if category else None
+
+
+class AmountIndex:
+    """
+    Class to keep transactions sorted by signed amount.
+
+    Entries live in sublists of bounded size, so an append costs a
+    binary search plus a short list insert, and a range query costs a
+    binary search plus one step per matching transaction.
+    """
+
+    def __init__(self):
+        """
+        Initialise an empty index.
+        """
+        self.__maxes: list = []
+        self.__amounts: list = []
+        self.__rows: list = []
+        self.__length: int = 0
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def add(self, transaction: Transaction) -> None:
+        """
+        Add a transaction to the index, after any equal amounts.
+
+        :param transaction: The transaction to index.
+        """
+        amount = transaction.amount
+        self.__length += 1
+
+        if not self.__maxes:
+            self.__maxes.append(amount)
+            self.__amounts.append([amount])
+            self.__rows.append([transaction])
+            return
+
+        k = bisect_right(self.__maxes, amount)
+        if k == len(self.__maxes):
+            k -= 1
+
+        amounts = self.__amounts[k]
+        rows = self.__rows[k]
+        i = bisect_right(amounts, amount)
+        amounts.insert(i, amount)
+        rows.insert(i, transaction)
+        self.__maxes[k] = amounts[-1]
+
+        # Split full sublists to keep inserts short
+        if len(amounts) > 2 * SUBLIST_LOAD:
+            self.__amounts.insert(k + 1, amounts[SUBLIST_LOAD:])
+            self.__rows.insert(k + 1, rows[SUBLIST_LOAD:])
+            del amounts[SUBLIST_LOAD:]
+            del rows[SUBLIST_LOAD:]
+            self.__maxes[k] = amounts[-1]
+            self.__maxes.insert(k + 1, self.__amounts[k + 1][-1])
+
+    def between(self, low: Decimal, high: Decimal) -> list:
+        """
+        Return the transactions with low <= amount <= high, ordered by amount.
+
+        :param low: The lowest signed amount.
+        :param high: The highest signed amount.
+
+        :return list: The matching transactions.
+        """
+        result = []
+        k = bisect_left(self.__maxes, low)
+        i = bisect_left(self.__amounts[k], low) if k < len(self.__maxes) else 0
+
+        while k < len(self.__maxes):
+            amounts = self.__amounts[k]
+            j = bisect_right(amounts, high, i)
+            result.extend(self.__rows[k][i:j])
+            if j < len(amounts):
+                break
+            k += 1
+            i = 0
+
+        return result
+
+    def smallest(self, n: int) -> list:
+        """
+        Return the n transactions with the lowest signed amounts.
+
+        :param n: The number of transactions.
+
+        :return list: The transactions, lowest amount first.
+        """
+        result = []
+        for rows in self.__rows:
+            if len(result) >= n:
+                break
+            result.extend(rows[: n - len(result)])
+        return result
+
+
+class TopN:
+    """
+    Class to keep the n largest transactions by absolute amount in a
+    bounded min-heap.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialise an empty heap.
+
+        :param size: The number of transactions to keep.
+        """
+        self.__size: int = size
+        self.__heap: list = []
+        self.__sequence: int = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Read-only property to get the number of transactions kept.
+
+        :return int: The heap capacity.
+        """
+        return self.__size
+
+    def add(self, transaction: Transaction) -> None:
+        """
+        Offer a transaction to the heap.
+
+        :param transaction: The transaction to consider.
+        """
+        # Sequence breaks ties so transactions are never compared
+        self.__sequence += 1
+        entry = (abs(transaction.amount), -self.__sequence, transaction)
+
+        if len(self.__heap) < self.__size:
+            heapq.heappush(self.__heap, entry)
+        elif entry > self.__heap[0]:
+            heapq.heapreplace(self.__heap, entry)
+
+    def largest(self, n: int) -> list:
+        """
+        Return up to n of the kept transactions, largest amount first.
+
+        :param n: The number of transactions.
+
+        :return list: The transactions, earliest first among equal amounts.
+        """
+        return [entry[2] for entry in heapq.nlargest(n, self.__heap)]
+
+
+class TextIndex:
+    """
+    Class to map memo words and categories to the positions of the
+    transactions carrying them.
+
+    Positions are appended in ledger order, so every postings list stays
+    sorted without sorting. A query walks the shortest postings list of
+    its terms and binary searches the others.
+    """
+
+    def __init__(self):
+        """
+        Initialise an empty index.
+        """
+        self.__words: dict = {}
+        self.__categories: dict = {}
+
+    def add(self, transaction: Transaction, position: int) -> None:
+        """
+        Add a transaction's memo words and category to the index.
+
+        :param transaction: The transaction to index.
+        :param position: The position of the transaction in the ledger.
+        """
+        if transaction.category is not None:
+            self.__categories.setdefault(transaction.category, []).append(position)
+        if transaction.memo:
+            for word in tokenize(transaction.memo):
+                self.__words.setdefault(word, []).append(position)
+
+    def search(self, text: str = None, category: str = None) -> list:
+        """
+        Find the transactions whose memo contains every word of the text
+        and whose category matches, if given.
+
+        :param text: The words to find, in any case and order.
+        :param category: The category to match.
+
+        :return list: The positions of the matching transactions, in ledger order.
+        """
+        postings = [self.__words.get(word, []) for word in tokenize(text or "")]
+        if category is not None:
+            postings.append(
+                self.__categories.get(normalize_category(category) or "", [])
+            )
+        if not postings:
+            return []
+
+        postings.sort(key=len)
+        shortest, others = postings[0], postings[1:]
+        return [
+            position
+            for position in shortest
+            if all(_contains(other, position) for other in others)
+        ]
+
+    def categories(self) -> dict:
+        """
+        Count the transactions in each category.
+
+        :return dict: The number of transactions by category.
+        """
+        return {
+            category: len(positions)
+            for category, positions in self.__categories.items()
+        }
+
+
+def _contains(positions: list, position: int) -> bool:
+    """
+    Check a sorted postings list for a position.
+    """
+    index = bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
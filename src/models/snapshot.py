@@ -0,0 +1,143 @@
+import threading
+from itertools import count
+
+
+class Snapshot:
+    """
+    Class to represent a consistent point-in-time view across accounts.
+
+    Reads see every transaction committed before the snapshot was taken
+    and none after, while writers keep going. Close the snapshot (or use
+    it as a context manager) so old versions can be discarded.
+    """
+
+    def __init__(self, registry: "SnapshotRegistry", sequence: int):
+        """
+        Initialise the snapshot.
+
+        :param registry: The registry the snapshot is pinned in.
+        :param sequence: The global sequence point of the snapshot.
+        """
+        self.__registry: SnapshotRegistry = registry
+        self.__sequence: int = sequence
+        self.__closed: bool = False
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def balance(self, account):
+        """
+        Get the balance of an account as of the snapshot.
+
+        :param account: The bank account to read.
+
+        :return Decimal: The balance.
+        """
+        return account.balance_as_of(self.__sequence)
+
+    def transactions(self, account) -> list:
+        """
+        Get the transactions of an account as of the snapshot.
+
+        :param account: The bank account to read.
+
+        :return list: The transactions.
+        """
+        return account.transactions_as_of(self.__sequence)
+
+    def close(self) -> None:
+        """
+        Release the snapshot, letting accounts discard the versions it pinned.
+        """
+        if not self.__closed:
+            self.__closed = True
+            self.__registry.release(self.__sequence)
+
+    @property
+    def sequence(self) -> int:
+        """
+        Read-only property to get the global sequence point.
+
+        :return int: The snapshot sequence.
+        """
+        return self.__sequence
+
+
+class SnapshotRegistry:
+    """
+    Class to hand out global commit sequence numbers and track the open
+    snapshots that pin old account versions.
+
+    Accounts read the horizon after every commit and discard versions
+    that no open snapshot can see. The horizon is None while no snapshot
+    is open, and 0 while one is being opened, so a writer racing with
+    the opening never discards a version the new snapshot needs.
+    """
+
+    def __init__(self):
+        """
+        Initialise with no open snapshots.
+        """
+        self.__sequence = count(1)
+        self.__lock: threading.Lock = threading.Lock()
+        # Sequences of the open snapshots
+        self.__open: set = set()
+        self.__horizon: int = None
+
+    def next_sequence(self) -> int:
+        """
+        Allocate the sequence number of a commit.
+
+        :return int: The sequence number, higher than all earlier ones.
+        """
+        return next(self.__sequence)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Open a snapshot at the current sequence point.
+
+        :return Snapshot: The snapshot, to be closed once read.
+        """
+        with self.__lock:
+            # Pin everything until the new snapshot is registered
+            self.__horizon = 0
+            sequence = next(self.__sequence)
+            self.__open.add(sequence)
+            self.__horizon = min(self.__open)
+        return Snapshot(self, sequence)
+
+    def release(self, sequence: int) -> None:
+        """
+        Unpin a snapshot sequence.
+
+        :param sequence: The sequence of the closed snapshot.
+        """
+        with self.__lock:
+            self.__open.discard(sequence)
+            self.__horizon = min(self.__open) if self.__open else None
+
+    @property
+    def horizon(self) -> int:
+        """
+        Read-only property to get the oldest sequence an open snapshot can see.
+
+        :return int: The oldest open sequence, 0 while a snapshot is being
+            opened, or None if no snapshot is open.
+        """
+        return self.__horizon
+
+    @property
+    def open_snapshots(self) -> int:
+        """
+        Read-only property to get the number of open snapshots.
+
+        :return int: The open snapshot count.
+        """
+        return len(self.__open)
+
+
+# Shared by all accounts so a snapshot is consistent across them
+snapshots = SnapshotRegistry()
@@ -0,0 +1,59 @@
+# Formatting width of Date |
+DATE_WIDTH = len("dd MMM yyyy HH:mm:ssAM")
+
+
+def print_transactions(
+    transactions: list, show_currency: bool = False, show_notes: bool = False
+) -> None:
+    """
+    Print a statement of transactions with aligned columns.
+
+    :param transactions: The transactions to print, oldest first.
+    :param show_currency: Flag if a Currency column should be added.
+    :param show_notes: Flag if Category and Memo columns should be added.
+    """
+    # Transaction history exists
+    if len(transactions) > 0:
+        # Formatting maximum width of | Amount |
+        max_amount_width = max(len(f"{t.amount:.2f}") for t in transactions)
+        max_amount_width = max(max_amount_width, len("Amount"))
+
+        # Formatting maximum width of | Balance |
+        max_balance_width = max(len(f"{t.balance:.2f}") for t in transactions)
+        max_balance_width = max(max_balance_width, len("Balance"))
+
+        # Print headers (Date, Amount, Balance) in formatted widths
+        header = f"{'Date'.ljust(DATE_WIDTH)} | {'Amount'.ljust(max_amount_width)} | {'Balance'.ljust(max_balance_width)}"
+
+        # Print all transactions
+        if show_currency or show_notes:
+            if show_currency:
+                header += " | Currency"
+            if show_notes:
+                # Formatting maximum width of | Category |
+                max_category_width = max(len(t.category or "") for t in transactions)
+                max_category_width = max(max_category_width, len("Category"))
+                header += f" | {'Category'.ljust(max_category_width)} | Memo"
+
+            print(header)
+            for transaction in transactions:
+                row = transaction.format_transaction(
+                    max_amount_width, max_balance_width
+                )
+                if show_currency:
+                    row += f" | {transaction.currency}"
+                if show_notes:
+                    category = (transaction.category or "").ljust(max_category_width)
+                    row += f" | {category} | {transaction.memo or ''}"
+                print(row.rstrip())
+        else:
+            print(header)
+            for transaction in transactions:
+                print(
+                    transaction.format_transaction(max_amount_width, max_balance_width)
+                )
+
+    # No transaction history
+    else:
+        print(f"{'Date'.ljust(20)} | {'Amount'.ljust(10)} | {'Balance'.ljust(10)}")
+        print("No transactions found.")
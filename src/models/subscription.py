@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import deque
+
+from .transaction import Transaction
+
+
+class Subscription:
+    """
+    Class to deliver newly appended transactions to a listener through a
+    bounded buffer.
+
+    Writers never wait on a slow listener: once the buffer is full the
+    oldest undelivered transaction is dropped and counted.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialise an empty subscription.
+
+        :param maxsize: The most undelivered transactions kept.
+        """
+        self.__buffer: deque = deque(maxlen=maxsize)
+        self.__ready: threading.Condition = threading.Condition()
+        self.__dropped: int = 0
+        self.__delivered: int = 0
+        self.__total_latency: float = 0.0
+        self.__max_latency: float = 0.0
+
+    def publish(self, transaction: Transaction) -> None:
+        """
+        Buffer a new transaction, dropping the oldest one if full.
+
+        :param transaction: The appended transaction.
+        """
+        with self.__ready:
+            if len(self.__buffer) == self.__buffer.maxlen:
+                self.__dropped += 1
+            self.__buffer.append((time.perf_counter(), transaction))
+            self.__ready.notify()
+
+    def get(self, timeout: float = None) -> Transaction:
+        """
+        Wait for the next transaction.
+
+        :param timeout: The longest time in seconds to wait (defaults to forever).
+
+        :return Transaction: The next transaction, or None on timeout.
+        """
+        with self.__ready:
+            if not self.__ready.wait_for(lambda: self.__buffer, timeout):
+                return None
+            published, transaction = self.__buffer.popleft()
+
+            latency = time.perf_counter() - published
+            self.__delivered += 1
+            self.__total_latency += latency
+            self.__max_latency = max(self.__max_latency, latency)
+            return transaction
+
+    @property
+    def dropped(self) -> int:
+        """
+        Read-only property to get the number of transactions dropped.
+
+        :return int: The number of dropped transactions.
+        """
+        return self.__dropped
+
+    @property
+    def delivered(self) -> int:
+        """
+        Read-only property to get the number of transactions delivered.
+
+        :return int: The number of delivered transactions.
+        """
+        return self.__delivered
+
+    @property
+    def mean_latency(self) -> float:
+        """
+        Read-only property to get the mean time from append to delivery.
+
+        :return float: The mean latency in seconds.
+        """
+        return self.__total_latency / self.__delivered if self.__delivered else 0.0
+
+    @property
+    def max_latency(self) -> float:
+        """
+        Read-only property to get the longest time from append to delivery.
+
+        :return float: The maximum latency in seconds.
+        """
+        return self.__max_latency
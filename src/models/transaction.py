@@ -1,24 +1,130 @@
 from decimal import Decimal
 from datetime import datetime
+from functools import lru_cache
+
+from .currency import BASE_CURRENCY
+
+DATE_FORMAT = "%d %b %Y %I:%M:%S%p"
+
+# Maximum number of distinct amounts shared between transactions
+MAX_INTERNED_AMOUNTS = 4096
+
+_interned_amounts: dict = {}
+_set_slot = object.__setattr__
+
+
+@lru_cache(maxsize=4096)
+def _format_second(second: datetime, tzinfo) -> str:
+    """
+    Format a timestamp truncated to the second.
+
+    Aware timestamps for the same instant in different zones are equal,
+    so the zone is part of the cache key.
+
+    :param second: The timestamp without microseconds.
+    :param tzinfo: The zone of the timestamp (None if naive).
+
+    :return str: The formatted date.
+    """
+    return second.strftime(DATE_FORMAT)
+
+
+def format_date(date: datetime) -> str:
+    """
+    Format a transaction date, reusing the result for dates in the same second.
+
+    :param date: The date to format.
+
+    :return str: The formatted date.
+    """
+    if date.microsecond:
+        date = date.replace(microsecond=0)
+    return _format_second(date, date.tzinfo)
+
+
+def intern_amount(amount: Decimal) -> Decimal:
+    """
+    Return a shared instance of a repeated amount (eg: round deposits).
+
+    Amounts are keyed by their text, which keeps the exponent, because
+    equal amounts such as Decimal('100') and Decimal('100.00') print
+    differently. New amounts are only added while the table is below
+    MAX_INTERNED_AMOUNTS.
+
+    :param amount: The amount to intern.
+
+    :return Decimal: The shared amount, or the given amount if the table is full.
+    """
+    key = str(amount)
+    shared = _interned_amounts.get(key)
+    if shared is not None:
+        return shared
+    if len(_interned_amounts) < MAX_INTERNED_AMOUNTS:
+        _interned_amounts[key] = amount
+    return amount
 
 
 class Transaction:
     """
-    Class to represent a single transaction.
+    Class to represent a single, immutable transaction.
+
+    Uses __slots__ instead of a per-instance __dict__ to keep millions of
+    rows compact.
     """
 
-    def __init__(self, date: datetime, amount: Decimal, balance: Decimal):
+    # The memo and category share one slot, None for most transactions
+    __slots__ = ("__date", "__amount", "__balance", "__currency", "__note")
+
+    def __init__(
+        self,
+        date: datetime,
+        amount: Decimal,
+        balance: Decimal,
+        currency: str = BASE_CURRENCY,
+        memo: str = None,
+        category: str = None,
+    ):
         """
-        Initialise the transaction with date, amount, balance.
+        Initialise the transaction with date, amount, balance and currency,
+        and optionally a memo and category.
 
         :param date: The date of the transaction.
         :param amount: The amount of the transaction.
-        :param balance: The balance after the transaction.
+        :param balance: The balance of the currency after the transaction.
+        :param currency: The currency of the amount and balance.
+        :param memo: Free text describing the transaction.
+        :param category: The category of the transaction (eg: 'rent').
         """
-        # Private attributes only modifiable within the class
-        self.__date: datetime = date
-        self.__amount: Decimal = amount
-        self.__balance: Decimal = balance
+        # Private slots only set once, here
+        _set_slot(self, "_Transaction__date", date)
+        _set_slot(self, "_Transaction__amount", intern_amount(amount))
+        _set_slot(self, "_Transaction__balance", balance)
+        _set_slot(self, "_Transaction__currency", currency)
+        _set_slot(
+            self,
+            "_Transaction__note",
+            (memo, category) if memo is not None or category is not None else None,
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Transaction is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Transaction is immutable.")
+
+    def __reduce__(self) -> tuple:
+        # Rebuild through __init__ so pickling works with the immutable slots
+        return (
+            Transaction,
+            (
+                self.__date,
+                self.__amount,
+                self.__balance,
+                self.__currency,
+                self.memo,
+                self.category,
+            ),
+        )
 
     def format_transaction(self, max_amount_width, max_balance_width) -> str:
         """
@@ -26,7 +132,7 @@ class Transaction:
 
         :return: A single formatted transaction.
         """
-        date_str = self.__date.strftime("%d %b %Y %I:%M:%S%p")
+        date_str = format_date(self.__date)
         amount_str = f"{self.__amount:.2f}".ljust(max_amount_width)
         balance_str = f"{self.__balance:.2f}".ljust(max_balance_width)
         return f"{date_str} | {amount_str} | {balance_str}"
@@ -57,3 +163,30 @@ class Transaction:
         :return Decimal: The balance after the transaction.
         """
         return self.__balance
+
+    @property
+    def currency(self) -> str:
+        """
+        Read-only property to get the currency.
+
+        :return str: The currency code of the amount and balance.
+        """
+        return self.__currency
+
+    @property
+    def memo(self) -> str:
+        """
+        Read-only property to get the memo.
+
+        :return str: The memo, or None if not given.
+        """
+        return self.__note[0] if self.__note is not None else None
+
+    @property
+    def category(self) -> str:
+        """
+        Read-only property to get the category.
+
+        :return str: The category, or None if not given.
+        """
+        return self.__note[1] if self.__note is not None else None
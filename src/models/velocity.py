@@ -0,0 +1,265 @@
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from .currency import BASE_CURRENCY, format_money
+
+# Bucket numbers count whole bucket widths from this time
+_EPOCH = datetime(1970, 1, 1)
+
+
+class VelocityRule:
+    """
+    Class to represent a limit on the withdrawals of an account in any
+    rolling window (eg: at most 5 withdrawals or $1000 per hour).
+    """
+
+    __slots__ = ("__window", "__max_count", "__max_amount", "__buckets")
+
+    def __init__(
+        self,
+        window: timedelta,
+        max_count: int = None,
+        max_amount: Decimal = None,
+        buckets: int = 60,
+    ):
+        """
+        Initialise the rule.
+
+        :param window: The length of the rolling window.
+        :param max_count: The most withdrawals allowed in the window (defaults to no limit).
+        :param max_amount: The most debited in the window, in the account
+            currency (defaults to no limit).
+        :param buckets: The buckets the window is counted in. More buckets
+            follow the window more closely and use more memory.
+        """
+        if not window > timedelta(0) or buckets < 1:
+            raise ValueError("Velocity rules need a positive window and buckets.")
+        if max_count is None and max_amount is None:
+            raise ValueError("Velocity rules need a count or amount limit.")
+
+        self.__window: timedelta = window
+        self.__max_count: int = max_count
+        self.__max_amount: Decimal = max_amount
+        self.__buckets: int = buckets
+
+    def describe(self, currency: str = BASE_CURRENCY) -> str:
+        """
+        Describe the limits of the rule.
+
+        :param currency: The currency of the amount limit.
+
+        :return str: The limits (eg: '5 withdrawals or $1000.00 per 1:00:00').
+        """
+        limits = []
+        if self.__max_count is not None:
+            limits.append(f"{self.__max_count} withdrawals")
+        if self.__max_amount is not None:
+            limits.append(format_money(self.__max_amount, currency))
+        return f"{' or '.join(limits)} per {self.__window}"
+
+    @property
+    def window(self) -> timedelta:
+        """
+        Read-only property to get the length of the rolling window.
+
+        :return timedelta: The window length.
+        """
+        return self.__window
+
+    @property
+    def max_count(self) -> int:
+        """
+        Read-only property to get the most withdrawals allowed in the window.
+
+        :return int: The count limit, or None.
+        """
+        return self.__max_count
+
+    @property
+    def max_amount(self) -> Decimal:
+        """
+        Read-only property to get the most debited in the window.
+
+        :return Decimal: The amount limit, or None.
+        """
+        return self.__max_amount
+
+    @property
+    def buckets(self) -> int:
+        """
+        Read-only property to get the number of buckets in the window.
+
+        :return int: The bucket count.
+        """
+        return self.__buckets
+
+
+class SlidingWindow:
+    """
+    Class to keep the withdrawal count and total of one rule over a
+    rolling window.
+
+    Withdrawals are added to buckets of window / buckets, and the count
+    and total are kept as running sums. Checking drops the buckets that
+    left the window from the front, so each bucket is added and dropped
+    once and every call is amortized O(1) however long the history.
+
+    The current bucket and every bucket started within the window are
+    kept, so a withdrawal counts for between the window and the window
+    plus one bucket. A rule is never exceeded in any exact window.
+
+    The bounds of the current bucket are cached, so the bucket number is
+    only computed, and old buckets only dropped, when time moves into a
+    new bucket.
+    """
+
+    def __init__(self, rule: VelocityRule):
+        """
+        Initialise an empty window.
+
+        :param rule: The rule to enforce.
+        """
+        self.__rule: VelocityRule = rule
+        self.__width: timedelta = rule.window / rule.buckets
+        # [bucket number, count, amount], oldest first
+        self.__buckets: deque = deque()
+        self.__count: int = 0
+        self.__amount: Decimal = Decimal(0)
+        # The current bucket number and its [start, end) times
+        self.__bucket: int = None
+        self.__start: datetime = datetime.max
+        self.__end: datetime = datetime.min
+
+    def allows(self, now: datetime, amount: Decimal) -> bool:
+        """
+        Check whether a withdrawal would stay within the rule.
+
+        :param now: The time of the withdrawal.
+        :param amount: The amount of the withdrawal.
+
+        :return bool: Flag if the withdrawal is within the limits.
+        """
+        if not self.__start <= now < self.__end:
+            self.__expire(self.__move_to(now))
+
+        rule = self.__rule
+        if rule.max_count is not None and self.__count >= rule.max_count:
+            return False
+        if rule.max_amount is not None and self.__amount + amount > rule.max_amount:
+            return False
+        return True
+
+    def add(self, now: datetime, amount: Decimal) -> None:
+        """
+        Count a withdrawal.
+
+        :param now: The time of the withdrawal.
+        :param amount: The amount of the withdrawal.
+        """
+        if self.__start <= now < self.__end:
+            bucket = self.__bucket
+        else:
+            bucket = self.__move_to(now)
+        buckets = self.__buckets
+
+        # A clock that steps back adds to the newest bucket
+        if buckets and buckets[-1][0] >= bucket:
+            buckets[-1][1] += 1
+            buckets[-1][2] += amount
+        else:
+            buckets.append([bucket, 1, amount])
+
+        self.__count += 1
+        self.__amount += amount
+
+    def __move_to(self, now: datetime) -> int:
+        """
+        Private method to make the bucket holding a time the current bucket.
+
+        :param now: The time.
+
+        :return int: The bucket number.
+        """
+        bucket = (now - _EPOCH) // self.__width
+        self.__bucket = bucket
+        self.__start = _EPOCH + bucket * self.__width
+        self.__end = self.__start + self.__width
+        return bucket
+
+    def __expire(self, bucket: int) -> None:
+        """
+        Private method to drop the buckets that left the window.
+
+        :param bucket: The number of the current bucket.
+        """
+        buckets = self.__buckets
+        oldest = bucket - self.__rule.buckets
+        while buckets and buckets[0][0] < oldest:
+            _, count, amount = buckets.popleft()
+            self.__count -= count
+            self.__amount -= amount
+
+    @property
+    def rule(self) -> VelocityRule:
+        """
+        Read-only property to get the rule enforced.
+
+        :return VelocityRule: The rule.
+        """
+        return self.__rule
+
+    @property
+    def count(self) -> int:
+        """
+        Read-only property to get the withdrawals in the window, as of the last check.
+
+        :return int: The withdrawal count.
+        """
+        return self.__count
+
+    @property
+    def amount(self) -> Decimal:
+        """
+        Read-only property to get the total debited in the window, as of the last check.
+
+        :return Decimal: The debited total.
+        """
+        return self.__amount
+
+
+def parse_velocity_rules(text: str) -> list:
+    """
+    Parse velocity rules from text, eg: from an environment variable.
+
+    Rules are separated by ';' and written as seconds:count:amount, where
+    a blank count or amount means no limit (eg: '3600:5:1000;86400::5000').
+
+    :param text: The rules to parse.
+
+    :return list: The rules, in order.
+
+    :raises ValueError: If a rule is malformed, naming the rule.
+    """
+    rules = []
+    for spec in text.split(";"):
+        if not spec.strip():
+            continue
+        seconds, count, amount = (spec.split(":") + ["", ""])[:3]
+        try:
+            rules.append(
+                VelocityRule(
+                    timedelta(seconds=float(seconds)),
+                    int(count) if count.strip() else None,
+                    Decimal(amount) if amount.strip() else None,
+                )
+            )
+        except InvalidOperation:
+            raise ValueError(
+                f"Invalid velocity rule {spec.strip()!r}: invalid amount {amount!r}"
+            ) from None
+        except ValueError as error:
+            raise ValueError(
+                f"Invalid velocity rule {spec.strip()!r}: {error}"
+            ) from None
+    return rules
@@ -0,0 +1,362 @@
+import shelve
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from ..models.bank_account import BankAccount
+from ..models.clock import Clock
+
+# Transactions per stored history chunk
+CHUNK_ROWS = 1024
+
+# Estimated resident bytes of an account with its first day of rollups,
+# and of each transaction (see bench_transaction_memory). Transactions
+# measure about 225 bytes today; the estimate allows about 16% headroom.
+ACCOUNT_BYTES = 2048
+TRANSACTION_BYTES = 260
+
+
+class AccountStore:
+    """
+    Class to persist account balances and transaction history in a shelf.
+
+    Each account is stored as a meta record (balance, sub-balances,
+    chunk count, row count) and its history as chunks of up to
+    CHUNK_ROWS transactions, so the most recent rows can be loaded
+    without reading the rest.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the store.
+
+        :param path: The shelf file path, without the extension dbm adds.
+        """
+        self.__shelf = shelve.open(path)
+        self.__lock: threading.Lock = threading.Lock()
+
+    def load(self, account_id: str, recent_rows: int) -> tuple:
+        """
+        Load an account's balances and its most recent transactions.
+
+        :param account_id: The account to load.
+        :param recent_rows: The fewest recent transactions to load, in whole chunks.
+
+        :return tuple: The balance, sub-balances and transactions, or None
+            if the account was never stored.
+        """
+        with self.__lock:
+            meta = self.__shelf.get(account_id)
+            if meta is None:
+                return None
+
+            balance, balances, chunks, _ = meta
+            loaded = []
+            loaded_rows = 0
+            chunk = chunks
+            while chunk > 0 and loaded_rows < recent_rows:
+                chunk -= 1
+                loaded.append(self.__shelf[f"{account_id}/{chunk}"])
+                loaded_rows += len(loaded[-1])
+
+        transactions = [t for rows in reversed(loaded) for t in rows]
+        return balance, balances, transactions
+
+    def append(self, account_id: str, account: BankAccount, new_rows: list) -> None:
+        """
+        Store an account's balances and the transactions added since its
+        last write.
+
+        :param account_id: The account to store.
+        :param account: The account, for its current balances.
+        :param new_rows: The transactions not stored yet, oldest first.
+        """
+        with self.__lock:
+            meta = self.__shelf.get(account_id)
+            chunks, rows = (meta[2], meta[3]) if meta is not None else (0, 0)
+
+            # Top up the last chunk before starting new ones
+            if new_rows and rows % CHUNK_ROWS:
+                chunks -= 1
+                last = self.__shelf[f"{account_id}/{chunks}"]
+                rows -= len(last)
+                new_rows = last + new_rows
+
+            for start in range(0, len(new_rows), CHUNK_ROWS):
+                chunk = new_rows[start : start + CHUNK_ROWS]
+                self.__shelf[f"{account_id}/{chunks}"] = chunk
+                chunks += 1
+                rows += len(chunk)
+
+            self.__shelf[account_id] = (
+                account.balance,
+                account.balances,
+                chunks,
+                rows,
+            )
+
+    def history(self, account_id: str) -> list:
+        """
+        Load every stored transaction of an account.
+
+        :param account_id: The account to load.
+
+        :return list: The transactions, oldest first.
+        """
+        with self.__lock:
+            meta = self.__shelf.get(account_id)
+            if meta is None:
+                return []
+            return [
+                t
+                for chunk in range(meta[2])
+                for t in self.__shelf[f"{account_id}/{chunk}"]
+            ]
+
+    def close(self) -> None:
+        """
+        Close the shelf.
+        """
+        with self.__lock:
+            self.__shelf.close()
+
+
+class CacheStats:
+    """
+    Class to represent the counters of an account cache.
+    """
+
+    def __init__(
+        self,
+        hits: int,
+        misses: int,
+        evictions: int,
+        write_backs: int,
+        resident: int,
+        resident_bytes: int,
+    ):
+        """
+        Initialise the counters.
+
+        :param hits: The lookups served from memory.
+        :param misses: The lookups that loaded or created an account.
+        :param evictions: The accounts evicted to stay within budget.
+        :param write_backs: The dirty accounts written to the store.
+        :param resident: The accounts in memory.
+        :param resident_bytes: The estimated bytes of the accounts in memory.
+        """
+        self.hits: int = hits
+        self.misses: int = misses
+        self.evictions: int = evictions
+        self.write_backs: int = write_backs
+        self.resident: int = resident
+        self.resident_bytes: int = resident_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Read-only property to get the share of lookups served from memory.
+
+        :return float: The hit rate, from 0 to 1.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AccountCache:
+    """
+    Class to keep recently used accounts in memory in front of an
+    AccountStore.
+
+    Accounts are loaded on first access with only their recent history,
+    and the least recently used are evicted once the count or estimated
+    memory budget is exceeded. Evicted accounts that changed are written
+    back first. Accounts that are checked out are never evicted, and
+    neither are accounts with state the store does not keep (open holds,
+    listeners such as subscriptions and shared-ledger writers, velocity
+    rules and amount indexes), so a cached account behaves like a
+    resident one.
+    """
+
+    def __init__(
+        self,
+        store: AccountStore,
+        max_accounts: int = 100_000,
+        max_bytes: int = None,
+        recent_rows: int = 100,
+        clock: Clock = None,
+    ):
+        """
+        Initialise an empty cache.
+
+        :param store: The persistent storage.
+        :param max_accounts: The most accounts kept in memory.
+        :param max_bytes: The most estimated bytes kept in memory (defaults to no limit).
+        :param recent_rows: The fewest recent transactions loaded with an account.
+        :param clock: The source of transaction timestamps for loaded accounts.
+        """
+        self.store: AccountStore = store
+        self.max_accounts: int = max_accounts
+        self.max_bytes: int = max_bytes
+        self.recent_rows: int = recent_rows
+        self.clock: Clock = clock
+        # account id to [account, version written, rows written, pins,
+        # estimated bytes], least recently used first
+        self.__entries: OrderedDict = OrderedDict()
+        self.__bytes: int = 0
+        self.__lock: threading.RLock = threading.RLock()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__write_backs: int = 0
+
+    def get(self, account_id: str) -> BankAccount:
+        """
+        Get an account, loading it from the store or creating it if needed.
+
+        The account may be evicted once other accounts are used, so use
+        checkout() to keep it while changing it.
+
+        :param account_id: The account to get.
+
+        :return BankAccount: The account.
+        """
+        with self.__lock:
+            return self.__entry(account_id)[0]
+
+    @contextmanager
+    def checkout(self, account_id: str):
+        """
+        Keep an account in memory for the duration of a with block.
+
+        :param account_id: The account to get.
+
+        :return BankAccount: The account, as the with target.
+        """
+        with self.__lock:
+            entry = self.__entry(account_id)
+            entry[3] += 1
+        try:
+            yield entry[0]
+        finally:
+            with self.__lock:
+                entry[3] -= 1
+                self.__measure(entry)
+                self.__evict()
+
+    def flush(self) -> int:
+        """
+        Write back every account that changed since it was loaded or last written.
+
+        :return int: The number of accounts written.
+        """
+        with self.__lock:
+            written = 0
+            for account_id, entry in self.__entries.items():
+                written += self.__write_back(account_id, entry)
+            return written
+
+    def stats(self) -> CacheStats:
+        """
+        Get the cache counters.
+
+        :return CacheStats: The hit, miss, eviction and write-back counts.
+        """
+        with self.__lock:
+            return CacheStats(
+                self.__hits,
+                self.__misses,
+                self.__evictions,
+                self.__write_backs,
+                len(self.__entries),
+                self.__bytes,
+            )
+
+    def __entry(self, account_id: str) -> list:
+        """
+        Private method to find or load the entry of an account, marking it
+        most recently used.
+
+        :param account_id: The account to get.
+
+        :return list: The cache entry of the account.
+        """
+        entry = self.__entries.get(account_id)
+        if entry is not None:
+            self.__hits += 1
+            self.__entries.move_to_end(account_id)
+            self.__measure(entry)
+            return entry
+
+        self.__misses += 1
+        stored = self.store.load(account_id, self.recent_rows)
+        if stored is None:
+            account = BankAccount(clock=self.clock)
+        else:
+            balance, balances, transactions = stored
+            account = BankAccount.restore(
+                balance, transactions, balances, clock=self.clock
+            )
+        entry = [account, account.version, len(account.transactions), 0, 0]
+        self.__entries[account_id] = entry
+        self.__measure(entry)
+        self.__evict(account_id)
+        return entry
+
+    def __evict(self, requested: str = None) -> None:
+        """
+        Private method to evict least recently used accounts until the
+        cache is within budget.
+
+        :param requested: The account being returned to a caller, which
+            is kept even when other accounts cannot be evicted.
+        """
+        entries = self.__entries
+        # Pinned accounts are skipped, so each account is looked at once
+        for _ in range(len(entries)):
+            if len(entries) <= self.max_accounts and (
+                self.max_bytes is None or self.__bytes <= self.max_bytes
+            ):
+                return
+
+            account_id, entry = next(iter(entries.items()))
+            if entry[3] or entry[0].has_unstored_state or account_id == requested:
+                entries.move_to_end(account_id)
+                continue
+
+            self.__write_back(account_id, entry)
+            del entries[account_id]
+            self.__bytes -= entry[4]
+            self.__evictions += 1
+
+    def __measure(self, entry: list) -> None:
+        """
+        Private method to update the estimated bytes of an account, which
+        grow as transactions are added while it is in use.
+
+        :param entry: The cache entry of the account.
+        """
+        estimate = ACCOUNT_BYTES + TRANSACTION_BYTES * len(entry[0].transactions)
+        self.__bytes += estimate - entry[4]
+        entry[4] = estimate
+
+    def __write_back(self, account_id: str, entry: list) -> bool:
+        """
+        Private method to store an account if it changed since it was
+        loaded or last written.
+
+        :param account_id: The account to store.
+        :param entry: The cache entry of the account.
+
+        :return bool: Flag if the account was written.
+        """
+        account, version, rows = entry[:3]
+        with account.lock:
+            if account.version == version:
+                return False
+            transactions = account.transactions
+            self.store.append(account_id, account, transactions[rows:])
+            entry[1] = account.version
+            entry[2] = len(transactions)
+        self.__write_backs += 1
+        return True
@@ -0,0 +1,190 @@
+import threading
+import time
+
+
+class TokenBucketTable:
+    """
+    Class to hold a token bucket per key, for millions of keys.
+
+    Each key stores a single float, its theoretical arrival time (the
+    generic cell rate algorithm): the time at which its bucket would be
+    full again. Refill is computed lazily from it on the next request.
+
+    Keys live in two generations. Keys not seen for a whole generation
+    have full buckets, so dropping the older generation evicts idle keys
+    without changing any outcome.
+    """
+
+    def __init__(self, rate: float, burst: int, idle_seconds: float = 60.0):
+        """
+        Initialise with no keys.
+
+        :param rate: The tokens added per second.
+        :param burst: The bucket size, the most requests allowed at once.
+        :param idle_seconds: How long a key is kept after its last request
+            (raised to at least the time to refill a bucket).
+        """
+        if not rate > 0 or burst < 1:
+            raise ValueError("Token buckets need a positive rate and burst.")
+
+        self.__interval: float = 1 / rate
+        self.__capacity: float = burst * self.__interval
+        self.__generation_seconds: float = max(idle_seconds, self.__capacity)
+        self.__current: dict = {}
+        self.__previous: dict = {}
+        self.__rotate_at: float = None
+
+    def check(self, key, now: float) -> float:
+        """
+        Check whether a request for a key can take a token, without taking it.
+
+        :param key: The client or account the request counts against.
+        :param now: The current monotonic time.
+
+        :return float: The new arrival time to commit, or None if the
+            bucket is empty.
+        """
+        if self.__rotate_at is None:
+            self.__rotate_at = now + self.__generation_seconds
+        elif now >= self.__rotate_at:
+            self.__rotate(now)
+
+        arrival = self.__current.get(key)
+        if arrival is None:
+            arrival = self.__previous.get(key, now)
+        # A bucket refilled past full starts from now
+        if arrival < now:
+            arrival = now
+        arrival += self.__interval
+        return arrival if arrival - now <= self.__capacity else None
+
+    def commit(self, key, arrival: float) -> None:
+        """
+        Take a token for a key, as checked.
+
+        :param key: The client or account the request counts against.
+        :param arrival: The arrival time returned by check.
+        """
+        self.__current[key] = arrival
+        self.__previous.pop(key, None)
+
+    def tokens(self, key, now: float) -> float:
+        """
+        Get the tokens left for a key.
+
+        :param key: The client or account.
+        :param now: The current monotonic time.
+
+        :return float: The tokens available now.
+        """
+        arrival = self.__current.get(key)
+        if arrival is None:
+            arrival = self.__previous.get(key, now)
+        return (self.__capacity - max(arrival - now, 0.0)) / self.__interval
+
+    def __rotate(self, now: float) -> None:
+        """
+        Private method to drop the older generation of keys.
+
+        :param now: The current monotonic time.
+        """
+        # Skipping more than one generation means every key is idle
+        if now >= self.__rotate_at + self.__generation_seconds:
+            self.__current = {}
+        self.__previous = self.__current
+        self.__current = {}
+        self.__rotate_at = now + self.__generation_seconds
+
+    def __len__(self) -> int:
+        return len(self.__current) + len(self.__previous)
+
+
+class AdmissionControl:
+    """
+    Class to rate limit requests by client and by account, so one client
+    cannot starve the others.
+
+    A request is admitted only if both the client's and the account's
+    buckets have a token, and then takes one from each.
+    """
+
+    def __init__(
+        self,
+        client_rate: float = 20.0,
+        client_burst: int = 40,
+        account_rate: float = 100.0,
+        account_burst: int = 200,
+        idle_seconds: float = 60.0,
+    ):
+        """
+        Initialise the rate limits.
+
+        :param client_rate: The requests per second allowed for each client.
+        :param client_burst: The most requests a client may make at once.
+        :param account_rate: The requests per second allowed on each account.
+        :param account_burst: The most requests on an account at once.
+        :param idle_seconds: How long an idle client or account is tracked.
+        """
+        self.__clients: TokenBucketTable = TokenBucketTable(
+            client_rate, client_burst, idle_seconds
+        )
+        self.__accounts: TokenBucketTable = TokenBucketTable(
+            account_rate, account_burst, idle_seconds
+        )
+        self.__lock: threading.Lock = threading.Lock()
+        self.__rejected: int = 0
+
+    def admit(self, client, account, now: float = None) -> bool:
+        """
+        Admit a request if neither the client nor the account is over its limit.
+
+        :param client: The client making the request.
+        :param account: The account the request is for.
+        :param now: The current monotonic time (defaults to time.monotonic()).
+
+        :return bool: Flag if the request is admitted.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        with self.__lock:
+            client_arrival = self.__clients.check(client, now)
+            account_arrival = (
+                self.__accounts.check(account, now)
+                if client_arrival is not None
+                else None
+            )
+            if account_arrival is None:
+                self.__rejected += 1
+                return False
+
+            self.__clients.commit(client, client_arrival)
+            self.__accounts.commit(account, account_arrival)
+            return True
+
+    @property
+    def clients(self) -> TokenBucketTable:
+        """
+        Read-only property to get the per-client buckets.
+
+        :return TokenBucketTable: The client buckets.
+        """
+        return self.__clients
+
+    @property
+    def accounts(self) -> TokenBucketTable:
+        """
+        Read-only property to get the per-account buckets.
+
+        :return TokenBucketTable: The account buckets.
+        """
+        return self.__accounts
+
+    @property
+    def rejected(self) -> int:
+        """
+        Read-only property to get the number of rejected requests.
+
+        :return int: The rejected request count.
+        """
+        return self.__rejected
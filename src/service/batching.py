@@ -0,0 +1,278 @@
+import queue
+import threading
+import time
+from decimal import Decimal
+
+from ..models.bank_account import BankAccount
+from ..models.transaction_type import TransactionType
+
+
+class BatchResult:
+    """
+    Class to represent the pending outcome of a queued request, with the
+    result, exception and done methods of a concurrent.futures.Future.
+
+    The outcomes of a batch are set together and waiters are woken once
+    per batch, through a condition shared by the queue, rather than once
+    per request.
+    """
+
+    __slots__ = ("__condition", "__is_done", "__value", "__error")
+
+    def __init__(self, condition: threading.Condition):
+        """
+        Initialise a pending outcome.
+
+        :param condition: The condition notified when a batch is resolved.
+        """
+        self.__condition: threading.Condition = condition
+        self.__is_done: bool = False
+        self.__value = None
+        self.__error: BaseException = None
+
+    def set_result(self, value) -> None:
+        """
+        Resolve the request. The caller notifies the condition.
+
+        :param value: The result.
+        """
+        self.__value = value
+        self.__is_done = True
+
+    def set_exception(self, error: BaseException) -> None:
+        """
+        Fail the request. The caller notifies the condition.
+
+        :param error: The error raised by result().
+        """
+        self.__error = error
+        self.__is_done = True
+
+    def done(self) -> bool:
+        """
+        Check whether the request has been resolved or failed.
+
+        :return bool: Flag if the outcome is set.
+        """
+        return self.__is_done
+
+    def exception(self, timeout: float = None) -> BaseException:
+        """
+        Wait for the request and get its error.
+
+        :param timeout: The longest time in seconds to wait (defaults to forever).
+
+        :return BaseException: The error, or None if the request was applied.
+        """
+        if not self.__is_done:
+            with self.__condition:
+                if not self.__condition.wait_for(self.done, timeout):
+                    raise TimeoutError("Request was not applied in time.")
+        return self.__error
+
+    def result(self, timeout: float = None):
+        """
+        Wait for the request and get its result.
+
+        :param timeout: The longest time in seconds to wait (defaults to forever).
+
+        :return: The create_transaction result.
+        """
+        error = self.exception(timeout)
+        if error is not None:
+            raise error
+        return self.__value
+
+
+class BatchingQueue:
+    """
+    Class to coalesce transaction requests from many producers and apply
+    them per account in batches.
+
+    A single worker thread drains submitted requests, groups them by
+    account in arrival order, and applies each group in one pass with
+    create_transactions, under one acquisition of the account lock. Each
+    request gets a BatchResult holding the result of create_transaction,
+    and waiting producers are woken once per batch.
+
+    Closing is ordered with submission by a lock, so every accepted
+    request is applied before the worker stops. If the worker fails, the
+    queue closes and every pending future is failed with the error.
+    """
+
+    def __init__(self, max_batch_size: int = 256, max_wait: float = 0.0005):
+        """
+        Initialise the queue and start the worker thread.
+
+        :param max_batch_size: The most requests applied in one batch.
+        :param max_wait: The longest time in seconds to wait for a batch to fill.
+        """
+        self.__max_batch_size: int = max_batch_size
+        self.__max_wait: float = max_wait
+        self.__queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Guards __closed so no request is queued behind the close sentinel
+        self.__lock: threading.Lock = threading.Lock()
+        self.__closed: bool = False
+        # Notified once every per-account batch is resolved
+        self.__resolved: threading.Condition = threading.Condition()
+        self.__batches: int = 0
+        self.__worker: threading.Thread = threading.Thread(
+            target=self.__run, name="batching-queue", daemon=True
+        )
+        self.__worker.start()
+
+    def __enter__(self) -> "BatchingQueue":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(
+        self, account: BankAccount, amount: Decimal, transaction_type: TransactionType
+    ) -> BatchResult:
+        """
+        Queue a transaction request for an account.
+
+        :param account: The account to apply the transaction to.
+        :param amount: The amount to deposit or withdraw.
+        :param transaction_type: The type of transaction (CREDIT, DEBIT).
+
+        :return BatchResult: Resolves to the create_transaction result.
+        """
+        future = BatchResult(self.__resolved)
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("Batching queue is closed.")
+            self.__queue.put((account, amount, transaction_type, future))
+        return future
+
+    def close(self) -> None:
+        """
+        Stop accepting requests, apply everything already queued and stop
+        the worker thread.
+        """
+        with self.__lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__queue.put(None)
+        self.__worker.join()
+
+    @property
+    def batches(self) -> int:
+        """
+        Read-only property to get the number of account lock acquisitions.
+
+        :return int: The number of per-account batches applied.
+        """
+        return self.__batches
+
+    def __collect(self, first: tuple) -> tuple:
+        """
+        Private method to gather a batch starting from its first request.
+
+        :param first: The first request of the batch.
+
+        :return tuple: The batch, and a flag if the close sentinel was reached.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.__max_wait
+
+        while len(batch) < self.__max_batch_size:
+            try:
+                # Take whatever is already queued before waiting
+                request = self.__queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.__queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if request is None:
+                return batch, True
+            batch.append(request)
+
+        return batch, False
+
+    def __apply(self, batch: list) -> None:
+        """
+        Private method to apply a batch, one pass per account.
+
+        :param batch: The requests in arrival order.
+        """
+        groups = {}
+        for request in batch:
+            groups.setdefault(id(request[0]), []).append(request)
+
+        for requests in groups.values():
+            account = requests[0][0]
+            self.__batches += 1
+            try:
+                results = account.create_transactions(
+                    [
+                        (amount, transaction_type)
+                        for _, amount, transaction_type, _ in requests
+                    ]
+                )
+            except Exception as error:
+                with self.__resolved:
+                    for request in requests:
+                        request[3].set_exception(error)
+                    self.__resolved.notify_all()
+                continue
+
+            # Resolved outside the account lock, waking every waiter once
+            with self.__resolved:
+                for request, is_successful in zip(requests, results):
+                    request[3].set_result(is_successful)
+                self.__resolved.notify_all()
+
+    def __fail_pending(self, batch: list, error: BaseException) -> None:
+        """
+        Private method to close the queue after a worker failure and fail
+        every future not yet resolved.
+
+        :param batch: The requests of the batch being applied.
+        :param error: The error that stopped the worker.
+        """
+        with self.__lock:
+            self.__closed = True
+
+        pending = list(batch)
+        while True:
+            try:
+                request = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                pending.append(request)
+
+        with self.__resolved:
+            for request in pending:
+                future = request[3]
+                if not future.done():
+                    future.set_exception(error)
+            self.__resolved.notify_all()
+
+    def __run(self) -> None:
+        """
+        Private method for the worker thread loop.
+        """
+        batch = []
+        try:
+            while True:
+                first = self.__queue.get()
+                if first is None:
+                    return
+
+                batch, is_closing = self.__collect(first)
+                self.__apply(batch)
+                batch = []
+
+                if is_closing:
+                    return
+        except BaseException as error:
+            self.__fail_pending(batch, error)
+            raise
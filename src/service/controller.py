@@ -1,7 +1,12 @@
+import time
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 
+from ..tracing import traced
 from ..models.transaction_type import TransactionType
 from ..models.bank_account import BankAccount
+from ..models.currency import normalize_currency
+from .admission import AdmissionControl
 from .view import BankView
 
 
@@ -10,12 +15,54 @@ class BankApp:
     Class to run the bank service.
     """
 
-    def __init__(self, account: BankAccount, view: BankView):
+    def __init__(
+        self,
+        account: BankAccount,
+        view: BankView,
+        admission: AdmissionControl = None,
+        client: str = "local",
+    ):
         """
         Initialise bank application with model and view.
+
+        :param account: The account to serve.
+        :param view: The view to display messages with.
+        :param admission: The rate limits to apply (defaults to none).
+        :param client: The client the requests count against.
         """
         self.account: BankAccount = account
         self.view: BankView = view
+        self.admission: AdmissionControl = admission
+        self.client: str = client
+        # Created on first use, as tracemalloc is slow to import
+        self.profiler: "MemoryProfiler" = None
+
+        # Registry of menu actions to (handler, maximum inline arguments,
+        # flag if the action counts against the rate limits)
+        self.commands: dict = {}
+        self.register_command("d", self.handle_deposit, 2)
+        self.register_command("w", self.handle_withdrawal, 2)
+        self.register_command("p", self.handle_print_statement)
+        self.register_command("s", self.handle_summary, 2)
+        self.register_command("f", self.handle_follow, 1)
+        self.register_command("l", self.handle_lookup, 8)
+        # Operator command, not shown in the menu
+        self.register_command("m", self.handle_memory_report)
+        # Quitting is never rate limited, so a throttled client can leave
+        self.register_command("q", self.handle_quit, limited=False)
+
+    def register_command(
+        self, action: str, handler, max_args: int = 0, limited: bool = True
+    ) -> None:
+        """
+        Function to register a handler for a menu action.
+
+        :param action: The action typed by the user (eg: 'd').
+        :param handler: The function to call, with any inline arguments.
+        :param max_args: The most inline arguments the handler accepts.
+        :param limited: Flag if the action is checked against the rate limits.
+        """
+        self.commands[action] = (handler, max_args, limited)
 
     def run(self) -> None:
         """
@@ -25,34 +72,157 @@ class BankApp:
         - Depositing an amount
         - Withdrawing an amount
         - Printing an account statement
+        - Summarizing transactions over a date range
+        - Following new transactions as they arrive
+        - Looking up transactions by memo words and category
+
+        A line may also carry several commands with inline arguments,
+        separated by ';' (eg: 'd 100; w 20; p'), which run without prompts.
+        An inline amount may be followed by its currency (eg: 'd 100 eur').
         """
         while True:
             self.view.show_menu()
-            action = input().strip().lower()
 
-            match action:
-                # Deposit
-                case "d":
-                    self.handle_deposit()
+            if not self.dispatch(input()):
+                break
 
-                # Withdraw
-                case "w":
-                    self.handle_withdrawal()
+    def dispatch(self, line: str) -> bool:
+        """
+        Function to run every command in a line of input.
 
-                # Print statement
-                case "p":
-                    self.account.print_statement()
+        :param line: The commands separated by ';'.
 
-                # Quit
-                case "q":
-                    self.view.show_goodbye()
-                    break
+        :return bool: Flag if the service should keep running.
+        """
+        commands = line.strip().lower().split(";")
+
+        # Ignore empty commands between separators (eg: 'd 100;;p;')
+        if len(commands) > 1:
+            commands = [command for command in commands if command.strip()]
+
+        for command in commands:
+            action, *args = command.split() or [""]
+            handler, max_args, limited = self.commands.get(action, (None, 0, True))
+
+            # Invalid action
+            if handler is None or len(args) > max_args:
+                self.view.error_invalid_action()
+                continue
 
-                # Invalid action
-                case _:
-                    self.view.error_invalid_action()
+            if limited and not self.is_admitted():
+                continue
 
-    def validate_input(self, input: str) -> Decimal:
+            if handler(*args) is False:
+                return False
+
+        return True
+
+    def is_admitted(self) -> bool:
+        """
+        Function to check a request against the client and account rate limits.
+
+        :return bool: Flag if the request may go ahead.
+        """
+        if self.admission is None or self.admission.admit(self.client, self.account):
+            return True
+
+        self.view.error_rate_limited()
+        return False
+
+    def handle_print_statement(self) -> None:
+        """
+        Function to print the account statement.
+        """
+        self.account.print_statement()
+
+    def handle_lookup(self, *terms: str) -> None:
+        """
+        Function to print the transactions matching every memo word and
+        '#category' given, from the account's inverted index.
+
+        :param terms: The inline words and category, prompted for if omitted.
+        """
+        if not terms:
+            terms = self.view.prompt_for_lookup().split()
+
+            # Exit to main page
+            if not terms or terms == ["q"]:
+                return
+
+        words = [term for term in terms if not term.startswith("#")]
+        categories = [term for term in terms if term.startswith("#")]
+
+        # A transaction has at most one category
+        if len(categories) > 1:
+            self.view.show_lookup_results([])
+            return
+
+        self.view.show_lookup_results(
+            self.account.search_transactions(
+                " ".join(words) or None, categories[0] if categories else None
+            )
+        )
+
+    def handle_follow(self, seconds_input: str = None) -> None:
+        """
+        Function to print only new transactions as they are appended, until
+        the duration passes or the user presses Ctrl+C.
+
+        :param seconds_input: The inline duration in seconds (defaults to 10).
+        """
+        try:
+            seconds = float(seconds_input) if seconds_input is not None else 10.0
+        except ValueError:
+            seconds = 0.0
+
+        if not 0 < seconds < float("inf"):
+            self.view.error_invalid_duration()
+            return
+
+        subscription = self.account.subscribe()
+        self.view.show_follow_start(seconds)
+        deadline = time.monotonic() + seconds
+
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                transaction = subscription.get(timeout=remaining)
+                if transaction is not None:
+                    self.view.show_follow_row(transaction)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.account.unsubscribe(subscription)
+
+        self.view.show_follow_end(subscription.dropped)
+
+    def handle_memory_report(self) -> None:
+        """
+        Function to start memory profiling on first use, and to show the
+        memory report for activity since then on later uses.
+        """
+        if self.profiler is None:
+            from .memory_report import MemoryProfiler
+
+            self.profiler = MemoryProfiler()
+
+        if not self.profiler.is_running:
+            self.profiler.start([self.account])
+            self.view.show_memory_profiling_started()
+            return
+
+        self.view.show_memory_report(self.profiler.report([self.account]))
+
+    def handle_quit(self) -> bool:
+        """
+        Function to quit the service.
+
+        :return bool: False to stop the service.
+        """
+        self.view.show_goodbye()
+        return False
+
+    @traced("BankApp.validate_input")
+    def validate_input(self, input: str, retry: bool = True) -> Decimal:
         """
         Function to validate input for:
         - positive number
@@ -65,6 +235,7 @@ class BankApp:
         - rounding (more than 2 decimal places)
 
         :param input: The input to validate.
+        :param retry: Flag if the amount is prompted for again after an error.
 
         :return Decimal: The valid amount.
         """
@@ -73,76 +244,273 @@ class BankApp:
 
             # Invalid rounding (more than 2 decimal places)
             if abs(input.as_tuple().exponent) > 2:
-                self.view.error_rounding()
+                self.view.error_rounding(retry)
                 return None
 
             if input > 0:
                 return input
 
             elif input < 0:
-                self.view.error_negative_amount()
+                self.view.error_negative_amount(retry)
                 return None
 
             else:
-                self.view.error_zero_amount()
+                self.view.error_zero_amount(retry)
                 return None
 
         # Invalid non number (eg: 'abc', '!%$')
         except InvalidOperation:
-            self.view.error_non_number()
+            self.view.error_non_number(retry)
+            return None
+
+    def validate_currency(self, input: str) -> str:
+        """
+        Function to validate a 3-letter currency code.
+
+        :param input: The input to validate.
+
+        :return str: The normalized currency code.
+        """
+        code = input.strip()
+        if len(code) == 3 and code.isascii() and code.isalpha():
+            return normalize_currency(code)
+
+        self.view.error_invalid_currency()
+        return None
+
+    @staticmethod
+    def parse_note(input: str) -> dict:
+        """
+        Function to split a note into its memo and optional '#category'
+        (eg: 'March rent #rent').
+
+        :param input: The note to split.
+
+        :return dict: The memo and category as keyword arguments (empty
+            when neither is given).
+        """
+        words = input.split()
+
+        note_kwargs = {}
+        memo = " ".join(word for word in words if not word.startswith("#"))
+        if memo:
+            note_kwargs["memo"] = memo
+        for word in words:
+            if word.startswith("#") and len(word) > 1:
+                note_kwargs["category"] = word
+                break
+        return note_kwargs
+
+    def validate_date(self, input: str, retry: bool = True) -> date:
+        """
+        Function to validate a date input in the format YYYY-MM-DD.
+
+        :param input: The input to validate.
+        :param retry: Flag if the date is prompted for again after an error.
+
+        :return date: The valid date.
+        """
+        try:
+            return datetime.strptime(input.strip(), "%Y-%m-%d").date()
+
+        # Invalid date (eg: '2024-13-01', 'abc')
+        except ValueError:
+            self.view.error_invalid_date(retry)
             return None
 
-    def handle_deposit(self):
+    def prompt_date(self, prompt) -> tuple:
+        """
+        Function to prompt until a valid or blank date is entered.
+
+        :param prompt: The view prompt to display.
+
+        :return tuple: Flag if the user quit, and the date (None when blank).
+        """
+        while True:
+            date_input = prompt().strip()
+
+            # Exit to main page
+            if date_input.lower() == "q":
+                return True, None
+
+            # Open-ended range
+            if date_input == "":
+                return False, None
+
+            day = self.validate_date(date_input)
+
+            if day is not None:
+                return False, day
+
+    def handle_summary(self, start_input: str = None, end_input: str = None):
+        """
+        Function to carry out the flow of a summary:
+
+        - Prompts for user input for the start and end dates
+        - Checks the inputs for a valid date range
+        - Displays the totals from the pre-aggregated rollups
+
+        :param start_input: The inline start date ('-' for the first transaction).
+        :param end_input: The inline end date (omitted or '-' for the last transaction).
+        """
+        # Inline dates are tried once without prompting
+        if start_input is not None:
+            dates = []
+            for date_input in (start_input, end_input or "-"):
+                day = (
+                    None
+                    if date_input == "-"
+                    else self.validate_date(date_input, retry=False)
+                )
+                if date_input != "-" and day is None:
+                    return
+                dates.append(day)
+
+            start, end = dates
+            if start is not None and end is not None and end < start:
+                self.view.error_date_range(retry=False)
+                return
+
+            self.view.show_summary(
+                start, end, self.account.summarize(start, end), self.account.currency
+            )
+            return
+
+        while True:
+            has_quit, start = self.prompt_date(self.view.prompt_for_start_date)
+            if has_quit:
+                break
+
+            has_quit, end = self.prompt_date(self.view.prompt_for_end_date)
+            if has_quit:
+                break
+
+            if start is not None and end is not None and end < start:
+                self.view.error_date_range()
+                continue
+
+            self.view.show_summary(
+                start, end, self.account.summarize(start, end), self.account.currency
+            )
+            break
+
+    @traced("BankApp.handle_deposit")
+    def handle_deposit(self, amount_input: str = None, currency_input: str = None):
         """
         Function to carry out the flow of a deposit:
 
         - Prompts for user input for amount
         - Checks the input for valid amount
+        - Prompts for an optional memo and '#category' for a prompted amount
         - Creates the transaction from the valid deposit
+
+        :param amount_input: The inline amount, tried once without prompting.
+        :param currency_input: The inline currency (defaults to the account currency).
         """
+        # The currency is only passed on when given, as (code,)
+        currency_args = ()
+        if currency_input is not None:
+            currency = self.validate_currency(currency_input)
+            if currency is None:
+                return
+            currency_args = (currency,)
+
         while True:
-            deposit_input = self.view.prompt_for_deposit()
+            if amount_input is None:
+                deposit_input = self.view.prompt_for_deposit()
+            else:
+                deposit_input = amount_input
 
             # Exit to main page
             if deposit_input.strip().lower() == "q":
                 break
 
-            amount = self.validate_input(deposit_input)
+            amount = self.validate_input(deposit_input, retry=amount_input is None)
 
             if amount is not None:
+                # Only prompted amounts ask for a memo, as inline commands are lower cased
+                note_kwargs = {}
+                if amount_input is None:
+                    note_kwargs = self.parse_note(self.view.prompt_for_note())
+
                 is_successful = self.account.create_transaction(
-                    amount, TransactionType.CREDIT
+                    amount, TransactionType.CREDIT, *currency_args, **note_kwargs
                 )
 
                 if is_successful:
-                    self.view.show_deposit_success(amount)
+                    self.view.show_deposit_success(amount, *currency_args)
                     break
 
-    def handle_withdrawal(self):
+            # Inline amounts are not retried
+            if amount_input is not None:
+                break
+
+            # Each retry counts as a new request
+            if not self.is_admitted():
+                break
+
+    @traced("BankApp.handle_withdrawal")
+    def handle_withdrawal(self, amount_input: str = None, currency_input: str = None):
         """
         Function to carry out the flow of a withdrawal:
 
         - Prompts for user input for amount
         - Checks the input for valid amount
+        - Prompts for an optional memo and '#category' for a prompted amount
         - Creates the transaction from the valid withdrawal
+
+        :param amount_input: The inline amount, tried once without prompting.
+        :param currency_input: The inline currency (defaults to the account currency).
         """
+        # The currency is only passed on when given, as (code,)
+        currency_args = ()
+        if currency_input is not None:
+            currency = self.validate_currency(currency_input)
+            if currency is None:
+                return
+            currency_args = (currency,)
+
         while True:
-            withdrawal_input = self.view.prompt_for_withdrawal()
+            if amount_input is None:
+                withdrawal_input = self.view.prompt_for_withdrawal()
+            else:
+                withdrawal_input = amount_input
 
             # Exit to main page
             if withdrawal_input.strip().lower() == "q":
                 break
 
-            amount = self.validate_input(withdrawal_input)
+            amount = self.validate_input(withdrawal_input, retry=amount_input is None)
 
             if amount is not None:
+                # Only prompted amounts ask for a memo, as inline commands are lower cased
+                note_kwargs = {}
+                if amount_input is None:
+                    note_kwargs = self.parse_note(self.view.prompt_for_note())
+
                 is_successful = self.account.create_transaction(
-                    amount, TransactionType.DEBIT
+                    amount, TransactionType.DEBIT, *currency_args, **note_kwargs
                 )
 
                 if is_successful:
-                    self.view.show_withdrawal_success(amount)
+                    self.view.show_withdrawal_success(amount, *currency_args)
                     break
 
+                # Over a withdrawal count or amount limit for a rolling window
+                elif self.account.velocity_violation is not None:
+                    self.view.error_velocity_limit(
+                        self.account.velocity_violation,
+                        self.account.currency,
+                        retry=amount_input is None,
+                    )
+
                 else:
-                    self.view.error_insufficient_funds()
+                    self.view.error_insufficient_funds(retry=amount_input is None)
+
+            # Inline amounts are not retried
+            if amount_input is not None:
+                break
+
+            # Each retry counts as a new request
+            if not self.is_admitted():
+                break
@@ -0,0 +1,174 @@
+import time
+from decimal import ROUND_HALF_EVEN, Decimal, localcontext
+
+from ..models.transaction_type import TransactionType
+
+CENT = Decimal("0.01")
+
+# Digits kept when multiplying balances by rates, so products are exact
+PRODUCT_DIGITS = 60
+
+
+def _interest_column(balances: list, rate: Decimal) -> list:
+    """
+    Multiply a column of balances by a rate and round each product half
+    to even to the cent.
+
+    The products are computed exactly in a wide decimal context, and
+    both steps run in the C decimal module, which is faster than integer
+    arithmetic in Python.
+
+    :param balances: The balances.
+    :param rate: The exact rate (eg: Decimal('0.0125')).
+
+    :return list: The interest of each balance, in the same order.
+    """
+    with localcontext() as context:
+        context.prec = PRODUCT_DIGITS
+        return [
+            (balance * rate).quantize(CENT, ROUND_HALF_EVEN) for balance in balances
+        ]
+
+
+class InterestReport:
+    """
+    Class to represent the outcome of an interest and fee run.
+    """
+
+    def __init__(
+        self,
+        accounts: int,
+        credited: int,
+        interest: Decimal,
+        charged: int,
+        fees: Decimal,
+        skipped: int,
+        blocked: int,
+        seconds: float,
+    ):
+        """
+        Initialise the report.
+
+        :param accounts: The number of accounts processed.
+        :param credited: The number of interest credits created.
+        :param interest: The total interest credited.
+        :param charged: The number of fee debits created.
+        :param fees: The total fees debited.
+        :param skipped: The number of fees skipped for insufficient funds.
+        :param blocked: The number of fees rejected by a velocity rule or
+            funds reserved by holds.
+        :param seconds: The elapsed time of the run.
+        """
+        self.accounts: int = accounts
+        self.credited: int = credited
+        self.interest: Decimal = interest
+        self.charged: int = charged
+        self.fees: Decimal = fees
+        self.skipped: int = skipped
+        self.blocked: int = blocked
+        self.seconds: float = seconds
+
+
+class InterestEngine:
+    """
+    Class to apply periodic interest credits and maintenance-fee debits to
+    many accounts at once.
+
+    Balances are gathered into a column, interest for the whole column is
+    computed exactly (rounded half to even), and each account receives its CREDIT and DEBIT in one bulk
+    append. A fee that would make the balance negative is skipped, as
+    create_transaction requires.
+
+    Balances are read with the account version, and the append only
+    applies if the version is unchanged. An account changed in between
+    has its interest recomputed under its lock.
+    """
+
+    def __init__(self, rate: Decimal, fee: Decimal = Decimal("0.00")):
+        """
+        Initialise the engine with the period's rate and fee.
+
+        :param rate: The interest rate for the period (eg: Decimal('0.0125')).
+        :param fee: The maintenance fee per account.
+        """
+        if rate < 0 or fee < 0:
+            raise ValueError("Rate and fee must not be negative.")
+        if fee != fee.quantize(CENT):
+            raise ValueError("Fee must be rounded to the cent.")
+
+        self.rate: Decimal = rate
+        self.fee: Decimal = fee
+
+    def __entries(self, interest: Decimal) -> list:
+        """
+        Private method to build the transactions of one account.
+
+        :param interest: The interest of the account.
+
+        :return list: The (amount, transaction type) pairs, interest first.
+        """
+        entries = []
+        if interest > 0:
+            entries.append((interest, TransactionType.CREDIT))
+        if self.fee > 0:
+            entries.append((self.fee, TransactionType.DEBIT))
+        return entries
+
+    def run(self, accounts: list) -> InterestReport:
+        """
+        Apply interest and then the fee to every account.
+
+        :param accounts: The BankAccount instances to process.
+
+        :return InterestReport: The totals of the run.
+        """
+        start = time.perf_counter()
+
+        # Gather balances into a column and compute the whole column at
+        # once. The version is read before the balance, so a change
+        # between the two reads fails the version check below.
+        versions = [account.version for account in accounts]
+        interest = _interest_column(
+            [account.balance for account in accounts], self.rate
+        )
+        fee = self.fee
+
+        credited = charged = skipped = blocked = 0
+        total_interest = Decimal("0.00")
+
+        for account, version, amount in zip(accounts, versions, interest):
+            entries = self.__entries(amount)
+            if not entries:
+                continue
+
+            with account.lock:
+                results = account.create_transactions(entries, version)
+                if results is None:
+                    # Changed since the balance was read
+                    amount = _interest_column([account.balance], self.rate)[0]
+                    entries = self.__entries(amount)
+                    results = account.create_transactions(entries)
+
+                if fee > 0 and not results[-1]:
+                    # Enough funds, but reserved by holds or over a velocity rule
+                    if account.velocity_violation is not None or account.balance >= fee:
+                        blocked += 1
+                    else:
+                        skipped += 1
+
+            if amount > 0:
+                credited += 1
+                total_interest += amount
+            if fee > 0 and results[-1]:
+                charged += 1
+
+        return InterestReport(
+            len(accounts),
+            credited,
+            total_interest,
+            charged,
+            fee * charged,
+            skipped,
+            blocked,
+            time.perf_counter() - start,
+        )
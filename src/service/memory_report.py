@@ -0,0 +1,194 @@
+import os
+import tracemalloc
+import weakref
+from contextlib import redirect_stdout
+from decimal import Decimal
+
+from .. import models
+from ..models.bank_account import BankAccount
+from ..models.clock import StepClock
+from ..models.transaction_type import TransactionType
+
+# Allocations from these files are attributed to accounts and transactions
+MODELS_PATTERN = os.path.join(os.path.dirname(os.path.abspath(models.__file__)), "*")
+
+# Snapshots taken while measuring are not part of the measurement
+_IGNORE_TRACEMALLOC = tracemalloc.Filter(False, tracemalloc.__file__)
+
+
+class MemoryReport:
+    """
+    Class to represent traced memory use of accounts since profiling started.
+    """
+
+    def __init__(
+        self,
+        accounts: int,
+        transactions: int,
+        model_bytes: int,
+        statement_peak: int,
+        top_sites: list,
+    ):
+        """
+        Initialise the report.
+
+        :param accounts: The number of accounts reported on.
+        :param transactions: The number of transactions appended to those
+            accounts since profiling started.
+        :param model_bytes: The traced bytes allocated by the models package
+            since profiling started, net of those freed.
+        :param statement_peak: The peak traced bytes while rendering a statement.
+        :param top_sites: The (site, bytes, blocks) tuples of the growth
+            since profiling started, largest first.
+        """
+        self.accounts: int = accounts
+        self.transactions: int = transactions
+        self.model_bytes: int = model_bytes
+        self.statement_peak: int = statement_peak
+        self.top_sites: list = top_sites
+
+    @property
+    def bytes_per_account(self) -> float:
+        return self.model_bytes / self.accounts if self.accounts else 0.0
+
+    @property
+    def bytes_per_transaction(self) -> float:
+        return self.model_bytes / self.transactions if self.transactions else 0.0
+
+
+class MemoryProfiler:
+    """
+    Class to collect memory reports with tracemalloc on demand.
+
+    Reports cover the difference from a snapshot taken at start(), so
+    tracing already running (eg: started by an operator) is reused and
+    its earlier allocations are not counted. Tracing slows the app while
+    it runs, so it is off until requested.
+    """
+
+    def __init__(self, frames: int = 1):
+        """
+        Initialise the profiler without starting it.
+
+        :param frames: The number of stack frames kept per allocation.
+        """
+        self.frames: int = frames
+        # Model allocations when start() was called
+        self.__baseline: tracemalloc.Snapshot = None
+        # Transaction count of each account when start() was called
+        self.__counts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Flag if start() turned tracing on, so stop() turns it off
+        self.__started_tracing: bool = False
+
+    @property
+    def is_running(self) -> bool:
+        return self.__baseline is not None
+
+    def start(self, accounts: list = ()) -> None:
+        """
+        Start tracing allocations, unless tracing is already on, and take
+        the baseline snapshot.
+
+        :param accounts: The existing accounts, whose transactions until
+            now are left out of reports.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.__started_tracing = True
+
+        self.__counts = weakref.WeakKeyDictionary(
+            (account, len(account.transactions)) for account in accounts
+        )
+        self.__baseline = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, MODELS_PATTERN)]
+        )
+
+    def stop(self) -> None:
+        """
+        Stop profiling, and stop tracing if start() turned it on.
+        """
+        self.__baseline = None
+        self.__counts.clear()
+        if self.__started_tracing:
+            self.__started_tracing = False
+            tracemalloc.stop()
+
+    def report(self, accounts: list, top: int = 10) -> MemoryReport:
+        """
+        Report memory use of accounts since tracing started.
+
+        :param accounts: The accounts to report on.
+        :param top: The number of allocation sites to list.
+
+        :return MemoryReport: The report.
+        """
+        if self.__baseline is None or not tracemalloc.is_tracing():
+            raise RuntimeError("Memory profiling has not been started.")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, MODELS_PATTERN)]
+        )
+        statistics = snapshot.compare_to(self.__baseline, "lineno")
+        top_sites = [
+            (
+                f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                stat.size_diff,
+                stat.count_diff,
+            )
+            for stat in statistics[:top]
+        ]
+
+        # Peak memory while rendering the largest statement
+        statement_peak = 0
+        if accounts:
+            largest = max(accounts, key=lambda account: len(account.transactions))
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            # Discard the output so it is not part of the peak
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                largest.print_statement()
+            statement_peak = tracemalloc.get_traced_memory()[1] - baseline
+
+        return MemoryReport(
+            len(accounts),
+            sum(
+                len(account.transactions) - self.__counts.get(account, 0)
+                for account in accounts
+            ),
+            sum(stat.size_diff for stat in statistics),
+            statement_peak,
+            top_sites,
+        )
+
+
+def measure_bytes_per_transaction(rows: int) -> float:
+    """
+    Measure traced bytes per transaction for a fresh account, including
+    its rollups.
+
+    Tracing already running is left running, and its traces are kept.
+
+    :param rows: The number of transactions to create.
+
+    :return float: The traced bytes per transaction.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    amounts = [Decimal(amount) for amount in ("10.00", "20.00", "50.00", "100.00")]
+    try:
+        before = tracemalloc.take_snapshot().filter_traces([_IGNORE_TRACEMALLOC])
+        account = BankAccount(clock=StepClock())
+        for i in range(rows):
+            # Parse each amount as user input would be
+            account.create_transaction(
+                Decimal(str(amounts[i % 4])), TransactionType.CREDIT
+            )
+        after = tracemalloc.take_snapshot().filter_traces([_IGNORE_TRACEMALLOC])
+        used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    return used / rows
@@ -0,0 +1,379 @@
+import csv
+import os
+import tempfile
+import time
+from decimal import Decimal
+from itertools import zip_longest
+
+# Columns of ledger and bank files
+FIELDS = ["account", "date", "amount", "balance"]
+
+# Most times a spilled partition is split again before it is joined in memory
+MAX_PARTITION_DEPTH = 8
+
+_MASK64 = (1 << 64) - 1
+
+
+def _partition_of(key: tuple, seed: int, partitions: int) -> int:
+    """
+    Return the partition of a key for a hash seed.
+
+    The key hash is mixed with the seed and multiplied by a 64-bit odd
+    constant, and the high bits are used, so each seed spreads the keys
+    of an earlier partition out again. Hashing (seed, key) as a tuple
+    does not, since its low bits follow the key's.
+    """
+    mixed = (
+        (hash(key) ^ (seed * 0xBF58476D1CE4E5B9 & _MASK64)) * 0x9E3779B97F4A7C15
+    ) & _MASK64
+    return (mixed >> 32) % partitions
+
+
+def ledger_rows(accounts: dict):
+    """
+    Yield (account, date, amount, balance) rows for accounts, sorted by
+    account id and then date. Only rows in each account's currency are
+    yielded, as the external statement follows the account balance.
+
+    :param accounts: The BankAccount instances keyed by account id.
+    """
+    for account_id in sorted(accounts, key=str):
+        account = accounts[account_id]
+        for transaction in account.transactions:
+            if transaction.currency != account.currency:
+                continue
+            yield (
+                str(account_id),
+                transaction.date.isoformat(timespec="microseconds"),
+                transaction.amount,
+                transaction.balance,
+            )
+
+
+def csv_rows(path: str):
+    """
+    Yield (account, date, amount, balance) rows from a CSV file with the
+    header 'account,date,amount,balance'.
+
+    :param path: The file to read.
+    """
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for account, date, amount, balance in reader:
+            yield account, date, Decimal(amount), Decimal(balance)
+
+
+def write_csv(rows, path: str) -> None:
+    """
+    Write (account, date, amount, balance) rows to a CSV file.
+
+    :param rows: The rows to write.
+    :param path: The file to create.
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+class ReconcileReport:
+    """
+    Class to represent the counts and throughput of a reconciliation.
+    """
+
+    def __init__(self):
+        """
+        Initialise an empty report.
+        """
+        self.ledger_rows: int = 0
+        self.bank_rows: int = 0
+        self.matched: int = 0
+        self.missing: int = 0
+        self.extra: int = 0
+        self.amount_mismatches: int = 0
+        self.balance_mismatches: int = 0
+        self.spilled: bool = False
+        self.seconds: float = 0.0
+
+    @property
+    def mismatches(self) -> int:
+        return (
+            self.missing + self.extra + self.amount_mismatches + self.balance_mismatches
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.ledger_rows + self.bank_rows
+        return rows / self.seconds if self.seconds else 0.0
+
+
+class Reconciler:
+    """
+    Class to reconcile ledger rows against an external bank file and write
+    every mismatch to a CSV report.
+
+    Rows are matched on (account, date), in order when several share a
+    date. Rows only in the bank file are 'missing' from the ledger, rows
+    only in the ledger are 'extra', and matched rows can differ in
+    'amount' or 'balance'.
+
+    merge() streams two sorted inputs in constant memory. hash_join()
+    accepts any order: it keeps up to max_rows ledger rows in a hash table
+    and spills both sides to partition files on disk beyond that. A
+    partition still over max_rows is split again with a fresh hash seed,
+    and one whose rows all share a key is matched while streaming.
+    """
+
+    def __init__(
+        self, report_path: str, max_rows: int = 1_000_000, partitions: int = 64
+    ):
+        """
+        Initialise the reconciler.
+
+        :param report_path: The CSV file for the mismatch report.
+        :param max_rows: The most ledger rows held in memory by hash_join().
+        :param partitions: The number of spill files per side when hash_join() spills.
+        """
+        self.report_path: str = report_path
+        self.max_rows: int = max_rows
+        self.partitions: int = partitions
+
+    def merge(self, ledger, bank) -> ReconcileReport:
+        """
+        Reconcile two inputs sorted by (account, date) in one pass.
+
+        :param ledger: The ledger rows.
+        :param bank: The bank file rows.
+
+        :return ReconcileReport: The counts and throughput.
+        """
+        report = ReconcileReport()
+        start = time.perf_counter()
+
+        with open(self.report_path, "w", newline="") as file:
+            writer = self.__writer(file)
+            ledger, bank = iter(ledger), iter(bank)
+            left, right = next(ledger, None), next(bank, None)
+
+            while left is not None or right is not None:
+                if right is None or (left is not None and left[:2] < right[:2]):
+                    self.__compare(writer, report, left, None)
+                    left = next(ledger, None)
+                elif left is None or right[:2] < left[:2]:
+                    self.__compare(writer, report, None, right)
+                    right = next(bank, None)
+                else:
+                    self.__compare(writer, report, left, right)
+                    left, right = next(ledger, None), next(bank, None)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def hash_join(self, ledger, bank) -> ReconcileReport:
+        """
+        Reconcile two inputs in any order, spilling to disk when the ledger
+        side exceeds max_rows.
+
+        :param ledger: The ledger rows.
+        :param bank: The bank file rows.
+
+        :return ReconcileReport: The counts and throughput.
+        """
+        report = ReconcileReport()
+        start = time.perf_counter()
+        ledger = iter(ledger)
+
+        # Build the in-memory table until it outgrows the limit
+        table = {}
+        buffered = 0
+        for row in ledger:
+            table.setdefault(row[:2], []).append(row)
+            buffered += 1
+            if buffered > self.max_rows:
+                break
+        else:
+            ledger = None
+
+        with open(self.report_path, "w", newline="") as file:
+            writer = self.__writer(file)
+
+            if ledger is None:
+                self.__probe(writer, report, table, bank)
+            else:
+                report.spilled = True
+                with tempfile.TemporaryDirectory() as spill_dir:
+                    ledger_parts = self.__partition(
+                        spill_dir,
+                        "ledger",
+                        ((row for rows in table.values() for row in rows), ledger),
+                        0,
+                    )
+                    table = None
+                    bank_parts = self.__partition(spill_dir, "bank", (bank,), 0)
+
+                    # Join one partition at a time to bound memory
+                    for ledger_part, bank_part in zip(ledger_parts, bank_parts):
+                        self.__join(
+                            writer, report, spill_dir, ledger_part, bank_part, 1
+                        )
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def __join(
+        self,
+        writer,
+        report: ReconcileReport,
+        spill_dir: str,
+        ledger_part: tuple,
+        bank_part: tuple,
+        depth: int,
+    ) -> None:
+        """
+        Private method to join a pair of partitions, repartitioning them
+        with a fresh hash seed while the ledger side exceeds max_rows.
+
+        A partition whose rows all share one key cannot be split, so it is
+        matched in order while streaming both files.
+
+        :param ledger_part: The (path, row count, single key) of the ledger partition.
+        :param bank_part: The (path, row count, single key) of the bank partition.
+        :param depth: The number of partitioning passes so far, which seeds the hash.
+        """
+        ledger_path, ledger_count, ledger_key = ledger_part
+        bank_path, bank_count, bank_key = bank_part
+
+        if ledger_count > self.max_rows:
+            if ledger_key is not None and (bank_count == 0 or bank_key == ledger_key):
+                for left, right in zip_longest(
+                    csv_rows(ledger_path), csv_rows(bank_path)
+                ):
+                    self.__compare(writer, report, left, right)
+                return
+
+            if depth < MAX_PARTITION_DEPTH:
+                ledger_name = os.path.splitext(ledger_path)[0]
+                bank_name = os.path.splitext(bank_path)[0]
+                ledger_parts = self.__partition(
+                    spill_dir, ledger_name, (csv_rows(ledger_path),), depth
+                )
+                bank_parts = self.__partition(
+                    spill_dir, bank_name, (csv_rows(bank_path),), depth
+                )
+                os.remove(ledger_path)
+                os.remove(bank_path)
+                for ledger_part, bank_part in zip(ledger_parts, bank_parts):
+                    self.__join(
+                        writer, report, spill_dir, ledger_part, bank_part, depth + 1
+                    )
+                return
+
+        partition = {}
+        for row in csv_rows(ledger_path):
+            partition.setdefault(row[:2], []).append(row)
+        self.__probe(writer, report, partition, csv_rows(bank_path))
+
+    def __partition(
+        self, spill_dir: str, name: str, sources: tuple, depth: int
+    ) -> list:
+        """
+        Private method to write rows to partition files by key hash.
+
+        :param name: The file name prefix of the partitions.
+        :param sources: The row iterables to write, in order.
+        :param depth: The hash seed, so a partition split again spreads out.
+
+        :return list: The (path, row count, single key) of each partition,
+            where the single key is the key shared by every row, or None.
+        """
+        partitions = self.partitions
+        paths = [os.path.join(spill_dir, f"{name}-{i}.csv") for i in range(partitions)]
+        counts = [0] * partitions
+        keys = [None] * partitions
+        mixed = [False] * partitions
+        files = [open(path, "w", newline="") for path in paths]
+        try:
+            writers = [csv.writer(file) for file in files]
+            for writer in writers:
+                writer.writerow(FIELDS)
+            for source in sources:
+                for row in source:
+                    key = row[:2]
+                    i = _partition_of(key, depth, partitions)
+                    writers[i].writerow(row)
+                    if counts[i] == 0:
+                        keys[i] = key
+                    elif not mixed[i] and keys[i] != key:
+                        mixed[i] = True
+                    counts[i] += 1
+        finally:
+            for file in files:
+                file.close()
+        return [
+            (path, count, None if is_mixed else key)
+            for path, count, key, is_mixed in zip(paths, counts, keys, mixed)
+        ]
+
+    def __probe(self, writer, report: ReconcileReport, table: dict, bank) -> None:
+        """
+        Private method to match bank rows against a ledger hash table of
+        row lists. Rows sharing a key (eg: from a coarse clock) are matched
+        in order, as merge() does. Ledger rows left unmatched are reported
+        as extra.
+        """
+        # Reverse the few lists of repeated keys, so the next row pops from the end
+        for rows in table.values():
+            if len(rows) > 1:
+                rows.reverse()
+
+        for right in bank:
+            rows = table.get(right[:2])
+            self.__compare(writer, report, rows.pop() if rows else None, right)
+        for rows in table.values():
+            for left in reversed(rows):
+                self.__compare(writer, report, left, None)
+
+    @staticmethod
+    def __writer(file):
+        """
+        Private method to start the mismatch report.
+        """
+        writer = csv.writer(file)
+        writer.writerow(
+            [
+                "kind",
+                "account",
+                "date",
+                "ledger_amount",
+                "ledger_balance",
+                "bank_amount",
+                "bank_balance",
+            ]
+        )
+        return writer
+
+    @staticmethod
+    def __compare(writer, report: ReconcileReport, left, right) -> None:
+        """
+        Private method to count a pair of rows and report any mismatch.
+        """
+        if left is not None:
+            report.ledger_rows += 1
+        if right is not None:
+            report.bank_rows += 1
+
+        if left is None:
+            report.missing += 1
+            writer.writerow(["missing", right[0], right[1], "", "", right[2], right[3]])
+        elif right is None:
+            report.extra += 1
+            writer.writerow(["extra", left[0], left[1], left[2], left[3], "", ""])
+        elif left[2] != right[2]:
+            report.amount_mismatches += 1
+            writer.writerow(["amount", *left, right[2], right[3]])
+        elif left[3] != right[3]:
+            report.balance_mismatches += 1
+            writer.writerow(["balance", *left, right[2], right[3]])
+        else:
+            report.matched += 1
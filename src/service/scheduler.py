@@ -0,0 +1,491 @@
+import calendar
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import count
+from operator import itemgetter
+
+from ..models.bank_account import BankAccount
+from ..models.clock import Clock, SystemClock
+from ..models.transaction_type import TransactionType
+
+
+def add_months(start: datetime, months: int) -> datetime:
+    """
+    Add calendar months, keeping the day where the month allows it
+    (eg: 31 Jan plus one month is 28 or 29 Feb).
+
+    :param start: The date to add to.
+    :param months: The number of months.
+
+    :return datetime: The shifted date.
+    """
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    day = min(start.day, calendar.monthrange(year, month + 1)[1])
+    return start.replace(year=year, month=month + 1, day=day)
+
+
+class StandingOrder:
+    """
+    Class to represent a recurring transaction, or a transfer between two
+    accounts, on a fixed schedule.
+
+    Occurrences are computed from the first run, so monthly orders do
+    not drift after short months.
+    """
+
+    __slots__ = (
+        "__order_id",
+        "__account",
+        "__amount",
+        "__transaction_type",
+        "__start",
+        "__every",
+        "__months",
+        "__count",
+        "__target",
+        "__occurrence",
+        "__next_run",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        account: BankAccount,
+        amount: Decimal,
+        transaction_type: TransactionType,
+        start: datetime,
+        every: timedelta = None,
+        months: int = 0,
+        count: int = None,
+        target: BankAccount = None,
+    ):
+        """
+        Initialise the order.
+
+        :param order_id: The identifier of the order.
+        :param account: The account to credit or debit.
+        :param amount: The amount of every occurrence.
+        :param transaction_type: The type of transaction (CREDIT, DEBIT).
+        :param start: The time of the first occurrence.
+        :param every: The time between occurrences.
+        :param months: The calendar months between occurrences, instead of every.
+        :param count: The number of occurrences (defaults to no end).
+        :param target: The account to credit with every debit, for transfers.
+        """
+        self.__order_id: int = order_id
+        self.__account: BankAccount = account
+        self.__amount: Decimal = amount
+        self.__transaction_type: TransactionType = transaction_type
+        self.__start: datetime = start
+        self.__every: timedelta = every
+        self.__months: int = months
+        self.__count: int = count
+        self.__target: BankAccount = target
+        # Index and time of the next occurrence to schedule
+        self.__occurrence: int = 0
+        self.__next_run: datetime = start
+
+    def occurrence_at(self, index: int) -> datetime:
+        """
+        Get the time of an occurrence.
+
+        :param index: The occurrence index, 0 for the first.
+
+        :return datetime: The time of the occurrence.
+        """
+        if index == 0:
+            return self.__start
+        if self.__months:
+            return add_months(self.__start, index * self.__months)
+        return self.__start + index * self.__every
+
+    def take_due(self, now: datetime) -> list:
+        """
+        Take every occurrence due by now, advancing past them.
+
+        :param now: The current time.
+
+        :return list: The times of the due occurrences, oldest first.
+        """
+        due = []
+        while self.__next_run is not None and self.__next_run <= now:
+            due.append(self.__next_run)
+            self.__occurrence += 1
+            if self.__count is not None and self.__occurrence >= self.__count:
+                self.__next_run = None
+            else:
+                self.__next_run = self.occurrence_at(self.__occurrence)
+        return due
+
+    def next_run(self) -> datetime:
+        """
+        Get the time of the next occurrence not yet taken.
+
+        :return datetime: The next occurrence, or None if the order has ended.
+        """
+        return self.__next_run
+
+    @property
+    def order_id(self) -> int:
+        """
+        Read-only property to get the order identifier.
+
+        :return int: The order identifier.
+        """
+        return self.__order_id
+
+    @property
+    def account(self) -> BankAccount:
+        """
+        Read-only property to get the account credited or debited.
+
+        :return BankAccount: The account.
+        """
+        return self.__account
+
+    @property
+    def amount(self) -> Decimal:
+        """
+        Read-only property to get the amount of every occurrence.
+
+        :return Decimal: The amount.
+        """
+        return self.__amount
+
+    @property
+    def transaction_type(self) -> TransactionType:
+        """
+        Read-only property to get the type of transaction.
+
+        :return TransactionType: The type of transaction (CREDIT, DEBIT).
+        """
+        return self.__transaction_type
+
+    @property
+    def target(self) -> BankAccount:
+        """
+        Read-only property to get the account credited by a transfer.
+
+        :return BankAccount: The target account, or None if not a transfer.
+        """
+        return self.__target
+
+
+class ScheduleReport:
+    """
+    Class to represent the outcome of firing due standing orders.
+    """
+
+    def __init__(
+        self,
+        applied: int,
+        caught_up: int,
+        retries: int,
+        failed: list,
+        batches: int,
+        seconds: float,
+    ):
+        """
+        Initialise the report.
+
+        :param applied: The number of occurrences applied.
+        :param caught_up: The number of applied occurrences that were overdue
+            by more than one period (eg: missed during downtime).
+        :param retries: The number of failed debits scheduled for a retry.
+        :param failed: The (order id, occurrence time) of debits that ran out of retries.
+        :param batches: The number of accounts with due occurrences.
+        :param seconds: The elapsed time of the run.
+        """
+        self.applied: int = applied
+        self.caught_up: int = caught_up
+        self.retries: int = retries
+        self.failed: list = failed
+        self.batches: int = batches
+        self.seconds: float = seconds
+
+
+class Scheduler:
+    """
+    Class to hold standing orders and fire their due occurrences in batches.
+
+    Pending runs sit in a min-heap of (run time, sequence, order id,
+    attempt, occurrence time), so firing touches only due entries.
+    Cancelled orders are removed from the heap lazily. Each order has
+    one scheduled entry, however long it was overdue: every missed
+    occurrence is taken at once and applied, oldest first, with the rest
+    of its account's batch under a single lock acquisition.
+
+    A debit that fails for insufficient funds is retried after
+    retry_delay, up to max_retries times, and then reported.
+    """
+
+    def __init__(
+        self,
+        clock: Clock = None,
+        retry_delay: timedelta = timedelta(hours=1),
+        max_retries: int = 3,
+    ):
+        """
+        Initialise with no standing orders.
+
+        :param clock: The source of the current time (defaults to the system clock).
+        :param retry_delay: The time before a failed debit is tried again.
+        :param max_retries: The retries before a failed debit is reported.
+        """
+        self.clock: Clock = clock if clock is not None else SystemClock()
+        self.retry_delay: timedelta = retry_delay
+        self.max_retries: int = max_retries
+        self.__orders: dict = {}
+        # Pending retries by order id, which keep ended orders until done
+        self.__retrying: dict = {}
+        self.__heap: list = []
+        self.__ids = count(1)
+        self.__sequence = count()
+        self.__lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__orders)
+
+    def schedule(
+        self,
+        account: BankAccount,
+        amount: Decimal,
+        transaction_type: TransactionType,
+        start: datetime,
+        every: timedelta = None,
+        months: int = 0,
+        count: int = None,
+        target: BankAccount = None,
+    ) -> int:
+        """
+        Add a standing order.
+
+        :param account: The account to credit or debit.
+        :param amount: The amount of every occurrence.
+        :param transaction_type: The type of transaction (CREDIT, DEBIT).
+        :param start: The time of the first occurrence.
+        :param every: The time between occurrences.
+        :param months: The calendar months between occurrences, instead of every.
+        :param count: The number of occurrences (defaults to no end).
+        :param target: The account to credit with every debit, for transfers.
+
+        :return int: The identifier of the order.
+        """
+        if count is not None and count < 1:
+            raise ValueError("Orders need at least one occurrence.")
+        if every is not None and months:
+            raise ValueError("Give either every or months, not both.")
+        if (every is not None and every <= timedelta(0)) or months < 0:
+            raise ValueError("Orders must recur after a positive interval.")
+        if every is None and not months and count != 1:
+            raise ValueError("Recurring orders need every or months.")
+        if target is not None and transaction_type is not TransactionType.DEBIT:
+            raise ValueError("Transfers debit the account and credit the target.")
+
+        with self.__lock:
+            order_id = next(self.__ids)
+            order = StandingOrder(
+                order_id,
+                account,
+                amount,
+                transaction_type,
+                start,
+                every,
+                months,
+                count,
+                target,
+            )
+            self.__orders[order_id] = order
+            self.__push(start, order_id, 0, start)
+            return order_id
+
+    def cancel(self, order_id: int) -> bool:
+        """
+        Remove a standing order, including any pending retries.
+
+        :param order_id: The order to remove.
+
+        :return bool: Flag if the order existed.
+        """
+        with self.__lock:
+            # Retries left in the heap are skipped when they come due
+            self.__retrying.pop(order_id, None)
+            return self.__orders.pop(order_id, None) is not None
+
+    def next_run(self) -> datetime:
+        """
+        Get the time of the earliest pending run.
+
+        :return datetime: The earliest run, or None if nothing is pending.
+        """
+        with self.__lock:
+            while self.__heap and self.__heap[0][2] not in self.__orders:
+                heapq.heappop(self.__heap)
+            return self.__heap[0][0] if self.__heap else None
+
+    def run_due(self, now: datetime = None) -> ScheduleReport:
+        """
+        Apply every occurrence and retry due by now.
+
+        :param now: The current time (defaults to the scheduler clock).
+
+        :return ScheduleReport: The outcome of the run.
+        """
+        start_time = time.perf_counter()
+        if now is None:
+            now = self.clock.now()
+
+        # Occurrences to apply, as (order, attempt, occurrence time) by account
+        batches: dict = {}
+        ended = []
+        caught_up = 0
+        with self.__lock:
+            heap = self.__heap
+            while heap and heap[0][0] <= now:
+                _, _, order_id, attempt, occurrence = heapq.heappop(heap)
+                if attempt and order_id in self.__retrying:
+                    self.__count_retry(order_id, -1)
+                order = self.__orders.get(order_id)
+                if order is None:
+                    continue
+
+                batch = batches.setdefault(order.account, [])
+                if attempt:
+                    batch.append((order, attempt, occurrence))
+                    continue
+
+                # Take this and every later missed occurrence in one go
+                due = order.take_due(now)
+                caught_up += len(due) - 1
+                batch.extend((order, 0, occurrence) for occurrence in due)
+
+                next_run = order.next_run()
+                if next_run is not None:
+                    self.__push(next_run, order_id, 0, next_run)
+                else:
+                    ended.append(order_id)
+
+        applied = retries = 0
+        failed = []
+        for account, entries in batches.items():
+            results = self.__apply(account, entries)
+            for (order, attempt, occurrence), is_successful in zip(entries, results):
+                if is_successful:
+                    applied += 1
+                elif attempt < self.max_retries and order.order_id in self.__orders:
+                    retries += 1
+                    with self.__lock:
+                        self.__count_retry(order.order_id, 1)
+                        self.__push(
+                            now + self.retry_delay,
+                            order.order_id,
+                            attempt + 1,
+                            occurrence,
+                        )
+                else:
+                    failed.append((order.order_id, occurrence))
+
+        # Forget orders with no occurrences or retries left
+        with self.__lock:
+            for entries in batches.values():
+                for order, attempt, _ in entries:
+                    if attempt and order.next_run() is None:
+                        ended.append(order.order_id)
+            for order_id in ended:
+                if order_id not in self.__retrying:
+                    self.__orders.pop(order_id, None)
+
+        return ScheduleReport(
+            applied,
+            caught_up,
+            retries,
+            failed,
+            len(batches),
+            time.perf_counter() - start_time,
+        )
+
+    def __apply(self, account: BankAccount, entries: list) -> list:
+        """
+        Private method to apply one account's due occurrences, oldest
+        first, under as few lock acquisitions as possible.
+
+        Runs of ordinary occurrences share one acquisition. Transfers
+        need the target's lock as well, so each takes both locks in a
+        fixed order between runs.
+
+        :param account: The account the occurrences are for.
+        :param entries: The (order, attempt, occurrence time) to apply,
+            sorted in place by occurrence time.
+
+        :return list: The flag of each occurrence, as from create_transaction.
+        """
+        entries.sort(key=itemgetter(2))
+        results = []
+        run = []
+        for order, _, _ in entries + [(None, 0, None)]:
+            if order is not None and order.target is None:
+                run.append(order)
+                continue
+
+            if run:
+                with account.lock:
+                    results.extend(
+                        account.create_transaction(
+                            pending.amount, pending.transaction_type
+                        )
+                        for pending in run
+                    )
+                run = []
+            if order is not None:
+                results.append(self.__transfer(order))
+        return results
+
+    def __transfer(self, order: StandingOrder) -> bool:
+        """
+        Private method to debit an order's account and credit its target
+        together.
+
+        :param order: The transfer order.
+
+        :return bool: Flag if the transfer was made.
+        """
+        # Lock in a fixed order so opposite transfers cannot deadlock
+        first, second = sorted((order.account, order.target), key=id)
+        with first.lock, second.lock:
+            if not order.account.create_transaction(
+                order.amount, TransactionType.DEBIT
+            ):
+                return False
+            return order.target.create_transaction(order.amount, TransactionType.CREDIT)
+
+    def __count_retry(self, order_id: int, change: int) -> None:
+        """
+        Private method to track the pending retries of an order.
+
+        :param order_id: The order retried.
+        :param change: 1 when a retry is scheduled, -1 when it runs.
+        """
+        pending = self.__retrying.get(order_id, 0) + change
+        if pending:
+            self.__retrying[order_id] = pending
+        else:
+            self.__retrying.pop(order_id, None)
+
+    def __push(
+        self, run_at: datetime, order_id: int, attempt: int, occurrence: datetime
+    ) -> None:
+        """
+        Private method to add a pending run to the heap.
+
+        :param run_at: The time the run is due.
+        :param order_id: The order to run.
+        :param attempt: 0 for a scheduled occurrence, or the retry number.
+        :param occurrence: The time of the occurrence being applied.
+        """
+        heapq.heappush(
+            self.__heap, (run_at, next(self.__sequence), order_id, attempt, occurrence)
+        )
@@ -0,0 +1,291 @@
+import os
+import struct
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from multiprocessing import resource_tracker, shared_memory
+
+from ..models.bank_account import BankAccount
+from ..models.transaction import Transaction
+
+MAGIC = 0x4C454447  # 'LEDG'
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Header: magic, number of account slots, ring entries per slot
+HEADER = struct.Struct("<QQQ")
+# Slot header: sequence, balance in cents, transactions written
+SLOT = struct.Struct("<Qqq")
+# Ring entry: timestamp in microseconds since EPOCH, amount and balance in cents
+ENTRY = struct.Struct("<qqq")
+# Slot fields after the sequence: balance in cents, transactions written
+SLOT_STATE = struct.Struct("<qq")
+
+
+def _slot_size(ring_size: int) -> int:
+    return SLOT.size + ring_size * ENTRY.size
+
+
+def _cents(amount: Decimal) -> int:
+    return int(amount.scaleb(2))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without registering it with the resource
+    tracker, so a reader exiting never unlinks the owner's block.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Undo the registration made by this attach only, rather than patching
+    # resource_tracker.register for every thread while attaching
+    memory = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+class _SlotWriter:
+    """
+    Class to mirror one account into its shared memory slot. Registered as
+    an account listener, so it runs inside create_transaction.
+
+    Only rows in the account currency are mirrored, as the slot balance is
+    the account balance.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, ring_size: int, currency: str):
+        self.__buffer: memoryview = buffer
+        self.__offset: int = offset
+        self.__ring_size: int = ring_size
+        self.__currency: str = currency
+        self.__sequence: int = 0
+        self.__count: int = 0
+
+    def publish(self, transaction: Transaction) -> None:
+        """
+        Write a transaction with the seqlock protocol: the sequence is odd
+        while the slot is being changed and even once it is consistent.
+        Readers never block the writer; they retry instead.
+
+        The row is encoded before the slot is touched, so a value out of
+        range (struct.error) leaves the slot consistent.
+        """
+        # Rows of other currencies move their own sub-balances
+        if transaction.currency != self.__currency:
+            return
+
+        buffer, offset = self.__buffer, self.__offset
+        balance = _cents(transaction.balance)
+        entry = ENTRY.pack(
+            (transaction.date - EPOCH) // MICROSECOND,
+            _cents(transaction.amount),
+            balance,
+        )
+        state = SLOT_STATE.pack(balance, self.__count + 1)
+        entry_offset = (
+            offset + SLOT.size + (self.__count % self.__ring_size) * ENTRY.size
+        )
+
+        self.__sequence += 1
+        struct.pack_into("<Q", buffer, offset, self.__sequence)
+        buffer[entry_offset : entry_offset + ENTRY.size] = entry
+        self.__count += 1
+        buffer[offset + 8 : offset + SLOT.size] = state
+
+        # Publish the even sequence last, after the data is in place
+        self.__sequence += 1
+        struct.pack_into("<Q", buffer, offset, self.__sequence)
+
+
+class SharedLedger:
+    """
+    Class to publish account balances and a ring buffer of recent
+    transactions in shared memory for read-only consumers in other
+    processes.
+    """
+
+    def __init__(self, capacity: int, ring_size: int = 64, name: str = None):
+        """
+        Create the shared memory block.
+
+        :param capacity: The number of account slots.
+        :param ring_size: The number of recent transactions kept per account.
+        :param name: The shared memory name (defaults to a generated one).
+        """
+        if capacity < 1 or ring_size < 1:
+            raise ValueError("Shared ledgers need at least one slot and ring entry.")
+
+        self.__capacity: int = capacity
+        self.__ring_size: int = ring_size
+        self.__memory = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=HEADER.size + capacity * _slot_size(ring_size),
+        )
+        HEADER.pack_into(self.__memory.buf, 0, MAGIC, capacity, ring_size)
+        self.__tracked: dict = {}
+
+    def __enter__(self) -> "SharedLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """
+        Read-only property to get the shared memory name readers attach to.
+
+        :return str: The shared memory name.
+        """
+        return self.__memory.name
+
+    def track(self, slot: int, account: BankAccount) -> None:
+        """
+        Mirror an account into a slot from now on. The account must not
+        have transactions yet, or it is mirrored from its current balance.
+
+        :param slot: The slot index, below the capacity.
+        :param account: The account to mirror.
+        """
+        if not 0 <= slot < self.__capacity:
+            raise IndexError("Slot out of range.")
+
+        writer = _SlotWriter(
+            self.__memory.buf,
+            HEADER.size + slot * _slot_size(self.__ring_size),
+            self.__ring_size,
+            account.currency,
+        )
+        with account.lock:
+            for transaction in reversed(account.transactions):
+                if transaction.currency == account.currency:
+                    writer.publish(transaction)
+                    break
+            account.add_listener(writer)
+        self.__tracked[slot] = (account, writer)
+
+    def close(self) -> None:
+        """
+        Stop mirroring and remove the shared memory block.
+        """
+        for account, writer in self.__tracked.values():
+            account.remove_listener(writer)
+        self.__tracked.clear()
+        self.__memory.close()
+        self.__memory.unlink()
+
+
+class SharedLedgerReader:
+    """
+    Class to read a SharedLedger from another process without locks or
+    round trips to the owning process.
+    """
+
+    def __init__(self, name: str, max_retries: int = 1000):
+        """
+        Attach to an existing shared ledger.
+
+        :param name: The shared memory name.
+        :param max_retries: The most attempts to get a consistent snapshot.
+        """
+        # Only the owner may unlink the block
+        self.__memory = _attach(name)
+
+        magic, self.__capacity, self.__ring_size = HEADER.unpack_from(
+            self.__memory.buf, 0
+        )
+        if magic != MAGIC:
+            raise ValueError("Not a shared ledger.")
+        self.__max_retries: int = max_retries
+        self.__retries: int = 0
+
+    def __enter__(self) -> "SharedLedgerReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def retries(self) -> int:
+        """
+        Read-only property to get the number of reads retried after racing
+        a write.
+
+        :return int: The number of retries.
+        """
+        return self.__retries
+
+    def __read(self, slot: int, limit: int) -> tuple:
+        """
+        Private method to read a consistent slot snapshot with the seqlock
+        protocol.
+
+        :return tuple: The balance in cents, the transaction count and up
+            to limit recent ring entries, oldest first.
+        """
+        if not 0 <= slot < self.__capacity:
+            raise IndexError("Slot out of range.")
+
+        buffer = self.__memory.buf
+        offset = HEADER.size + slot * _slot_size(self.__ring_size)
+
+        for _ in range(self.__max_retries):
+            sequence, balance, count = SLOT.unpack_from(buffer, offset)
+            if sequence % 2:
+                self.__retries += 1
+                time.sleep(0)
+                continue
+
+            entries = []
+            for index in range(max(0, count - min(limit, self.__ring_size)), count):
+                entries.append(
+                    ENTRY.unpack_from(
+                        buffer,
+                        offset + SLOT.size + (index % self.__ring_size) * ENTRY.size,
+                    )
+                )
+
+            if struct.unpack_from("<Q", buffer, offset)[0] == sequence:
+                return balance, count, entries
+            self.__retries += 1
+
+        raise TimeoutError("Could not read a consistent snapshot.")
+
+    def balance(self, slot: int) -> Decimal:
+        """
+        Read the balance of an account slot.
+
+        :param slot: The slot index.
+
+        :return Decimal: The balance.
+        """
+        return Decimal(self.__read(slot, 0)[0]).scaleb(-2)
+
+    def recent(self, slot: int, limit: int = None) -> list:
+        """
+        Read the recent transactions of an account slot, oldest first.
+
+        :param slot: The slot index.
+        :param limit: The most transactions to return (defaults to the ring size).
+
+        :return list: The (date, amount, balance) rows.
+        """
+        _, _, entries = self.__read(slot, limit or self.__ring_size)
+        return [
+            (
+                EPOCH + timestamp * MICROSECOND,
+                Decimal(amount).scaleb(-2),
+                Decimal(balance).scaleb(-2),
+            )
+            for timestamp, amount, balance in entries
+        ]
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block.
+        """
+        self.__memory.close()
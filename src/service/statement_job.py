@@ -0,0 +1,252 @@
+import os
+import time
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ..models.bank_account import BankAccount
+from ..models.currency import normalize_currency
+from ..models.fx_table import FxTable
+from ..models.statement import DATE_WIDTH
+
+
+def _amount_width(low, high, header: str) -> int:
+    """
+    Return the column width for amounts between low and high.
+
+    Amounts are rounded to the cent, so the widest text is always one of
+    the two extremes.
+    """
+    return max(len(f"{low:.2f}"), len(f"{high:.2f}"), len(header))
+
+
+def _write_chunk(
+    path: str,
+    rows: list,
+    amount_width: int,
+    balance_width: int,
+    is_first: bool,
+    show_currency: bool = False,
+) -> int:
+    """
+    Render one chunk of a statement to its file, in a worker process.
+
+    :param path: The statement file.
+    :param rows: The transactions of the chunk.
+    :param amount_width: The width of the Amount column.
+    :param balance_width: The width of the Balance column.
+    :param is_first: Flag if the file should be started with the header.
+    :param show_currency: Flag if a Currency column should be added.
+
+    :return int: The number of rows written.
+    """
+    with open(path, "w" if is_first else "a") as file:
+        if is_first:
+            if rows:
+                header = f"{'Date'.ljust(DATE_WIDTH)} | {'Amount'.ljust(amount_width)} | {'Balance'.ljust(balance_width)}"
+                if show_currency:
+                    header += " | Currency"
+                file.write(f"{header}\n")
+            else:
+                file.write(
+                    f"{'Date'.ljust(20)} | {'Amount'.ljust(10)} | {'Balance'.ljust(10)}\n"
+                )
+                file.write("No transactions found.\n")
+
+        if show_currency:
+            file.writelines(
+                f"{t.format_transaction(amount_width, balance_width)} | {t.currency}\n"
+                for t in rows
+            )
+        else:
+            file.writelines(
+                f"{t.format_transaction(amount_width, balance_width)}\n" for t in rows
+            )
+    return len(rows)
+
+
+class StatementReport:
+    """
+    Class to represent the outcome of a bulk statement run.
+    """
+
+    def __init__(self, statements: int, rows: int, skipped: int, seconds: float):
+        """
+        Initialise the report.
+
+        :param statements: The number of statements rendered.
+        :param rows: The number of transaction rows rendered.
+        :param skipped: The number of statements already done by an earlier run.
+        :param seconds: The elapsed time of the run.
+        """
+        self.statements: int = statements
+        self.rows: int = rows
+        self.skipped: int = skipped
+        self.seconds: float = seconds
+
+    @property
+    def statements_per_second(self) -> float:
+        return self.statements / self.seconds if self.seconds else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class StatementJob:
+    """
+    Class to render statements for many accounts to per-account files in
+    parallel across a process pool.
+
+    Each statement is streamed to its worker in chunks, so a worker never
+    holds more than one chunk. Finished accounts are appended to a
+    checkpoint file, and a later run with the same checkpoint skips them.
+
+    Given a currency and an FxTable, every statement is converted to that
+    currency, as with print_statement. Each history is converted as whole
+    columns in the parent, so all its rows use one version of the rates.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        workers: int = None,
+        chunk_size: int = 10_000,
+        checkpoint_path: str = None,
+        currency: str = None,
+        fx: FxTable = None,
+    ):
+        """
+        Initialise the job.
+
+        :param output_dir: The directory for the '<account id>.txt' statements.
+        :param workers: The number of worker processes (defaults to the CPU count).
+        :param chunk_size: The most rows sent to a worker at once.
+        :param checkpoint_path: The file recording finished accounts (defaults
+            to '.checkpoint' in the output directory).
+        :param currency: The currency to convert every row to (defaults to
+            no conversion).
+        :param fx: The exchange rates, required with a currency.
+        """
+        if currency is not None and fx is None:
+            raise ValueError("Converting statements needs an FxTable.")
+
+        self.output_dir: str = output_dir
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size
+        self.checkpoint_path: str = checkpoint_path or os.path.join(
+            output_dir, ".checkpoint"
+        )
+        self.currency: str = (
+            normalize_currency(currency) if currency is not None else None
+        )
+        self.fx: FxTable = fx
+
+    def __load_checkpoint(self) -> set:
+        """
+        Private method to read the accounts finished by earlier runs.
+
+        :return set: The finished account ids.
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path) as file:
+            return {line.rstrip("\n") for line in file if line.strip()}
+
+    def __chunks(self, account_id: str, account: BankAccount):
+        """
+        Private method to yield the chunk tasks of one statement.
+        """
+        path = os.path.join(self.output_dir, f"{account_id}.txt")
+        # Fix the history at the start so concurrent appends are not included
+        transactions = account.transactions
+        count = len(transactions)
+
+        if count == 0:
+            yield (path, [], 0, 0, True)
+            return
+
+        if self.currency is not None:
+            transactions = self.fx.convert_transactions(
+                transactions[:count], self.currency
+            )
+            show_currency = True
+        else:
+            # As print_statement, once more than one currency is held
+            show_currency = len(account.balances) > 1
+
+        amounts = [t.amount for t in islice(transactions, count)]
+        amount_width = _amount_width(min(amounts), max(amounts), "Amount")
+        balances = [t.balance for t in islice(transactions, count)]
+        balance_width = _amount_width(min(balances), max(balances), "Balance")
+        del amounts, balances
+
+        for start in range(0, count, self.chunk_size):
+            rows = transactions[start : min(start + self.chunk_size, count)]
+            yield (
+                path,
+                rows,
+                amount_width,
+                balance_width,
+                start == 0,
+                show_currency,
+            )
+
+    def run(self, accounts: dict) -> StatementReport:
+        """
+        Render the statements of all accounts not finished by an earlier run.
+
+        :param accounts: The accounts keyed by account id.
+
+        :return StatementReport: The statements and rows rendered, and the elapsed time.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        finished = self.__load_checkpoint()
+        pending = [
+            (str(account_id), account)
+            for account_id, account in accounts.items()
+            if str(account_id) not in finished
+        ]
+
+        start = time.perf_counter()
+        statements = 0
+        rows = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, open(
+            self.checkpoint_path, "a"
+        ) as checkpoint:
+            queue = iter(pending)
+            in_flight = {}
+
+            def submit_next(account_id: str, chunks) -> None:
+                task = next(chunks, None)
+                if task is not None:
+                    in_flight[pool.submit(_write_chunk, *task)] = (account_id, chunks)
+                    return
+
+                # Statement complete
+                nonlocal statements
+                statements += 1
+                checkpoint.write(f"{account_id}\n")
+                checkpoint.flush()
+
+            def fill() -> None:
+                # Keep one chunk per worker in flight, plus one queued
+                while len(in_flight) < self.workers * 2:
+                    account_id, account = next(queue, (None, None))
+                    if account is None:
+                        return
+                    submit_next(account_id, self.__chunks(account_id, account))
+
+            fill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    account_id, chunks = in_flight.pop(future)
+                    rows += future.result()
+                    # Chunks of one statement are written in order
+                    submit_next(account_id, chunks)
+                fill()
+
+        return StatementReport(
+            statements, rows, len(accounts) - len(pending), time.perf_counter() - start
+        )
@@ -1,5 +1,15 @@
+from datetime import date
 from decimal import Decimal
 
+from ..models.currency import BASE_CURRENCY, format_money
+from ..models.rollup import Rollup
+from ..models.statement import print_transactions
+from ..models.transaction import Transaction
+from ..models.velocity import VelocityRule
+
+# Shown after errors followed by another prompt
+RETRY_HINT = "\nEnter [q] to return to main page."
+
 
 class BankView:
     """
@@ -15,6 +25,9 @@ class BankView:
         print("[D]eposit")
         print("[W]ithdraw")
         print("[P]rint statement")
+        print("[S]ummary")
+        print("[F]ollow new transactions")
+        print("[L]ookup transactions")
         print("[Q]uit")
 
     @staticmethod
@@ -32,26 +45,158 @@ class BankView:
         return input("Please enter the amount to withdraw: ")
 
     @staticmethod
-    def show_deposit_success(amount: Decimal) -> None:
+    def prompt_for_start_date() -> str:
+        """
+        Display summary start date prompt.
+        """
+        return input(
+            "Please enter the start date (YYYY-MM-DD), or leave blank for the first transaction: "
+        )
+
+    @staticmethod
+    def prompt_for_end_date() -> str:
+        """
+        Display summary end date prompt.
+        """
+        return input(
+            "Please enter the end date (YYYY-MM-DD), or leave blank for the last transaction: "
+        )
+
+    @staticmethod
+    def prompt_for_note() -> str:
+        """
+        Display the optional memo and category prompt.
+        """
+        return input(
+            "Please enter a memo and/or #category (eg: March rent #rent), or leave blank: "
+        )
+
+    @staticmethod
+    def prompt_for_lookup() -> str:
+        """
+        Display transaction lookup prompt.
+        """
+        return input(
+            "Please enter the memo words and/or #category to look up, or leave blank to return: "
+        )
+
+    @staticmethod
+    def show_summary(
+        start: date, end: date, summary: Rollup, currency: str = BASE_CURRENCY
+    ) -> None:
+        """
+        Display the summary of transactions in a date range.
+        """
+        start_str = start.strftime("%d %b %Y") if start else "first transaction"
+        end_str = end.strftime("%d %b %Y") if end else "last transaction"
+        print(f"Summary from {start_str} to {end_str}")
+
+        if summary.count == 0:
+            print("No transactions found.")
+            return
+
+        print(f"Transactions: {summary.count}")
+        print(f"Credits: {format_money(summary.credits, currency)}")
+        print(f"Debits: {format_money(summary.debits, currency)}")
+        print(f"Minimum balance: {format_money(summary.min_balance, currency)}")
+        print(f"Maximum balance: {format_money(summary.max_balance, currency)}")
+
+    @staticmethod
+    def show_lookup_results(transactions: list) -> None:
+        """
+        Display the transactions found by a lookup.
+        """
+        print(f"Transactions found: {len(transactions)}")
+        if transactions:
+            print_transactions(transactions, show_notes=True)
+
+    @staticmethod
+    def show_follow_start(seconds: float) -> None:
+        """
+        Display the follow header.
+        """
+        print(f"Following new transactions for {seconds:g} seconds (Ctrl+C to stop).")
+        print(f"{'Date'.ljust(22)} | {'Amount'.ljust(10)} | {'Balance'.ljust(10)}")
+
+    @staticmethod
+    def show_follow_row(transaction: Transaction) -> None:
+        """
+        Display a single new transaction.
+        """
+        print(transaction.format_transaction(10, 10))
+
+    @staticmethod
+    def show_follow_end(dropped: int) -> None:
+        """
+        Display the end of follow mode.
+        """
+        if dropped:
+            print(f"Stopped following. {dropped} transactions were skipped.")
+        else:
+            print("Stopped following.")
+
+    @staticmethod
+    def show_memory_profiling_started() -> None:
+        """
+        Display that memory profiling has started.
+        """
+        print(
+            "Memory profiling started. Enter [m] again to see the report for activity since now."
+        )
+
+    @staticmethod
+    def show_memory_report(report: "MemoryReport") -> None:
+        """
+        Display a memory report.
+        """
+        print("Memory report (allocations since profiling started)")
+        print(f"Accounts: {report.accounts}, transactions: {report.transactions}")
+        print(f"Model bytes: {report.model_bytes}")
+        print(f"Bytes per account: {report.bytes_per_account:.1f}")
+        print(f"Bytes per transaction: {report.bytes_per_transaction:.1f}")
+        print(f"Statement rendering peak bytes: {report.statement_peak}")
+        print("Top allocation sites:")
+        for site, size, count in report.top_sites:
+            print(f"  {site}: {size} bytes in {count} blocks")
+
+    @staticmethod
+    def show_deposit_success(amount: Decimal, currency: str = BASE_CURRENCY) -> None:
         """
         Display deposit success.
         """
-        print(f"Thank you. ${amount:.2f} has been deposited to your account.")
+        print(
+            f"Thank you. {format_money(amount, currency)} has been deposited to your account."
+        )
 
     @staticmethod
-    def show_withdrawal_success(amount: Decimal) -> None:
+    def show_withdrawal_success(amount: Decimal, currency: str = BASE_CURRENCY) -> None:
         """
         Display withdrawal success.
         """
-        print(f"Thank you. ${amount:.2f} has been withdrawn.")
+        print(f"Thank you. {format_money(amount, currency)} has been withdrawn.")
 
     @staticmethod
-    def error_insufficient_funds() -> None:
+    def error_insufficient_funds(retry: bool = True) -> None:
         """
         Display error for insufficient funds.
+
+        :param retry: Flag if the input is prompted for again.
+        """
+        print(
+            f"Your bank account has insufficient funds. Please try again.{RETRY_HINT if retry else ''}"
+        )
+
+    @staticmethod
+    def error_velocity_limit(
+        rule: VelocityRule, currency: str = BASE_CURRENCY, retry: bool = True
+    ) -> None:
+        """
+        Display error for a withdrawal over a velocity limit.
+
+        :param retry: Flag if the input is prompted for again.
         """
         print(
-            "Your bank account has insufficient funds. Please try again.\nEnter [q] to return to main page."
+            f"This withdrawal is over the limit of {rule.describe(currency)}. Please try again later.{RETRY_HINT if retry else ''}"
         )
 
     @staticmethod
@@ -70,35 +215,88 @@ class BankView:
         print("Have a nice day!")
 
     @staticmethod
-    def error_negative_amount() -> None:
+    def error_negative_amount(retry: bool = True) -> None:
         """
         Display error for negative input amount.
+
+        :param retry: Flag if the input is prompted for again.
         """
         print(
-            "Your amount must be a positive number. Please try again.\nEnter [q] to return to main page."
+            f"Your amount must be a positive number. Please try again.{RETRY_HINT if retry else ''}"
         )
 
     @staticmethod
-    def error_zero_amount() -> None:
+    def error_zero_amount(retry: bool = True) -> None:
         """
         Display error for zero amount.
+
+        :param retry: Flag if the input is prompted for again.
         """
         print(
-            "Your amount is too small. Please try again.\nEnter [q] to return to main page."
+            f"Your amount is too small. Please try again.{RETRY_HINT if retry else ''}"
         )
 
     @staticmethod
-    def error_rounding() -> None:
+    def error_rounding(retry: bool = True) -> None:
         """
         Display error for input rounding.
+
+        :param retry: Flag if the input is prompted for again.
         """
         print(
-            "Your amount should be rounded to the cent. Please try again.\nEnter [q] to return to main page."
+            f"Your amount should be rounded to the cent. Please try again.{RETRY_HINT if retry else ''}"
         )
 
     @staticmethod
-    def error_non_number() -> None:
+    def error_non_number(retry: bool = True) -> None:
         """
         Display error for non number input.
+
+        :param retry: Flag if the input is prompted for again.
+        """
+        print(f"Invalid amount. Please try again.{RETRY_HINT if retry else ''}")
+
+    @staticmethod
+    def error_invalid_date(retry: bool = True) -> None:
+        """
+        Display error for invalid date input.
+
+        :param retry: Flag if the input is prompted for again.
+        """
+        print(
+            f"Invalid date. Please use the format YYYY-MM-DD.{RETRY_HINT if retry else ''}"
+        )
+
+    @staticmethod
+    def error_date_range(retry: bool = True) -> None:
+        """
+        Display error for an end date before the start date.
+
+        :param retry: Flag if the input is prompted for again.
+        """
+        print(
+            f"The end date must not be before the start date. Please try again.{RETRY_HINT if retry else ''}"
+        )
+
+    @staticmethod
+    def error_invalid_duration() -> None:
+        """
+        Display error for an invalid follow duration.
+        """
+        print("Invalid duration. Please enter a positive number of seconds.")
+
+    @staticmethod
+    def error_invalid_currency() -> None:
+        """
+        Display error for an invalid currency code.
         """
-        print("Invalid amount. Please try again.\nEnter [q] to return to main page.")
+        print("Invalid currency. Please use a 3-letter code (eg: USD, EUR).")
+
+    @staticmethod
+    def error_rate_limited() -> None:
+        """
+        Display error for a request rejected by admission control.
+        """
+        print(
+            "Too many requests. Please wait a moment and try again.\nReturning to main page."
+        )
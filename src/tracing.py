@@ -0,0 +1,157 @@
+import atexit
+import functools
+import os
+import threading
+import time
+
+# Marks a call inside a trace that was not sampled
+_UNSAMPLED = object()
+
+
+class Tracer:
+    """
+    Class to record timing spans and export them as batched JSON lines.
+
+    Each outermost span starts a trace that is sampled with probability
+    sample_rate; spans nested in a sampled trace are always recorded.
+    With a sample rate of 0 a traced call costs one attribute check.
+
+    The json and random modules are imported on first use, as most runs
+    never trace and they add to the startup time of src.main.
+    """
+
+    def __init__(self):
+        """
+        Initialise the tracer with sampling off.
+        """
+        self.sample_rate: float = 0.0
+        self.path: str = None
+        self.batch_size: int = 256
+        self.__buffer: list = []
+        self.__buffer_lock: threading.Lock = threading.Lock()
+        self.__local: threading.local = threading.local()
+        self.__span_ids = iter(range(1, 1 << 63))
+        # Source of sampling decisions and trace ids, created on first use
+        self.__random = None
+        atexit.register(self.flush)
+
+    def configure(self, path: str, sample_rate: float, batch_size: int = 256) -> None:
+        """
+        Set where spans are exported and how often traces are sampled.
+
+        :param path: The JSON lines file spans are appended to.
+        :param sample_rate: The fraction of traces recorded, from 0 to 1.
+        :param batch_size: The number of spans buffered before each write.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Sample rate must be between 0 and 1.")
+        self.flush()
+        self.path = path
+        self.batch_size = batch_size
+        self.sample_rate = sample_rate if path else 0.0
+
+    def flush(self) -> None:
+        """
+        Write all buffered spans to the export file.
+        """
+        with self.__buffer_lock:
+            spans, self.__buffer = self.__buffer, []
+        if spans and self.path:
+            import json
+
+            with open(self.path, "a") as file:
+                file.writelines(json.dumps(span) + "\n" for span in spans)
+
+    def call(self, name: str, function, args: tuple, kwargs: dict):
+        """
+        Call a function inside a span.
+
+        :param name: The span name.
+        :param function: The function to call.
+
+        :return: The function's return value.
+        """
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+
+        # Outermost span: decide whether this trace is sampled
+        if not stack:
+            random = self.__random
+            if random is None:
+                import random as random_module
+
+                random = self.__random = random_module.Random()
+
+            if random.random() >= self.sample_rate:
+                stack.append(_UNSAMPLED)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    stack.pop()
+            trace_id, parent_id = f"{random.getrandbits(64):016x}", None
+        elif stack[-1] is _UNSAMPLED:
+            return function(*args, **kwargs)
+        else:
+            trace_id, parent_id = stack[-1]
+
+        span_id = next(self.__span_ids)
+        stack.append((trace_id, span_id))
+        start = time.time()
+        started = time.perf_counter()
+        error = None
+        try:
+            return function(*args, **kwargs)
+        except BaseException as exception:
+            error = type(exception).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            stack.pop()
+            self.__record(
+                {
+                    "trace_id": trace_id,
+                    "span_id": span_id,
+                    "parent_id": parent_id,
+                    "name": name,
+                    "start": start,
+                    "duration_us": round(duration * 1e6, 3),
+                    "thread": threading.get_ident(),
+                    "pid": os.getpid(),
+                    "error": error,
+                }
+            )
+
+    def __record(self, span: dict) -> None:
+        """
+        Private method to buffer a finished span, flushing full batches.
+        """
+        with self.__buffer_lock:
+            self.__buffer.append(span)
+            is_full = len(self.__buffer) >= self.batch_size
+        if is_full:
+            self.flush()
+
+
+# Shared tracer configured by src.main
+tracer = Tracer()
+
+
+def traced(name: str):
+    """
+    Decorator to record calls of a function as spans named name.
+
+    :param name: The span name (eg: 'BankAccount.create_transaction').
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # Fast path while sampling is off
+            if not tracer.sample_rate:
+                return function(*args, **kwargs)
+            return tracer.call(name, function, args, kwargs)
+
+        return wrapper
+
+    return decorator
@@ -90,7 +90,7 @@ def test_deposit_multiple_negative_amount(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "-100", "-500", "500", "q"])
+    inputs = iter(["d", "-100", "-500", "500", "", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -115,7 +115,7 @@ def test_deposit_large_numbers(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "9999999999999999.99", "q"])
+    inputs = iter(["d", "9999999999999999.99", "", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -164,7 +164,7 @@ def test_withdraw_negative_amount(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "500", "w", "-100", "q", "q"])
+    inputs = iter(["d", "500", "", "w", "-100", "q", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -188,7 +188,7 @@ def test_withdraw_insufficient_funds(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["w", "100", "q", "q"])
+    inputs = iter(["w", "100", "", "q", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -211,7 +211,7 @@ def test_withdraw_exact_balance(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "100", "w", "100", "q"])
+    inputs = iter(["d", "100", "", "w", "100", "", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -235,7 +235,7 @@ def test_withdraw_slightly_insufficient_funds(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "100", "w", "100.01", "q", "q"])
+    inputs = iter(["d", "100", "", "w", "100.01", "", "q", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     view = BankView()
@@ -281,7 +281,7 @@ def test_print_large_balance(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "9999999999999999.99", "p", "q"])
+    inputs = iter(["d", "9999999999999999.99", "", "p", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -306,7 +306,9 @@ def test_print_large_withdrawal(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "9999999999999999.99", "w", "1999999999999999.99", "p", "q"])
+    inputs = iter(
+        ["d", "9999999999999999.99", "", "w", "1999999999999999.99", "", "p", "q"]
+    )
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -333,7 +335,7 @@ def test_print_multiple_deposit(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "500", "d", "400", "d", "300", "p", "q"])
+    inputs = iter(["d", "500", "", "d", "400", "", "d", "300", "", "p", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -359,7 +361,7 @@ def test_print_multiple_withdraw(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "1000", "w", "500", "w", "400", "p", "q"])
+    inputs = iter(["d", "1000", "", "w", "500", "", "w", "400", "", "p", "q"])
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -385,7 +387,9 @@ def test_print_multiple_deposit_and_withdraw(
     :param monkeypatch: The pytest fixture to modify builtins.
     :param capsys: The pytest fixture to capture stdout and stderr.
     """
-    inputs = iter(["d", "1000", "w", "500", "d", "400", "w", "300", "p", "q"])
+    inputs = iter(
+        ["d", "1000", "", "w", "500", "", "d", "400", "", "w", "300", "", "p", "q"]
+    )
     monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
 
     account = BankAccount()
@@ -425,3 +429,217 @@ def test_error_invalid_actions(
     assert "Invalid option. Please try again." in captured.out
     assert "Invalid option. Please try again." in captured.out
     assert "Invalid option. Please try again." in captured.out
+
+
+def test_summary_all_transactions(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test summary over the whole history with blank dates.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["d", "1000", "", "w", "250", "", "d", "50", "", "s", "", "", "q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert "Transactions: 3" in captured.out
+    assert "Credits: $1050.00" in captured.out
+    assert "Debits: $250.00" in captured.out
+    assert "Minimum balance: $750.00" in captured.out
+    assert "Maximum balance: $1000.00" in captured.out
+
+
+def test_summary_invalid_date(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test summary with an invalid date and a reversed date range.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["s", "2024-13-01", "2024-02-01", "2024-01-01", "q", "q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert "Invalid date." in captured.out
+    assert "The end date must not be before the start date." in captured.out
+
+
+def test_pipelined_commands(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test several commands with inline amounts on a single line.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["d 100; w 20; w 500; p; q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert captured.out.count("Welcome to AwesomeGIC Bank!") == 1
+    assert "Thank you. $100.00 has been deposited to your account." in captured.out
+    assert "Thank you. $20.00 has been withdrawn." in captured.out
+    assert "Your bank account has insufficient funds." in captured.out
+    assert "80.00" in captured.out
+    assert "Thank you for banking with AwesomeGIC Bank." in captured.out
+    assert account.balance == Decimal("80.00")
+    assert len(account.transactions) == 2
+
+
+def test_pipelined_invalid_commands(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test invalid inline amounts, dates and unknown commands do not prompt,
+    or show the hint for leaving a prompt.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["d abc; x; p 1; d 50; w 80; s 2024-13-01", "q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert "Invalid amount. Please try again." in captured.out
+    assert captured.out.count("Invalid option. Please try again.") == 2
+    assert "insufficient funds" in captured.out
+    assert "Invalid date." in captured.out
+    assert "Enter [q] to return to main page." not in captured.out
+    assert account.balance == Decimal("50")
+
+
+def test_memory_report(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test starting memory profiling and showing the report.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["m", "d 100; d 200; w 50", "m", "q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    app = BankApp(account, BankView())
+    try:
+        app.run()
+    finally:
+        app.profiler.stop()
+
+    captured = capsys.readouterr()
+    assert "Memory profiling started." in captured.out
+    assert "Accounts: 1, transactions: 3" in captured.out
+    assert "Bytes per transaction:" in captured.out
+    assert "Top allocation sites:" in captured.out
+
+
+def test_pipelined_foreign_currency(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test deposits and withdrawals in another currency use its sub-balance.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["d 100; d 50 eur; w 60 eur; w 20 eur; d 5 euro; p; q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert "Thank you. €50.00 has been deposited to your account." in captured.out
+    assert "Your bank account has insufficient funds." in captured.out
+    assert "Thank you. €20.00 has been withdrawn." in captured.out
+    assert "Invalid currency." in captured.out
+    assert "| Currency" in captured.out
+    assert account.balances == {"USD": Decimal("100"), "EUR": Decimal("30")}
+    assert account.balance == Decimal("100")
+
+
+def test_lookup_by_memo_and_category(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test memos and categories entered after a prompted amount can be looked up.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(
+        [
+            "d",
+            "1500",
+            "March rent #rent",
+            "w",
+            "40",
+            "Groceries #Food",
+            "d",
+            "7",
+            "",
+            "l rent",
+            "l",
+            "#food",
+            "l march #food",
+            "q",
+        ]
+    )
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert "Thank you. $1500.00 has been deposited to your account." in captured.out
+    assert captured.out.count("Transactions found: 1") == 2
+    assert "Transactions found: 0" in captured.out
+    assert "| rent     | March rent" in captured.out
+    assert "| food     | Groceries" in captured.out
+    assert account.balance == Decimal("1467")
+
+
+def test_deposit_amount_with_space_is_invalid(
+    account: BankAccount, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """
+    Test an amount with a space is rejected rather than split into a memo.
+
+    :param account: The BankAccount instance to test.
+    :param monkeypatch: The pytest fixture to modify builtins.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    inputs = iter(["d", "1 000", "q", "q"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(inputs))
+
+    view = BankView()
+    BankApp(account, view).run()
+
+    captured = capsys.readouterr()
+    assert "Invalid amount. Please try again." in captured.out
+    assert account.balance == Decimal("0")
+    assert account.transactions == []
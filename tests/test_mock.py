@@ -1,8 +1,12 @@
 import pytest
+import time
 import unittest
 from unittest.mock import MagicMock, patch
+from datetime import timedelta
 from decimal import Decimal
+from src.models.velocity import VelocityRule
 from src.service.controller import BankAccount, BankView, BankApp, TransactionType
+from src.service.admission import AdmissionControl
 
 
 @pytest.fixture
@@ -65,7 +69,7 @@ class TestHandleDeposit(SettingUpTestCase):
     def setUp(self):
         super().setUp()
 
-        def mock_validate_input(input):
+        def mock_validate_input(input, retry=True):
             if input == "100.00":
                 return Decimal("100.00")  # Mock valid input
             else:
@@ -144,7 +148,7 @@ class TestHandleWithdrawal(SettingUpTestCase):
     def setUp(self):
         super().setUp()
 
-        def mock_validate_input(input):
+        def mock_validate_input(input, retry=True):
             if input == "100.00":
                 return Decimal("100.00")  # Mock valid input
             else:
@@ -250,3 +254,124 @@ class TestRun(SettingUpTestCase):
 
             self.mock_bank_app.run()
             self.mock_view.error_invalid_action.assert_called()
+
+
+class TestHandleSummary(SettingUpTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.mock_account.summarize = MagicMock()
+
+    def test_handle_summary_open_range(self):
+        with patch.object(
+            self.mock_view, "prompt_for_start_date", side_effect=[""]
+        ), patch.object(self.mock_view, "prompt_for_end_date", side_effect=[""]):
+
+            self.mock_bank_app.handle_summary()
+            self.mock_account.summarize.assert_called_once_with(None, None)
+            self.mock_view.show_summary.assert_called_once()
+
+    def test_handle_summary_invalid_date(self):
+        with patch.object(
+            self.mock_view, "prompt_for_start_date", side_effect=["abc", "q"]
+        ):
+
+            self.mock_bank_app.handle_summary()
+            self.mock_view.error_invalid_date.assert_called_once()
+            self.mock_account.summarize.assert_not_called()
+
+
+class TestDispatch(SettingUpTestCase):
+
+    def test_dispatch_registered_command(self):
+        handler = MagicMock(return_value=None)
+        self.mock_bank_app.register_command("x", handler, 1)
+
+        self.assertTrue(self.mock_bank_app.dispatch("x 5; x"))
+        handler.assert_any_call("5")
+        handler.assert_any_call()
+
+    def test_dispatch_stops_after_quit(self):
+        with patch.object(self.mock_account, "create_transaction") as create:
+            self.assertFalse(self.mock_bank_app.dispatch("q; d 100"))
+            self.mock_view.show_goodbye.assert_called_once()
+            create.assert_not_called()
+
+    def test_dispatch_inline_deposit_does_not_prompt(self):
+        self.mock_bank_app.dispatch("d 100.00")
+        self.mock_view.prompt_for_deposit.assert_not_called()
+        self.mock_view.show_deposit_success.assert_called_once_with(Decimal("100.00"))
+
+
+class TestHandleFollow(SettingUpTestCase):
+
+    def test_handle_follow_prints_new_rows(self):
+        rows = iter(["row"])
+
+        def get(timeout):
+            row = next(rows, None)
+            if row is None:
+                time.sleep(timeout)
+            return row
+
+        subscription = MagicMock(dropped=0)
+        subscription.get.side_effect = get
+        with patch.object(
+            self.mock_account, "subscribe", return_value=subscription
+        ), patch.object(self.mock_account, "unsubscribe") as unsubscribe:
+
+            self.mock_bank_app.handle_follow("0.05")
+            self.mock_view.show_follow_row.assert_called_once_with("row")
+            unsubscribe.assert_called_once_with(subscription)
+
+    def test_handle_follow_invalid_duration(self):
+        self.mock_bank_app.handle_follow("abc")
+        self.mock_view.error_invalid_duration.assert_called_once()
+        self.mock_view.show_follow_start.assert_not_called()
+
+
+class TestAdmission(SettingUpTestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_bank_app.admission = AdmissionControl(client_rate=1, client_burst=3)
+
+    def test_dispatch_rejects_commands_over_the_limit(self):
+        self.mock_bank_app.dispatch("d 1; d 1; d 1; d 1; p")
+        self.assertEqual(self.mock_view.show_deposit_success.call_count, 3)
+        self.assertEqual(self.mock_view.error_rate_limited.call_count, 2)
+        self.assertEqual(self.mock_account.balance, Decimal("3"))
+
+    def test_quit_is_not_rate_limited(self):
+        self.mock_bank_app.dispatch("d 1; d 1; d 1")
+        self.assertFalse(self.mock_bank_app.dispatch("q"))
+        self.mock_view.error_rate_limited.assert_not_called()
+        self.mock_view.show_goodbye.assert_called_once()
+
+    def test_retry_loop_stops_at_the_limit(self):
+        with patch.object(
+            self.mock_view, "prompt_for_withdrawal", return_value="abc"
+        ) as prompt:
+            self.mock_bank_app.dispatch("w")
+            self.assertEqual(prompt.call_count, 3)
+            self.mock_view.error_rate_limited.assert_called_once()
+
+
+class TestVelocityLimit(SettingUpTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rule = VelocityRule(timedelta(hours=1), max_count=1)
+        self.mock_account.add_velocity_rule(self.rule)
+        self.mock_account.create_transaction(Decimal("100"), TransactionType.CREDIT)
+
+    def test_withdrawal_over_the_limit_shows_velocity_error(self):
+        self.mock_bank_app.dispatch("w 10; w 10; w 1000")
+        self.mock_view.show_withdrawal_success.assert_called_once_with(Decimal("10"))
+        self.mock_view.error_velocity_limit.assert_called_once_with(
+            self.rule, "USD", retry=False
+        )
+        self.mock_view.error_insufficient_funds.assert_called_once()
+
+    def test_foreign_withdrawal_after_velocity_error_shows_insufficient_funds(self):
+        self.mock_bank_app.dispatch("w 10; w 10; w 5 eur")
+        self.mock_view.error_velocity_limit.assert_called_once()
+        self.mock_view.error_insufficient_funds.assert_called_once()
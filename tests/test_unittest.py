@@ -1,12 +1,32 @@
+import os
 import pytest
-from decimal import Decimal
-from datetime import datetime
+import subprocess
+import sys
+import weakref
+from decimal import ROUND_HALF_EVEN, Decimal
+from datetime import date, datetime, timedelta, timezone
 
 from src.models.transaction_type import TransactionType
 from src.models.bank_account import BankAccount
-from src.models.transaction import Transaction
+from src.models.transaction import Transaction, format_date, _format_second
+from src.models.clock import Clock, CoarseClock, StepClock
+from src.models.archive import ArchiveSegment
+from src.models.conditional_result import ConditionalResult
+from src.models.fx_table import FxTable
+from src.models.snapshot import SnapshotRegistry
+from src.models.velocity import SlidingWindow, VelocityRule, parse_velocity_rules
 from src.service.view import BankView
 from src.service.controller import BankApp
+from src.service.account_cache import AccountCache, AccountStore
+from src.service.admission import AdmissionControl, TokenBucketTable
+from src.service.batching import BatchingQueue
+from src.service.scheduler import Scheduler
+from src.service.statement_job import StatementJob
+from src.service.interest_engine import InterestEngine
+from src.tracing import tracer
+from src.service.memory_report import MemoryProfiler, measure_bytes_per_transaction
+from src.service.shared_ledger import SharedLedger, SharedLedgerReader
+from src.service.reconciler import Reconciler, csv_rows, ledger_rows, write_csv
 
 
 @pytest.fixture
@@ -76,6 +96,33 @@ def test_transaction_init():
     assert transaction.amount == Decimal("500.0")
 
 
+def test_transaction_immutable():
+    """
+    Test that a transaction has no __dict__ and cannot be modified.
+    """
+    transaction = Transaction(datetime.now(), Decimal("500.0"), Decimal("500.0"))
+    assert not hasattr(transaction, "__dict__")
+    with pytest.raises(AttributeError):
+        transaction.amount = Decimal("1.0")
+    with pytest.raises(AttributeError):
+        transaction.extra = 1
+
+
+def test_transaction_amount_interned():
+    """
+    Test that repeated amounts share a single Decimal instance.
+    """
+    first = Transaction(datetime.now(), Decimal("100.00"), Decimal("100.00"))
+    second = Transaction(datetime.now(), Decimal("100.00"), Decimal("200.00"))
+    assert first.amount is second.amount
+
+    # Equal amounts with another exponent keep their own text
+    Transaction(datetime.now(), Decimal("1E+3"), Decimal("1000"))
+    third = Transaction(datetime.now(), Decimal("1000.00"), Decimal("1100.00"))
+    assert str(third.amount) == "1000.00"
+    assert third.amount.as_tuple() == Decimal("1000.00").as_tuple()
+
+
 def test_check_input_valid():
     """
     Test valid inputs for amount.
@@ -119,3 +166,1354 @@ def test_multiple_transactions(account):
     account.create_transaction(Decimal("300.0"), TransactionType.CREDIT)
     assert account.balance == Decimal("600.0")
     assert len(account.transactions) == 3
+
+
+def test_step_clock_timestamps():
+    """
+    Test that transactions are stamped by the injected deterministic clock.
+    """
+    clock = StepClock(datetime(2024, 1, 1, 9, 0, 0), timedelta(minutes=1))
+    account = BankAccount(clock=clock)
+    account.create_transaction(Decimal("500.0"), TransactionType.CREDIT)
+    account.create_transaction(Decimal("100.0"), TransactionType.DEBIT)
+    assert account.transactions[0].date == datetime(2024, 1, 1, 9, 0, 0)
+    assert account.transactions[1].date == datetime(2024, 1, 1, 9, 1, 0)
+
+
+def test_coarse_clock_caches_within_tick():
+    """
+    Test that the coarse clock returns the same timestamp within one tick.
+    """
+    clock = CoarseClock(tick=60)
+    assert clock.now() is clock.now()
+
+
+def test_format_date_shared_per_second():
+    """
+    Test that dates within the same second are formatted once.
+    """
+    _format_second.cache_clear()
+    assert format_date(datetime(2024, 1, 1, 13, 5, 9, 100)) == "01 Jan 2024 01:05:09PM"
+    assert format_date(datetime(2024, 1, 1, 13, 5, 9, 900)) == "01 Jan 2024 01:05:09PM"
+    assert _format_second.cache_info().misses == 1
+
+    # The same instant in another zone keeps its own wall-clock time
+    utc = datetime(2024, 1, 1, 13, 5, 9, tzinfo=timezone.utc)
+    singapore = utc.astimezone(timezone(timedelta(hours=8)))
+    assert format_date(utc) == "01 Jan 2024 01:05:09PM"
+    assert format_date(singapore) == "01 Jan 2024 09:05:09PM"
+
+
+def test_clock_is_abstract():
+    """
+    Test that a clock must implement now.
+    """
+    with pytest.raises(TypeError):
+        Clock()
+
+    class FixedClock(Clock):
+        def now(self) -> datetime:
+            return datetime(2024, 1, 1)
+
+    assert FixedClock().now() == datetime(2024, 1, 1)
+
+
+def test_summarize_matches_full_scan():
+    """
+    Test that range summaries from rollups match a scan of the transactions.
+    """
+    clock = StepClock(datetime(2024, 1, 20), timedelta(hours=7))
+    account = BankAccount(clock=clock)
+    for i in range(400):
+        account.create_transaction(Decimal(f"{i % 50 + 1}.25"), TransactionType.CREDIT)
+        account.create_transaction(Decimal(f"{i % 30 + 1}.10"), TransactionType.DEBIT)
+
+    start, end = date(2024, 1, 25), date(2024, 4, 3)
+    summary = account.summarize(start, end)
+    rows = [t for t in account.transactions if start <= t.date.date() <= end]
+
+    assert summary.count == len(rows)
+    assert summary.credits == sum(t.amount for t in rows if t.amount > 0)
+    assert summary.debits == -sum(t.amount for t in rows if t.amount < 0)
+    assert summary.min_balance == min(t.balance for t in rows)
+    assert summary.max_balance == max(t.balance for t in rows)
+
+
+def test_summarize_empty_range(account: BankAccount):
+    """
+    Test summarizing an account with no transactions.
+
+    :param account: The BankAccount instance to test.
+    """
+    summary = account.summarize(date(2024, 1, 1), date(2024, 12, 31))
+    assert summary.count == 0
+    assert summary.min_balance is None
+
+
+def test_search_indexes_match_scan():
+    """
+    Test that indexed range and top withdrawal queries match a full scan.
+    """
+    indexed = BankAccount(clock=StepClock())
+    scanned = BankAccount(clock=StepClock())
+    indexed.enable_indexes(top_n=5)
+    for i in range(3000):
+        amount = Decimal((i * 7919) % 1000 + 1) / 4
+        for account in (indexed, scanned):
+            account.create_transaction(amount * 2, TransactionType.CREDIT)
+            account.create_transaction(amount, TransactionType.DEBIT)
+
+    low, high = Decimal("100.00"), Decimal("120.50")
+    assert [t.amount for t in indexed.transactions_between(low, high)] == [
+        t.amount for t in scanned.transactions_between(low, high)
+    ]
+    assert [
+        t.amount for t in indexed.transactions_between(low, high, TransactionType.DEBIT)
+    ] == sorted(t.amount for t in scanned.transactions if -high <= t.amount <= -low)
+    for n in (3, 5, 50):
+        assert [t.amount for t in indexed.largest_withdrawals(n)] == [
+            t.amount for t in scanned.largest_withdrawals(n)
+        ]
+
+
+def test_batching_queue_matches_serial():
+    """
+    Test that batched requests give the same outcomes as serial execution.
+    """
+    requests = [
+        (
+            Decimal(f"{i % 7 + 1}.00"),
+            TransactionType.DEBIT if i % 3 else TransactionType.CREDIT,
+        )
+        for i in range(2000)
+    ]
+    serial = BankAccount(clock=StepClock())
+    expected = [serial.create_transaction(a, t) for a, t in requests]
+
+    batched = BankAccount(clock=StepClock())
+    with BatchingQueue(max_batch_size=64, max_wait=0.001) as batching:
+        futures = [batching.submit(batched, a, t) for a, t in requests]
+        results = [future.result() for future in futures]
+
+    assert results == expected
+    assert batched.balance == serial.balance
+    assert batching.batches < len(requests)
+
+
+def test_batching_queue_many_producers():
+    """
+    Test that concurrent producers never lose or double-apply a request.
+    """
+    import threading
+
+    account = BankAccount()
+    with BatchingQueue() as batching:
+
+        def produce():
+            for _ in range(500):
+                batching.submit(account, Decimal("1.00"), TransactionType.CREDIT)
+
+        threads = [threading.Thread(target=produce) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert account.balance == Decimal("4000.00")
+    assert len(account.transactions) == 4000
+
+
+def test_batching_queue_close_resolves_every_accepted_request():
+    """
+    Test that requests racing with close are either refused or applied.
+    """
+    import threading
+
+    for _ in range(20):
+        account = BankAccount(clock=StepClock())
+        batching = BatchingQueue(max_batch_size=8, max_wait=0)
+        accepted = []
+
+        def produce():
+            for _ in range(200):
+                try:
+                    accepted.append(
+                        batching.submit(
+                            account, Decimal("1.00"), TransactionType.CREDIT
+                        )
+                    )
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        batching.close()
+        for thread in threads:
+            thread.join()
+
+        assert all(future.done() for future in accepted)
+        assert [future.result(timeout=0) for future in accepted] == [True] * len(
+            accepted
+        )
+        assert account.balance == len(accepted)
+
+
+class _WorkerStopped(BaseException):
+    pass
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_batching_queue_worker_failure_fails_pending_requests():
+    """
+    Test that errors fail their requests, and that a worker stopped by a
+    BaseException fails every pending request and closes the queue.
+    """
+
+    class FailingAccount(BankAccount):
+        error = ValueError("bad batch")
+
+        def create_transactions(self, entries: list, expected_version: int = None):
+            raise self.error
+
+    account = FailingAccount()
+    batching = BatchingQueue(max_wait=0.05)
+    future = batching.submit(account, Decimal("1.00"), TransactionType.CREDIT)
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+
+    account.error = _WorkerStopped()
+    futures = [
+        batching.submit(account, Decimal("1.00"), TransactionType.CREDIT)
+        for _ in range(3)
+    ]
+    for future in futures:
+        assert isinstance(future.exception(timeout=5), _WorkerStopped)
+    with pytest.raises(RuntimeError):
+        batching.submit(account, Decimal("1.00"), TransactionType.CREDIT)
+    batching.close()
+
+
+def test_subscription_receives_only_new_transactions(account: BankAccount):
+    """
+    Test that a subscription only delivers transactions appended after it.
+
+    :param account: The BankAccount instance to test.
+    """
+    account.create_transaction(Decimal("100.0"), TransactionType.CREDIT)
+    subscription = account.subscribe()
+    account.create_transaction(Decimal("40.0"), TransactionType.DEBIT)
+
+    assert subscription.get(timeout=1).amount == Decimal("-40.0")
+    assert subscription.get(timeout=0.01) is None
+    assert subscription.delivered == 1
+
+    account.unsubscribe(subscription)
+    account.create_transaction(Decimal("1.0"), TransactionType.CREDIT)
+    assert subscription.get(timeout=0.01) is None
+
+
+def test_subscription_drops_oldest_when_full(account: BankAccount):
+    """
+    Test that a slow subscriber drops the oldest rows instead of blocking.
+
+    :param account: The BankAccount instance to test.
+    """
+    subscription = account.subscribe(maxsize=2)
+    for amount in ("1.00", "2.00", "3.00"):
+        account.create_transaction(Decimal(amount), TransactionType.CREDIT)
+
+    assert subscription.dropped == 1
+    assert subscription.get(timeout=1).amount == Decimal("2.00")
+    assert subscription.get(timeout=1).amount == Decimal("3.00")
+
+
+def test_statement_job_matches_print_statement(tmp_path, capsys: pytest.CaptureFixture):
+    """
+    Test that bulk statements match print_statement and resume from the checkpoint.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    accounts = {}
+    for account_id in range(3):
+        account = BankAccount(clock=StepClock())
+        for i in range(account_id * 25):
+            account.create_transaction(Decimal(f"{i * 37}.50"), TransactionType.CREDIT)
+            account.create_transaction(Decimal("12.25"), TransactionType.DEBIT)
+        accounts[f"acc{account_id}"] = account
+
+    job = StatementJob(str(tmp_path), workers=2, chunk_size=7)
+    report = job.run(accounts)
+    assert report.statements == 3
+    assert report.rows == sum(len(a.transactions) for a in accounts.values())
+
+    for account_id, account in accounts.items():
+        account.print_statement()
+        expected = capsys.readouterr().out
+        assert (tmp_path / f"{account_id}.txt").read_text() == expected
+
+    resumed = job.run(accounts)
+    assert resumed.statements == 0
+    assert resumed.skipped == 3
+
+
+def test_statement_job_matches_converted_statements(
+    tmp_path, capsys: pytest.CaptureFixture
+):
+    """
+    Test that bulk statements show the Currency column and convert rows
+    as print_statement does.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    fx = FxTable({("EUR", "USD"): Decimal("1.10")})
+    account = BankAccount(clock=StepClock())
+    for i in range(10):
+        account.create_transaction(Decimal(f"{i * 13}.75"), TransactionType.CREDIT)
+        account.create_transaction(Decimal("4.50"), TransactionType.CREDIT, "EUR")
+    accounts = {"mixed": account}
+
+    StatementJob(str(tmp_path / "native"), workers=2, chunk_size=7).run(accounts)
+    account.print_statement()
+    expected = capsys.readouterr().out
+    assert "| Currency" in expected
+    assert (tmp_path / "native" / "mixed.txt").read_text() == expected
+
+    job = StatementJob(
+        str(tmp_path / "usd"), workers=2, chunk_size=7, currency="usd", fx=fx
+    )
+    job.run(accounts)
+    account.print_statement("USD", fx)
+    assert (tmp_path / "usd" / "mixed.txt").read_text() == capsys.readouterr().out
+
+    with pytest.raises(ValueError):
+        StatementJob(str(tmp_path), currency="USD")
+
+
+def test_interest_engine_exact_rounding_and_fee_skip():
+    """
+    Test interest rounding against Decimal quantize, and skipped fees.
+    """
+    balances = ["0.00", "0.40", "1.00", "2.00", "123.45", "1000.00", "99999.99"]
+    accounts = []
+    for balance in balances:
+        account = BankAccount(clock=StepClock())
+        if Decimal(balance) > 0:
+            account.create_transaction(Decimal(balance), TransactionType.CREDIT)
+        accounts.append(account)
+
+    rate, fee = Decimal("0.0125"), Decimal("1.50")
+    report = InterestEngine(rate, fee).run(accounts)
+
+    total_interest = Decimal("0.00")
+    for balance, account in zip(balances, accounts):
+        interest = (Decimal(balance) * rate).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_EVEN
+        )
+        total_interest += interest
+        after_interest = Decimal(balance) + interest
+        expected = after_interest - fee if fee <= after_interest else after_interest
+        assert account.balance == expected
+
+    assert report.interest == total_interest
+    assert report.charged == 4
+    assert report.skipped == 3
+    assert report.blocked == 0
+
+
+def test_interest_engine_bulk_append_and_blocked_fees():
+    """
+    Test the one-pass bulk append, its version check, and fees rejected
+    by holds or velocity rules being reported apart from low balances.
+    """
+    account = BankAccount(clock=StepClock())
+    account.create_transaction(Decimal("100.00"), TransactionType.CREDIT)
+    version = account.version
+    assert account.create_transactions(
+        [
+            (Decimal("5.00"), TransactionType.CREDIT),
+            (Decimal("500.00"), TransactionType.DEBIT),
+            (Decimal("30.00"), TransactionType.DEBIT),
+        ],
+        version,
+    ) == [True, False, True]
+    assert account.balance == Decimal("75.00")
+    assert [t.balance for t in account.transactions] == [
+        Decimal("100.00"),
+        Decimal("105.00"),
+        Decimal("75.00"),
+    ]
+    # The bulk rows share one timestamp and one rollup update
+    assert account.transactions[1].date == account.transactions[2].date
+    summary = account.summarize()
+    assert (summary.credits, summary.debits, summary.count) == (
+        Decimal("105.00"),
+        Decimal("30.00"),
+        3,
+    )
+    assert (summary.min_balance, summary.max_balance) == (
+        Decimal("75.00"),
+        Decimal("105.00"),
+    )
+    # A stale version applies nothing
+    assert (
+        account.create_transactions([(Decimal("1"), TransactionType.CREDIT)], version)
+        is None
+    )
+    assert account.balance == Decimal("75.00")
+
+    held = BankAccount(clock=StepClock())
+    held.create_transaction(Decimal("10.00"), TransactionType.CREDIT)
+    held.authorize(Decimal("9.00"))
+    limited = BankAccount(clock=StepClock())
+    limited.create_transaction(Decimal("10.00"), TransactionType.CREDIT)
+    limited.add_velocity_rule(VelocityRule(timedelta(days=1), max_count=0))
+    poor = BankAccount(clock=StepClock())
+    poor.create_transaction(Decimal("0.50"), TransactionType.CREDIT)
+
+    report = InterestEngine(Decimal("0"), Decimal("2.00")).run([held, limited, poor])
+    assert (report.charged, report.skipped, report.blocked) == (0, 1, 2)
+    assert [a.balance for a in (held, limited, poor)] == [
+        Decimal("10.00"),
+        Decimal("10.00"),
+        Decimal("0.50"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "strategy, max_rows", [("merge", 0), ("hash_join", 10_000), ("hash_join", 5)]
+)
+def test_reconciler_reports_mismatches(tmp_path, strategy: str, max_rows: int):
+    """
+    Test that each strategy finds missing, extra, amount and balance mismatches.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    :param strategy: The reconciler method to run.
+    :param max_rows: The in-memory row limit before hash_join spills to disk.
+    """
+    accounts = {}
+    for account_id in ("a", "b"):
+        account = BankAccount(clock=StepClock())
+        for i in range(20):
+            account.create_transaction(Decimal(f"{i + 1}.00"), TransactionType.CREDIT)
+        accounts[account_id] = account
+
+    # Rows sharing a timestamp, as from a coarse clock
+    coarse = BankAccount(clock=CoarseClock(tick=60))
+    for i in range(3):
+        coarse.create_transaction(Decimal(f"{i + 1}.00"), TransactionType.CREDIT)
+    accounts["c"] = coarse
+
+    rows = list(ledger_rows(accounts))
+    bank = rows[:3] + rows[4:]  # missing from the bank file: extra in the ledger
+    bank[5] = (*bank[5][:2], bank[5][2] + 1, bank[5][3])
+    bank[6] = (*bank[6][:3], bank[6][3] + 1)
+    bank.append(("b", "2099-01-01T00:00:00.000000", Decimal("5.00"), Decimal("5.00")))
+    # Keep the bank file sorted for merge; the sort is stable for equal dates
+    bank.sort(key=lambda row: row[:2])
+    write_csv(bank, tmp_path / "bank.csv")
+
+    reconciler = Reconciler(
+        str(tmp_path / "report.csv"), max_rows=max_rows, partitions=4
+    )
+    report = getattr(reconciler, strategy)(
+        ledger_rows(accounts), csv_rows(tmp_path / "bank.csv")
+    )
+
+    assert (report.extra, report.missing) == (1, 1)
+    assert (report.amount_mismatches, report.balance_mismatches) == (1, 1)
+    assert report.matched == len(rows) - 3
+    assert report.spilled == (max_rows == 5)
+    assert len((tmp_path / "report.csv").read_text().splitlines()) == 5
+
+
+def test_reconciler_repartitions_skewed_spills(tmp_path):
+    """
+    Test that hash_join splits oversized partitions again, and matches a
+    partition of one repeated key in order, with the same results as merge.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    """
+    accounts = {}
+    for account_id in range(6):
+        account = BankAccount(clock=StepClock())
+        for i in range(40):
+            account.create_transaction(Decimal(f"{i + 1}.00"), TransactionType.CREDIT)
+        accounts[str(account_id)] = account
+    # One hot key: 30 rows sharing a timestamp
+    coarse = BankAccount(clock=CoarseClock(tick=3600))
+    for i in range(30):
+        coarse.create_transaction(Decimal(f"{i + 1}.00"), TransactionType.CREDIT)
+    accounts["hot"] = coarse
+
+    rows = list(ledger_rows(accounts))
+    hot = [i for i, row in enumerate(rows) if row[0] == "hot"]
+    bank = list(rows)
+    bank[hot[7]] = (*bank[hot[7]][:3], bank[hot[7]][3] + 1)
+    del bank[hot[-1]]
+    del bank[10]
+    write_csv(bank, tmp_path / "bank.csv")
+
+    reports = []
+    for strategy in ("merge", "hash_join"):
+        reconciler = Reconciler(
+            str(tmp_path / f"{strategy}.csv"), max_rows=8, partitions=4
+        )
+        report = getattr(reconciler, strategy)(
+            ledger_rows(accounts), csv_rows(tmp_path / "bank.csv")
+        )
+        reports.append(
+            (
+                report.matched,
+                report.extra,
+                report.missing,
+                report.balance_mismatches,
+                sorted((tmp_path / f"{strategy}.csv").read_text().splitlines()),
+            )
+        )
+
+    assert reports[0] == reports[1]
+    assert reports[1][:4] == (len(rows) - 3, 2, 0, 1)
+
+
+def test_holds_reserve_available_balance(account: BankAccount):
+    """
+    Test that holds reduce the available balance used by debits.
+
+    :param account: The BankAccount instance to test.
+    """
+    account.create_transaction(Decimal("100.00"), TransactionType.CREDIT)
+    hold = account.authorize(Decimal("70.00"))
+
+    assert account.available_balance == Decimal("30.00")
+    assert account.authorize(Decimal("31.00")) is None
+    assert not account.create_transaction(Decimal("31.00"), TransactionType.DEBIT)
+
+    assert account.capture(hold.hold_id, Decimal("50.00"))
+    assert account.balance == Decimal("50.00")
+    assert account.available_balance == Decimal("50.00")
+    assert not account.capture(hold.hold_id)
+    assert not account.release(hold.hold_id)
+
+
+def test_holds_expire():
+    """
+    Test that expired holds are swept and their funds become available.
+    """
+    account = BankAccount(clock=StepClock(step=timedelta(hours=1)))
+    account.create_transaction(Decimal("100.00"), TransactionType.CREDIT)
+    first = account.authorize(Decimal("60.00"), ttl=timedelta(hours=2))
+    account.authorize(Decimal("40.00"), ttl=timedelta(days=1))
+    assert account.available_balance == Decimal("0.00")
+
+    assert account.sweep_expired_holds() == 1
+    assert account.held == Decimal("40.00")
+    assert not account.capture(first.hold_id)
+    assert account.create_transaction(Decimal("60.00"), TransactionType.DEBIT)
+
+
+def test_holds_concurrent_authorize(account: BankAccount):
+    """
+    Test that concurrent authorizations never reserve more than the balance.
+
+    :param account: The BankAccount instance to test.
+    """
+    import threading
+
+    account.create_transaction(Decimal("100.00"), TransactionType.CREDIT)
+    holds = []
+
+    def authorize():
+        for _ in range(50):
+            hold = account.authorize(Decimal("1.00"))
+            if hold is not None:
+                holds.append(hold)
+
+    threads = [threading.Thread(target=authorize) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(holds) == 100
+    assert account.available_balance == Decimal("0.00")
+    for hold in holds[:30]:
+        assert account.capture(hold.hold_id)
+    assert account.balance == Decimal("70.00")
+    assert account.available_balance == Decimal("0.00")
+
+
+def read_shared_ledger(name: str, results) -> None:
+    """
+    Read snapshots from another process and report any torn read.
+
+    :param name: The shared memory name.
+    :param results: The queue to put (snapshots read, torn snapshots) on.
+    """
+    reads = torn = 0
+    with SharedLedgerReader(name) as reader:
+        while True:
+            rows = reader.recent(0)
+            if rows:
+                reads += 1
+                # Each deposit is $1, so consecutive balances differ by $1
+                balances = [balance for _, _, balance in rows]
+                if any(b - a != 1 for a, b in zip(balances, balances[1:])):
+                    torn += 1
+                if balances[-1] >= 2000:
+                    break
+    results.put((reads, torn))
+
+
+def test_shared_ledger_cross_process_reads():
+    """
+    Test that readers in another process see consistent snapshots while the
+    account keeps writing.
+    """
+    import multiprocessing
+
+    account = BankAccount(clock=StepClock())
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    with SharedLedger(capacity=2, ring_size=8) as ledger:
+        ledger.track(0, account)
+        account.create_transaction(Decimal("1.00"), TransactionType.CREDIT)
+        reader = context.Process(target=read_shared_ledger, args=(ledger.name, results))
+        reader.start()
+        for _ in range(1999):
+            account.create_transaction(Decimal("1.00"), TransactionType.CREDIT)
+        reads, torn = results.get(timeout=30)
+        reader.join()
+
+        with SharedLedgerReader(ledger.name) as local:
+            assert local.balance(0) == Decimal("2000.00")
+            assert len(local.recent(0)) == 8
+            assert local.balance(1) == Decimal("0")
+
+    assert reads > 0
+    assert torn == 0
+
+
+def test_shared_ledger_listener_errors_do_not_fail_transactions():
+    """
+    Test that an amount too large for the shared ledger is still applied,
+    leaves the slot consistent and is recorded as a listener error.
+    """
+    account = BankAccount(clock=StepClock())
+
+    with SharedLedger(capacity=1, ring_size=4) as ledger:
+        ledger.track(0, account)
+        account.create_transaction(Decimal("1.00"), TransactionType.CREDIT)
+        assert account.create_transaction(
+            Decimal("100000000000000000.00"), TransactionType.CREDIT
+        )
+        assert account.balance == Decimal("100000000000000001.00")
+        assert account.listener_errors == 1
+        assert account.listener_error is not None
+
+        with SharedLedgerReader(ledger.name) as reader:
+            assert reader.balance(0) == Decimal("1.00")
+            assert len(reader.recent(0)) == 1
+
+    assert account.transactions[-1].amount == Decimal("100000000000000000.00")
+    with pytest.raises(ValueError):
+        SharedLedger(capacity=1, ring_size=0)
+    with pytest.raises(ValueError):
+        SharedLedger(capacity=0)
+
+
+def test_archive_segment_round_trip(tmp_path, capsys: pytest.CaptureFixture):
+    """
+    Test that archived history decodes to the same rows and statement.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    account = BankAccount(clock=StepClock(step=timedelta(seconds=1, microseconds=7)))
+    for i in range(250):
+        account.create_transaction(
+            Decimal(f"{i * 13 % 900}.35"),
+            TransactionType.CREDIT,
+            memo=f"Salary {i % 3} ✓" if i % 5 == 0 else None,
+            category="pay" if i % 5 == 0 else None,
+        )
+        account.create_transaction(
+            Decimal(f"{i % 40}.05"),
+            TransactionType.DEBIT,
+            category="food" if i % 4 == 0 else None,
+        )
+
+    segment = ArchiveSegment.from_transactions(account.transactions, block_size=64)
+    segment.save(tmp_path / "history.seg")
+    loaded = ArchiveSegment.load(tmp_path / "history.seg")
+
+    assert len(loaded) == len(account.transactions)
+    assert loaded.block_count == 8
+    rows = [
+        (t.date, t.amount, t.balance, t.memo, t.category) for t in loaded.transactions()
+    ]
+    assert rows == [
+        (t.date, t.amount, t.balance, t.memo, t.category) for t in account.transactions
+    ]
+    assert loaded.block(3)[0].balance == account.transactions[3 * 64].balance
+
+    # The search index can be rebuilt from the segment alone
+    restored = BankAccount.restore(account.balance, loaded.transactions())
+    found = restored.search_transactions("salary 1", "#pay")
+    assert [(t.date, t.memo) for t in found] == [
+        (t.date, t.memo) for t in account.search_transactions("salary 1", "#pay")
+    ]
+    assert len(found) == 16
+    assert len(restored.search_transactions(category="food")) == 63
+
+    account.print_statement()
+    expected = capsys.readouterr().out
+    loaded.print_statement()
+    assert capsys.readouterr().out == expected
+
+
+def test_foreign_rows_stay_out_of_shared_ledger_and_archive():
+    """
+    Test that sub-balance rows of other currencies neither change the
+    mirrored balance nor the balances rebuilt from an archive.
+    """
+    account = BankAccount(clock=StepClock())
+    with SharedLedger(capacity=1, ring_size=4) as ledger:
+        ledger.track(0, account)
+        account.create_transaction(Decimal("100"), TransactionType.CREDIT)
+        account.create_transaction(Decimal("7"), TransactionType.CREDIT, "EUR")
+        with SharedLedgerReader(ledger.name) as reader:
+            assert reader.balance(0) == Decimal("100")
+            assert len(reader.recent(0)) == 1
+
+    account.create_transaction(Decimal("1"), TransactionType.CREDIT)
+    segment = ArchiveSegment(
+        ArchiveSegment.from_transactions(account.transactions).to_bytes()
+    )
+    assert segment.currency == "USD"
+    assert [t.balance for t in segment.transactions()] == [
+        Decimal("100"),
+        Decimal("101"),
+    ]
+
+    euro = ArchiveSegment.from_transactions(account.transactions, currency="EUR")
+    assert [(t.balance, t.currency) for t in euro.transactions()] == [
+        (Decimal("7"), "EUR")
+    ]
+
+
+def test_search_indexes_ignore_foreign_rows():
+    """
+    Test that amount searches only cover the account currency, whether
+    indexes were enabled before, after or not at all.
+    """
+    accounts = [BankAccount(), BankAccount(), BankAccount()]
+    accounts[0].enable_indexes()
+    for account in accounts:
+        account.create_transaction(Decimal("100"), TransactionType.CREDIT, "EUR")
+        account.create_transaction(Decimal("50"), TransactionType.DEBIT, "EUR")
+        account.create_transaction(Decimal("20"), TransactionType.CREDIT)
+        account.create_transaction(Decimal("5"), TransactionType.DEBIT)
+    accounts[1].enable_indexes()
+
+    for account in accounts:
+        assert [t.amount for t in account.largest_withdrawals(5)] == [Decimal("-5")]
+        assert [t.amount for t in account.transactions_between(1, 100)] == [
+            Decimal("-5"),
+            Decimal("20"),
+        ]
+
+
+# Memory regression gate: about 225 bytes today, allowing about 16% headroom.
+# Kept apart from the cache's TRANSACTION_BYTES estimate, so raising the
+# estimate does not loosen the gate.
+MEMORY_GATE_ROWS = 10_000
+MAX_BYTES_PER_TRANSACTION = 260
+
+
+def test_memory_bytes_per_transaction_gate():
+    """
+    Test that traced bytes per transaction have not regressed.
+    """
+    used = measure_bytes_per_transaction(MEMORY_GATE_ROWS)
+    assert used <= MAX_BYTES_PER_TRANSACTION, (
+        f"{used:.1f} bytes per transaction at {MEMORY_GATE_ROWS} rows"
+        f" exceeds the {MAX_BYTES_PER_TRANSACTION} byte gate"
+    )
+
+
+def test_memory_report_counts_only_activity_since_start():
+    """
+    Test that reports leave out earlier transactions and allocations, and
+    that tracing started elsewhere keeps running with its traces.
+    """
+    import tracemalloc
+
+    account = BankAccount(clock=StepClock())
+    for _ in range(50):
+        account.create_transaction(Decimal("1.00"), TransactionType.CREDIT)
+
+    tracemalloc.start()
+    try:
+        profiler = MemoryProfiler()
+        profiler.start([account])
+        for _ in range(20):
+            account.create_transaction(Decimal("2.00"), TransactionType.CREDIT)
+        report = profiler.report([account])
+
+        assert (report.accounts, report.transactions) == (1, 20)
+        # The 50 earlier rows are not part of the allocations either
+        assert 0 < report.model_bytes < 50 * MAX_BYTES_PER_TRANSACTION
+        assert report.statement_peak > 0
+
+        measure_bytes_per_transaction(100)
+        profiler.stop()
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.take_snapshot().traces
+    finally:
+        tracemalloc.stop()
+
+
+def test_tracing_exports_nested_spans(tmp_path, capsys: pytest.CaptureFixture):
+    """
+    Test that sampled spans are exported as JSON lines with their parents.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    import json
+
+    path = tmp_path / "spans.jsonl"
+    app = BankApp(BankAccount(), BankView())
+    try:
+        tracer.configure(str(path), sample_rate=1.0, batch_size=2)
+        app.dispatch("d 100")
+        tracer.flush()
+        tracer.configure(str(path), sample_rate=0.0)
+        app.dispatch("d 100")
+    finally:
+        tracer.configure(None, sample_rate=0.0)
+
+    spans = {
+        span["name"]: span for span in map(json.loads, path.read_text().splitlines())
+    }
+    assert len(spans) == 3
+    deposit = spans["BankApp.handle_deposit"]
+    assert deposit["parent_id"] is None
+    for name in ("BankApp.validate_input", "BankAccount.create_transaction"):
+        assert spans[name]["parent_id"] == deposit["span_id"]
+        assert spans[name]["trace_id"] == deposit["trace_id"]
+
+
+def test_conditional_transaction_conflict(account: BankAccount):
+    """
+    Test that a stale version conflicts and a fresh version applies.
+
+    :param account: The BankAccount instance to test.
+    """
+    version, balance = account.versioned_balance
+    account.create_transaction(Decimal("100.00"), TransactionType.CREDIT)
+
+    result = account.create_transaction_if_version(
+        Decimal("50.00"), TransactionType.DEBIT, version
+    )
+    assert result is ConditionalResult.CONFLICT
+    assert account.balance == Decimal("100.00")
+
+    version, balance = account.versioned_balance
+    assert (
+        account.create_transaction_if_version(
+            balance + 1, TransactionType.DEBIT, version
+        )
+        is ConditionalResult.REJECTED
+    )
+    assert (
+        account.create_transaction_if_version(balance, TransactionType.DEBIT, version)
+        is ConditionalResult.APPLIED
+    )
+    assert account.version == version + 1
+
+
+def test_conditional_transaction_concurrent_retries(account: BankAccount):
+    """
+    Test that optimistic read-decide-write loops never lose an update.
+
+    :param account: The BankAccount instance to test.
+    """
+    import threading
+
+    def top_up():
+        for _ in range(200):
+            while True:
+                version, balance = account.versioned_balance
+                # Decide: top up to the next whole ten dollars
+                amount = Decimal(10) - balance % 10
+                result = account.create_transaction_if_version(
+                    amount, TransactionType.CREDIT, version
+                )
+                if result is not ConditionalResult.CONFLICT:
+                    break
+
+    threads = [threading.Thread(target=top_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert account.balance == Decimal("8000")
+    assert all(t.amount == 10 for t in account.transactions)
+
+
+def test_snapshot_reads_point_in_time():
+    """
+    Test that a snapshot sees balances and transactions as of when it was
+    taken, and that versions are discarded once it is closed.
+    """
+    registry = SnapshotRegistry()
+    first = BankAccount(clock=StepClock(), registry=registry)
+    second = BankAccount(clock=StepClock(), registry=registry)
+    first.create_transaction(Decimal("100"), TransactionType.CREDIT)
+
+    with registry.snapshot() as snapshot:
+        first.create_transaction(Decimal("40"), TransactionType.DEBIT)
+        second.create_transaction(Decimal("40"), TransactionType.CREDIT)
+
+        assert snapshot.balance(first) == Decimal("100")
+        assert snapshot.balance(second) == Decimal("0.0")
+        assert [t.amount for t in snapshot.transactions(first)] == [Decimal("100")]
+        assert snapshot.transactions(second) == []
+        assert first.retained_versions == 2
+
+    assert registry.open_snapshots == 0
+    first.create_transaction(Decimal("1"), TransactionType.CREDIT)
+    assert first.retained_versions == 1
+
+
+def test_snapshot_consistent_while_writing():
+    """
+    Test that snapshots see a prefix of the commit order while a writer
+    keeps depositing into the accounts in turn.
+    """
+    import threading
+
+    registry = SnapshotRegistry()
+    accounts = [BankAccount(clock=StepClock(), registry=registry) for _ in range(4)]
+    done = threading.Event()
+
+    def deposit():
+        while not done.is_set():
+            for account in accounts:
+                account.create_transaction(Decimal("1"), TransactionType.CREDIT)
+
+    writer = threading.Thread(target=deposit)
+    writer.start()
+    views = []
+    for _ in range(200):
+        with registry.snapshot() as snapshot:
+            views.append([snapshot.balance(account) for account in accounts])
+    done.set()
+    writer.join()
+
+    # Earlier accounts are ahead by at most one deposit in any prefix
+    for balances in views:
+        assert balances == sorted(balances, reverse=True)
+        assert balances[0] - balances[-1] <= 1
+
+
+def test_fx_table_exact_rounding_and_versions():
+    """
+    Test that conversions round half-even to the target's smallest unit,
+    and that columns match single conversions.
+    """
+    fx = FxTable({("USD", "EUR"): Decimal("0.9"), ("USD", "JPY"): Decimal("150.25")})
+    assert fx.version == 1
+
+    assert fx.convert(Decimal("0.05"), "USD", "EUR") == Decimal("0.04")
+    assert fx.convert(Decimal("0.15"), "USD", "EUR") == Decimal("0.14")
+    assert fx.convert(Decimal("10.02"), "USD", "JPY") == Decimal("1506")
+    assert fx.convert(Decimal("9.00"), "EUR", "USD") == Decimal("10.00")
+
+    amounts = [Decimal("0.05"), Decimal("12.34"), Decimal("0.05"), Decimal("-7.77")]
+    assert fx.convert_column(amounts, "USD", "EUR") == [
+        fx.convert(amount, "USD", "EUR") for amount in amounts
+    ]
+
+    fx.set_rate("USD", "EUR", Decimal("0.8"))
+    assert fx.version == 2
+    with pytest.raises(KeyError):
+        fx.convert(Decimal("1"), "EUR", "GBP")
+    with pytest.raises(ValueError):
+        fx.set_rate("USD", "GBP", Decimal("0"))
+
+
+def test_converted_totals_and_statement(capsys: pytest.CaptureFixture):
+    """
+    Test sub-balances, cached converted totals invalidated by rate and
+    balance changes, and statements converted to one currency.
+
+    :param capsys: The pytest fixture to capture stdout and stderr.
+    """
+    account = BankAccount(clock=StepClock())
+    fx = FxTable({("EUR", "USD"): Decimal("1.10")})
+    account.create_transaction(Decimal("100"), TransactionType.CREDIT)
+    account.create_transaction(Decimal("50"), TransactionType.CREDIT, "eur")
+    assert not account.create_transaction(Decimal("51"), TransactionType.DEBIT, "EUR")
+
+    assert account.total_in("USD", fx) == Decimal("155.00")
+    fx.set_rate("EUR", "USD", Decimal("1.20"))
+    assert account.total_in("USD", fx) == Decimal("160.00")
+    account.create_transaction(Decimal("10"), TransactionType.DEBIT, "EUR")
+    assert account.total_in("USD", fx) == Decimal("148.00")
+    assert account.total_in("EUR", fx) == Decimal("123.33")
+
+    account.print_statement("USD", fx)
+    rows = capsys.readouterr().out.splitlines()
+    assert rows[0].endswith("| Currency")
+    assert [[cell.strip() for cell in row.split(" | ")[1:]] for row in rows[1:]] == [
+        ["100.00", "100.00", "USD"],
+        ["60.00", "60.00", "USD"],
+        ["-12.00", "48.00", "USD"],
+    ]
+
+
+def test_lower_case_account_currency_is_not_a_sub_balance():
+    """
+    Test that a currency code in another case is the account currency.
+    """
+    account = BankAccount(clock=StepClock())
+    assert account.create_transaction(Decimal("100"), TransactionType.CREDIT, "usd")
+    assert account.create_transaction(Decimal("30"), TransactionType.DEBIT, " Usd ")
+
+    assert account.balance == Decimal("70")
+    assert account.balances == {"USD": Decimal("70")}
+    assert [t.currency for t in account.transactions] == ["USD", "USD"]
+
+
+def test_converted_statement_needs_fx_and_totals_do_not_keep_fx():
+    """
+    Test that a converted statement without rates is a clear error, and
+    that cached totals do not keep their FX table alive.
+    """
+    account = BankAccount(clock=StepClock())
+    account.create_transaction(Decimal("50"), TransactionType.CREDIT, "EUR")
+    with pytest.raises(ValueError):
+        account.print_statement("USD")
+
+    fx = FxTable({("EUR", "USD"): Decimal("1.10")})
+    assert account.total_in("usd", fx) == Decimal("55.00")
+    reference = weakref.ref(fx)
+    del fx
+    assert reference() is None
+
+    # A new table with the same id is not served the old total
+    fx = FxTable({("EUR", "USD"): Decimal("1.20")})
+    assert account.total_in("USD", fx) == Decimal("60.00")
+
+
+def test_token_buckets_refill_lazily_and_evict_idle_keys():
+    """
+    Test bursts, lazy refill, limits shared by clients of one account,
+    and that idle keys are evicted without changing later outcomes.
+    """
+    admission = AdmissionControl(
+        client_rate=2, client_burst=2, account_rate=5, account_burst=3, idle_seconds=10
+    )
+    assert [admission.admit("a", 1, now=0.0) for _ in range(3)] == [True, True, False]
+    # The account bucket is shared, the client bucket is not
+    assert admission.admit("b", 1, now=0.0)
+    assert not admission.admit("c", 1, now=0.0)
+    assert admission.rejected == 2
+
+    # Half a second refills one client token and more than one account token
+    assert admission.admit("a", 1, now=0.5)
+    assert not admission.admit("a", 1, now=0.5)
+    assert admission.clients.tokens("b", now=0.5) == pytest.approx(2)
+
+    buckets = TokenBucketTable(rate=1, burst=2, idle_seconds=10)
+    for key in range(1000):
+        buckets.commit(key, buckets.check(key, now=0.0))
+    assert len(buckets) == 1000
+    buckets.commit("busy", buckets.check("busy", now=15.0))
+    buckets.commit("busy", buckets.check("busy", now=25.0))
+    assert len(buckets) == 1
+    assert buckets.tokens(0, now=25.0) == 2
+
+
+def test_scheduler_catches_up_and_retries_debits():
+    """
+    Test that standing orders missed during downtime are applied in one
+    batch, and that failed debits are retried and then reported.
+    """
+    account = BankAccount(clock=StepClock())
+    landlord = BankAccount(clock=StepClock())
+    scheduler = Scheduler(retry_delay=timedelta(days=1), max_retries=1)
+    start = datetime(2024, 1, 31)
+    scheduler.schedule(
+        account, Decimal("100"), TransactionType.CREDIT, start, every=timedelta(weeks=1)
+    )
+    rent = scheduler.schedule(
+        account, Decimal("300"), TransactionType.DEBIT, start, months=1, target=landlord
+    )
+
+    # Five weekly deposits and two rents are due, oldest first
+    report = scheduler.run_due(datetime(2024, 2, 29))
+    assert (report.applied, report.caught_up, report.batches) == (6, 5, 1)
+    assert report.retries == 1 and report.failed == []
+    assert account.balance == Decimal("200")
+    assert landlord.balance == Decimal("300")
+    assert scheduler.next_run() == datetime(2024, 3, 1)
+
+    # The retry of the January rent fails again and is reported
+    report = scheduler.run_due(datetime(2024, 3, 1))
+    assert report.applied == 0 and report.retries == 0
+    assert report.failed == [(rent, start)]
+
+    assert scheduler.cancel(rent)
+    assert not scheduler.cancel(rent)
+    assert len(scheduler) == 1
+
+
+def test_scheduler_rejects_non_positive_intervals_and_cancels_retries():
+    """
+    Test that orders must recur after a positive interval, and that
+    cancelling an order drops its pending retries.
+    """
+    account = BankAccount(clock=StepClock())
+    scheduler = Scheduler(retry_delay=timedelta(days=1))
+    start = datetime(2024, 1, 1)
+    for interval in ({"every": timedelta(0)}, {"every": -timedelta(days=1)}):
+        with pytest.raises(ValueError):
+            scheduler.schedule(
+                account, Decimal("1"), TransactionType.CREDIT, start, **interval
+            )
+    with pytest.raises(ValueError):
+        scheduler.schedule(
+            account, Decimal("1"), TransactionType.CREDIT, start, months=-1
+        )
+
+    # A one-off debit that fails is kept for its retry until cancelled
+    order = scheduler.schedule(
+        account, Decimal("5"), TransactionType.DEBIT, start, count=1
+    )
+    assert scheduler.run_due(start).retries == 1
+    assert len(scheduler) == 1
+    assert scheduler.cancel(order)
+    assert len(scheduler) == 0
+
+    account.create_transaction(Decimal("10"), TransactionType.CREDIT)
+    report = scheduler.run_due(datetime(2024, 1, 3))
+    assert (report.applied, report.failed) == (0, [])
+    assert account.balance == Decimal("10")
+
+
+def test_account_cache_evicts_and_writes_back(tmp_path, monkeypatch):
+    """
+    Test that cold accounts are written back when evicted, and reload
+    with their balance and only their recent history.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    :param monkeypatch: The pytest fixture to shrink the history chunks.
+    """
+    monkeypatch.setattr("src.service.account_cache.CHUNK_ROWS", 4)
+    store = AccountStore(str(tmp_path / "accounts"))
+    cache = AccountCache(store, max_accounts=2, recent_rows=3, clock=StepClock())
+
+    with cache.checkout("alice") as alice:
+        for _ in range(10):
+            alice.create_transaction(Decimal("10"), TransactionType.CREDIT)
+        alice.create_transaction(Decimal("5"), TransactionType.CREDIT, "EUR")
+        # Alice is checked out, so Carol evicts Bob instead
+        cache.get("bob").create_transaction(Decimal("1"), TransactionType.CREDIT)
+        cache.get("carol")
+        assert cache.get("alice") is alice
+    cache.get("dave")
+    cache.get("erin")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 5, 3)
+    assert stats.write_backs == 2 and stats.resident == 2
+
+    alice = cache.get("alice")
+    assert alice.balances == {"USD": Decimal("100"), "EUR": Decimal("5")}
+    # The last, partly filled chunk of 3 rows is enough
+    assert len(alice.transactions) == 3
+    assert len(store.history("alice")) == 11
+    assert cache.get("bob").balance == Decimal("1")
+
+    cache.get("bob").create_transaction(Decimal("2"), TransactionType.CREDIT)
+    assert cache.flush() == 1
+    assert [t.balance for t in store.history("bob")] == [Decimal("1"), Decimal("3")]
+    store.close()
+
+
+def test_account_cache_keeps_accounts_with_unstored_state(tmp_path):
+    """
+    Test that accounts with holds, listeners, velocity rules or indexes
+    are not evicted, and are evicted once that state is gone.
+
+    :param tmp_path: The pytest fixture for a temporary directory.
+    """
+    store = AccountStore(str(tmp_path / "accounts"))
+    cache = AccountCache(store, max_accounts=1, clock=StepClock())
+
+    with cache.checkout("held") as held:
+        held.create_transaction(Decimal("10"), TransactionType.CREDIT)
+        hold = held.authorize(Decimal("0"))
+    with cache.checkout("listened") as listened:
+        subscription = listened.subscribe()
+    with cache.checkout("limited") as limited:
+        limited.add_velocity_rule(VelocityRule(timedelta(hours=1), max_count=1))
+    with cache.checkout("indexed") as indexed:
+        indexed.enable_indexes()
+    cache.get("plain")
+    cache.get("other")
+
+    # Only the plain account was evicted
+    assert cache.stats().evictions == 1
+    for account in (held, listened, limited, indexed):
+        assert account.has_unstored_state
+    assert [cache.get(name) for name in ("held", "listened", "limited", "indexed")] == [
+        held,
+        listened,
+        limited,
+        indexed,
+    ]
+
+    held.release(hold.hold_id)
+    listened.unsubscribe(subscription)
+    cache.get("plain")
+    assert cache.get("held") is not held
+    assert cache.get("held").balance == Decimal("10")
+    assert cache.get("listened") is not listened
+    store.close()
+
+
+def test_search_transactions_by_memo_and_category():
+    """
+    Test that memo words and categories find their transactions in order,
+    ignoring case, and that several terms must all match.
+    """
+    account = BankAccount(clock=StepClock())
+    account.create_transaction(
+        Decimal("2500"), TransactionType.CREDIT, memo="March salary", category="Pay"
+    )
+    account.create_transaction(
+        Decimal("900"), TransactionType.DEBIT, memo="March rent", category="#rent"
+    )
+    account.create_transaction(Decimal("10"), TransactionType.DEBIT)
+    account.create_transaction(
+        Decimal("900"), TransactionType.DEBIT, memo="April rent", category="rent"
+    )
+    account.create_transaction(Decimal("5"), TransactionType.CREDIT, "EUR", "march")
+
+    assert [t.memo for t in account.search_transactions("MARCH")] == [
+        "March salary",
+        "March rent",
+        "march",
+    ]
+    assert [t.memo for t in account.search_transactions(category="#Rent")] == [
+        "March rent",
+        "April rent",
+    ]
+    march_rent = account.search_transactions("rent march", "rent")
+    assert [t.balance for t in march_rent] == [Decimal("1600")]
+    assert march_rent[0].category == "rent"
+    assert account.search_transactions("march", "pay")[0].memo == "March salary"
+    assert account.search_transactions("june") == []
+    assert account.transactions[2].memo is None
+
+
+def test_velocity_rules_limit_withdrawals_in_a_rolling_window():
+    """
+    Test that withdrawals over a count or amount limit are rejected until
+    earlier withdrawals leave the window, and that deposits, rejected
+    withdrawals and other currencies do not count.
+    """
+    account = BankAccount(clock=StepClock(step=timedelta(minutes=10)))
+    account.create_transaction(Decimal("1000"), TransactionType.CREDIT)
+    account.create_transaction(Decimal("50"), TransactionType.CREDIT, "EUR")
+    for rule in parse_velocity_rules("3600:3:;86400::250"):
+        account.add_velocity_rule(rule)
+
+    # 00:20, 00:30 and 00:40 use up the hourly count
+    for _ in range(3):
+        assert account.create_transaction(Decimal("50"), TransactionType.DEBIT)
+    assert not account.create_transaction(Decimal("50"), TransactionType.DEBIT)
+    assert account.velocity_violation.max_count == 3
+    assert account.create_transaction(Decimal("10"), TransactionType.DEBIT, "EUR")
+
+    # Rejected withdrawals do not count, and by 01:40 two have left the hour
+    assert not account.create_transaction(Decimal("5000"), TransactionType.DEBIT)
+    assert account.velocity_violation is None
+    for _ in range(3):
+        account.create_transaction(Decimal("1"), TransactionType.CREDIT)
+    assert account.create_transaction(Decimal("100"), TransactionType.DEBIT)
+    assert not account.create_transaction(Decimal("1"), TransactionType.DEBIT)
+    assert account.velocity_violation.max_amount == Decimal("250")
+    assert account.balance == Decimal("753")
+
+    # A rejected capture keeps its hold
+    hold = account.authorize(Decimal("10"))
+    assert not account.capture(hold.hold_id)
+    assert account.held == Decimal("10")
+
+
+def test_sliding_window_expires_whole_buckets():
+    """
+    Test that the window never undercounts an exact window, and drops
+    each bucket once it is wholly outside.
+    """
+    window = SlidingWindow(VelocityRule(timedelta(minutes=60), max_count=2, buckets=6))
+    start = datetime(2024, 1, 1)
+    window.add(start + timedelta(minutes=5), Decimal("1"))
+    window.add(start + timedelta(minutes=8), Decimal("2"))
+
+    # 10 minute buckets: the 00:00 bucket is kept until 01:10
+    assert not window.allows(start + timedelta(minutes=65), Decimal("1"))
+    assert not window.allows(start + timedelta(minutes=69), Decimal("1"))
+    assert window.allows(start + timedelta(minutes=70), Decimal("1"))
+    assert (window.count, window.amount) == (0, Decimal("0"))
+
+
+def test_malformed_velocity_rules_exit_with_a_readable_error():
+    """
+    Test that a malformed GIC_VELOCITY_RULES stops startup with a message
+    naming the rule instead of a traceback.
+    """
+    with pytest.raises(ValueError, match="'3600:5:zz': invalid amount"):
+        parse_velocity_rules("3600:5:1000;3600:5:zz")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "src.main"],
+        env={**os.environ, "GIC_VELOCITY_RULES": "abc"},
+        input="",
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert result.stdout == ""
+    assert result.stderr.startswith("GIC_VELOCITY_RULES: Invalid velocity rule 'abc'")
+    assert "Traceback" not in result.stderr
+
+
+def test_startup_defers_non_essential_imports():
+    """
+    Test that starting the app does not import the modules only needed
+    for tracing, memory reports or search indexes.
+    """
+    deferred = ["json", "random", "re", "tracemalloc"]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, src.main, src.service.controller, src.models.velocity; "
+            f"print([name for name in {deferred!r} if name in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"